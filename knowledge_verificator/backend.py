@@ -1,24 +1,45 @@
 """Module with the backend defining available endpoints."""
 
-from typing import Any, Union
+from contextlib import asynccontextmanager
+import json
+import random
+from typing import Any, AsyncIterator, Callable, Iterator, Union
 
 from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from knowledge_verificator.answer_chooser import AnswerChooser
+from knowledge_verificator.inference_service import (
+    RemoteNaturalLanguageInference,
+    RemoteQuestionGeneration,
+    connect_to_inference_service,
+    load_natural_language_inference_model,
+    load_question_generation_model,
+)
 from knowledge_verificator.materials import Material, MaterialDatabase
 from knowledge_verificator.io_handler import config
 from knowledge_verificator.nli import (
     NaturalLanguageInference,
     NaturalLanguageInferenceModel,
+    Relation,
     get_available_nli_models,
 )
+from knowledge_verificator.qg.base import QuestionGeneration
 from knowledge_verificator.qg.qg_model_factory import (
     QuestionGenerationModel,
-    create_model,
     get_available_qg_models,
+    loaded_models,
+    release_model,
 )
+from knowledge_verificator.question_bank import QuestionBank
+from knowledge_verificator.question_store import QuestionStore
+from knowledge_verificator.rule_based_evaluation import RuleBasedEvaluator
+from knowledge_verificator.semantic_cache import SemanticCache
+from knowledge_verificator.utils.batching import MicroBatcher
+from knowledge_verificator.utils.model_swap import ModelSwapper, SwapState
+from knowledge_verificator.utils.single_flight import SingleFlight
 
 
 # The allowed origins.
@@ -28,7 +49,16 @@ origins = [
     f'{config().protocol}://{config().frontend_address}:{config().frontend_port}',
 ]
 
-ENDPOINTS = FastAPI(debug=not config().production_mode)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Persist the state worth keeping between restarts at the shutdown."""
+    yield
+    if NLI_MODEL.cache is not None:
+        NLI_MODEL.cache.save()
+
+
+ENDPOINTS = FastAPI(debug=not config().production_mode, lifespan=lifespan)
 ENDPOINTS.add_middleware(
     CORSMiddleware,
     allow_origins=origins,  # Allows specified origins
@@ -37,10 +67,182 @@ ENDPOINTS.add_middleware(
     allow_headers=['*'],  # Allows all headers
 )
 MATERIAL_DB = MaterialDatabase(materials_dir=config().learning_materials)
-QG_MODEL = create_model(config().question_generation_model)
+# With inference workers, models are owned by the workers and shared by all
+# processes of the backend. Otherwise, every process loads its own models.
+INFERENCE_CLIENT = (
+    connect_to_inference_service() if config().inference_workers > 0 else None
+)
+QG_MODEL: QuestionGeneration
+NLI_MODEL: NaturalLanguageInference | RemoteNaturalLanguageInference
+if INFERENCE_CLIENT is not None:
+    QG_MODEL = RemoteQuestionGeneration(INFERENCE_CLIENT)
+    NLI_MODEL = RemoteNaturalLanguageInference(INFERENCE_CLIENT)
+else:
+    QG_MODEL = load_question_generation_model(
+        config().question_generation_model
+    )
+    NLI_MODEL = load_natural_language_inference_model()
 ANSWER_CHOOSER = AnswerChooser()
+RULE_BASED_EVALUATOR = (
+    RuleBasedEvaluator(
+        answer_chooser=ANSWER_CHOOSER,
+        min_overlap=config().nli_fast_path_min_overlap,
+    )
+    if config().nli_fast_path
+    else None
+)
+SEMANTIC_CACHE = (
+    SemanticCache(
+        threshold=config().nli_semantic_cache_threshold,
+        max_premises=config().nli_semantic_cache_size,
+        max_answers=config().nli_semantic_cache_answers,
+        audit_rate=config().nli_semantic_cache_audit_rate,
+    )
+    if config().nli_semantic_cache_size > 0
+    else None
+)
+QUESTION_STORE: QuestionStore | None = None
+if (question_store_path := config().question_store_path) is not None:
+    QUESTION_STORE = QuestionStore(
+        path=question_store_path, max_items=config().question_store_size
+    )
+QUESTION_BANK = (
+    QuestionBank(
+        get_model=lambda: QG_MODEL,
+        answer_chooser=ANSWER_CHOOSER,
+        questions_per_paragraph=config().question_bank_size,
+        store=QUESTION_STORE,
+    )
+    if config().question_bank_size > 0
+    else None
+)
+# Models are switched in the background, while the old ones keep serving.
+MODEL_SWAPPER = ModelSwapper()
+# Concurrent evaluations of answers are inferred together as a single batch.
+NLI_BATCHER = MicroBatcher(
+    process_batch=NLI_MODEL.infer_relation_batch,
+    window=config().nli_batch_window_ms / 1000,
+    max_batch_size=config().nli_max_batch_size,
+)
+# Identical concurrent requests, e.g. a whole class generating a question to
+# the same paragraph, share a single computation.
+QG_FLIGHTS: SingleFlight[tuple[str, str], dict[str, str] | None] = (
+    SingleFlight()
+)
+NLI_FLIGHTS: SingleFlight[tuple[str, str, str], Relation] = SingleFlight()
+
+
+def warm_premise_cache(materials: list[Material]) -> None:
+    """
+    Tokenize paragraphs of learning materials in advance, so evaluating
+    an answer only tokenizes the answer.
+
+    Args:
+        materials (list[Material]): Learning materials.
+    """
+    NLI_MODEL.warm_premises(
+        paragraph for material in materials for paragraph in material.paragraphs
+    )
+
+
+def fill_question_bank(materials: list[Material]) -> None:
+    """
+    Schedule generating questions to paragraphs of learning materials
+    in the background. Does nothing if the question bank is disabled.
+
+    Args:
+        materials (list[Material]): Learning materials.
+    """
+    if QUESTION_BANK is not None:
+        QUESTION_BANK.submit(
+            paragraph
+            for material in materials
+            for paragraph in material.paragraphs
+        )
+
+
+def invalidate_questions(paragraphs: list[str]) -> None:
+    """
+    Remove persisted questions to paragraphs, which have been changed or
+    removed. Does nothing if the question store is disabled.
+
+    Args:
+        paragraphs (list[str]): Outdated paragraphs.
+    """
+    if QUESTION_STORE is not None:
+        QUESTION_STORE.invalidate(paragraphs)
+
+
+warm_premise_cache(MATERIAL_DB.materials)
+fill_question_bank(MATERIAL_DB.materials)
+
+
+def format_swap_response(
+    started: bool,
+    model_name: str,
+    response: Response,
+    background: bool,
+    loaded_model: Callable[[], str],
+) -> dict:
+    """
+    Format a response to a request switching a model. Unless the switch
+    runs in the background, waits until it is finished.
+
+    Args:
+        started (bool): If the switch has started.
+        model_name (str): Name of the requested model.
+        response (Response): Response to a request.
+        background (bool): If the switch runs in the background.
+        loaded_model (Callable[[], str]): Function returning the name of
+            the model serving requests.
 
-NLI_MODEL = NaturalLanguageInference(config().natural_language_inference_model)
+    Returns:
+        dict: Under `data` key, there is `model_name` key with the name of
+        the model. A switch in the background is answered with 202 and
+        `status` key with the status of the switch.
+    """
+    if not started:
+        response.status_code = 409
+        return format_response(
+            data={'status': MODEL_SWAPPER.status()},
+            message='Another model is being switched. Try again later.',
+        )
+
+    if not background:
+        MODEL_SWAPPER.wait()
+        status = MODEL_SWAPPER.status()
+        if status['state'] == SwapState.FAILED.value:
+            response.status_code = 500
+            return format_response(
+                message=f'Cannot switch to `{model_name}`: '
+                f'{status.get("error", "")}'
+            )
+        return format_response(data={'model_name': loaded_model()})
+
+    response.status_code = 202
+    return format_response(
+        data={'model_name': model_name, 'status': MODEL_SWAPPER.status()},
+        message=f'Switching to `{model_name}`. Check progress at '
+        '`/models/status`.',
+    )
+
+
+def format_unswitchable_response(response: Response) -> dict:
+    """
+    Format a response to a request switching a model owned by inference
+    workers, which load models only at the startup.
+
+    Args:
+        response (Response): Response to a request.
+
+    Returns:
+        dict: Under `message` key, there is the reason of the failure.
+    """
+    response.status_code = 409
+    return format_response(
+        message='Models cannot be switched while inference workers own them. '
+        'Change the configuration and restart the backend.'
+    )
 
 
 def format_response(data: Any = '', message: str = '') -> dict:
@@ -141,6 +343,8 @@ def add_material(material: Material, response: Response) -> dict:
     if response.status_code != 200:
         return format_response(message=message)
 
+    warm_premise_cache([material])
+    fill_question_bank([material])
     data = {'material_id': material.id}
     return format_response(
         data=data, message=f'Added the material with id = {material.id}.'
@@ -161,12 +365,15 @@ def delete_material(material_id: str, response: Response) -> dict:
         of the removed material.
     """
     try:
+        paragraphs = MATERIAL_DB[material_id].paragraphs
         MATERIAL_DB.delete_material(material=material_id)
     except KeyError as e:
         message = str(e)
         response.status_code = 400
         return format_response(message=message)
 
+    invalidate_questions(paragraphs)
+
     response.status_code = 200
     return format_response(
         message=f'Deleted the material with id = {material_id}.'
@@ -188,12 +395,22 @@ def update_material(material: Material, response: Response) -> dict:
         of the removed material.
     """
     try:
+        previous_paragraphs = MATERIAL_DB[material.id].paragraphs
         MATERIAL_DB.update_material(material)
     except KeyError as e:
         message = str(e)
         response.status_code = 404
         return format_response(message=message)
 
+    invalidate_questions(
+        [
+            paragraph
+            for paragraph in previous_paragraphs
+            if paragraph not in MATERIAL_DB[material.id].paragraphs
+        ]
+    )
+    warm_premise_cache([material])
+    fill_question_bank([material])
     response.status_code = 200
     return format_response(
         message=f'Updated the material with id = {material.id}.',
@@ -238,13 +455,19 @@ def get_nli_model() -> dict:
 
 
 @ENDPOINTS.post('/models/qg/{model_name}')
-def set_qg_model(model_name: str, response: Response) -> dict:
+def set_qg_model(
+    model_name: str, response: Response, background: bool = False
+) -> dict:
     """
-    Endpoint to set the Question Generation model.
+    Endpoint to set the Question Generation model. The old model serves
+    requests until the new one is loaded and warmed up.
 
     Args:
         model_name (str): Name of the desired QG model.
         response (Response): Instance of response, provided automatically.
+        background (bool, optional): Answer with 202 immediately and switch
+            the model in the background, see `/models/status`. Otherwise,
+            answer once the model is switched. Defaults to False.
 
     Returns:
         dict: If failed, only `message` key is available with the explanation
@@ -253,10 +476,6 @@ def set_qg_model(model_name: str, response: Response) -> dict:
     """
     try:
         model = QuestionGenerationModel[model_name]
-        global QG_MODEL  # pylint: disable=global-statement
-
-        QG_MODEL = create_model(model)
-        return format_response(data={'model_name': QG_MODEL.get_model()})
     except KeyError:
         response.status_code = 404
         return format_response(
@@ -264,15 +483,60 @@ def set_qg_model(model_name: str, response: Response) -> dict:
             f' `{model_name}` has not been recognised.'
         )
 
+    if INFERENCE_CLIENT is not None:
+        return format_unswitchable_response(response)
+
+    def warm_up(loaded: QuestionGeneration) -> None:
+        try:
+            loaded.generate(answer='Warm-up.', context='This is a warm-up.')
+        except Exception:
+            # The model will not be installed, so nobody uses it.
+            release_model(loaded)
+            raise
+
+    def install(loaded: QuestionGeneration) -> None:
+        global QG_MODEL  # pylint: disable=global-statement
+        previous, QG_MODEL = QG_MODEL, loaded
+        # The previous model stays loaded, so switching back is instant.
+        release_model(previous)
+        if QUESTION_BANK is not None:
+            QUESTION_BANK.clear()
+            fill_question_bank(MATERIAL_DB.materials)
+
+    def loaded_model() -> str:
+        # `QG_MODEL` is replaced by the switch, so it is read afterwards.
+        return QG_MODEL.get_model()
+
+    started = MODEL_SWAPPER.switch(
+        component='qg',
+        target=model.name,
+        load=lambda: load_question_generation_model(model),
+        install=install,
+        warm_up=warm_up,
+    )
+    return format_swap_response(
+        started,
+        model.name,
+        response,
+        background=background,
+        loaded_model=loaded_model,
+    )
+
 
 @ENDPOINTS.post('/models/nli/{model_name}')
-def set_nli_model(model_name: str, response: Response) -> dict:
+def set_nli_model(
+    model_name: str, response: Response, background: bool = False
+) -> dict:
     """
-    Endpoint to set the Natural Language Inference model.
+    Endpoint to set the Natural Language Inference model. The old model
+    serves requests until the new one is loaded and warmed up.
 
     Args:
         model_name (str): Name of the desired NLI model.
         response (Response): Instance of response, provided automatically.
+        background (bool, optional): Answer with 202 immediately and switch
+            the model in the background, see `/models/status`. Otherwise,
+            answer once the model is switched. Defaults to False.
 
     Returns:
         dict: If failed, only `message` key is available with the explanation
@@ -281,8 +545,6 @@ def set_nli_model(model_name: str, response: Response) -> dict:
     """
     try:
         model = NaturalLanguageInferenceModel[model_name]
-        NLI_MODEL.set_model(model)
-        return format_response(data={'model_name': NLI_MODEL.get_model()})
     except KeyError:
         response.status_code = 404
         return format_response(
@@ -290,6 +552,84 @@ def set_nli_model(model_name: str, response: Response) -> dict:
             f'because name `{model_name}` has not been recognised.'
         )
 
+    nli_model = NLI_MODEL
+    if not isinstance(nli_model, NaturalLanguageInference):
+        return format_unswitchable_response(response)
+
+    def install(loaded: tuple) -> None:
+        nli_model.install_model(model, loaded)
+        if SEMANTIC_CACHE is not None:
+            SEMANTIC_CACHE.clear()
+        warm_premise_cache(MATERIAL_DB.materials)
+
+    started = MODEL_SWAPPER.switch(
+        component='nli',
+        target=model.name,
+        load=lambda: nli_model.load_model(model),
+        install=install,
+        warm_up=lambda loaded: nli_model.warm_up(model, loaded),
+    )
+    return format_swap_response(
+        started,
+        model.name,
+        response,
+        background=background,
+        loaded_model=nli_model.get_model,
+    )
+
+
+@ENDPOINTS.get('/models/status')
+def get_model_switch_status() -> dict:
+    """
+    Endpoint to provide the progress of the last switch of a model.
+
+    Returns:
+        dict: Under `data` key, there is the status of the switch with
+        `state` key, one of `idle`, `loading`, `warming`, `done`, `failed`.
+    """
+    return format_response(data=MODEL_SWAPPER.status())
+
+
+@ENDPOINTS.get('/statistics')
+def get_statistics() -> dict:
+    """
+    Endpoint to provide statistics of the optimisations of inference,
+    useful to monitor their effectiveness.
+
+    Returns:
+        dict: Under `data` key, there are statistics grouped by a component.
+    """
+    data: dict[str, dict | list] = {
+        'nli_batching': {
+            'batches': NLI_BATCHER.processed_batches,
+            'items': NLI_BATCHER.processed_items,
+        },
+        'nli_single_flight': NLI_FLIGHTS.statistics(),
+        'qg_single_flight': QG_FLIGHTS.statistics(),
+    }
+    if NLI_MODEL.cache is not None:
+        data['nli_cache'] = NLI_MODEL.cache.statistics()
+    if RULE_BASED_EVALUATOR is not None:
+        data['nli_fast_path'] = RULE_BASED_EVALUATOR.statistics()
+    data['qg_models'] = loaded_models()
+    if qg_statistics := QG_MODEL.statistics():
+        data['qg_decoding'] = qg_statistics
+    if QUESTION_BANK is not None:
+        data['question_bank'] = QUESTION_BANK.statistics()
+    if QUESTION_STORE is not None:
+        data['question_store'] = {'questions': len(QUESTION_STORE)}
+    if SEMANTIC_CACHE is not None:
+        data['nli_semantic_cache'] = SEMANTIC_CACHE.statistics()
+    if NLI_MODEL.premise_cache is not None:
+        data['nli_premise_cache'] = NLI_MODEL.premise_cache.statistics()
+    if config().nli_cascade_model is not None:
+        data['nli_cascade'] = NLI_MODEL.cascade_statistics()
+    if INFERENCE_CLIENT is not None:
+        data['inference_workers'] = INFERENCE_CLIENT.call(
+            'service', 'statistics'
+        )
+    return format_response(data=data)
+
 
 class QuestionRequest(BaseModel):
     """Body parameter of /generate_question endpoint."""
@@ -315,18 +655,185 @@ def generate_question(
             Otherwise, under `message` there is an error message.
     """
     context = question_context.context
-    answer = ANSWER_CHOOSER.choose_answer(paragraph=context)
-    if not answer:
+    generated_item = find_pregenerated_question(context)
+    if generated_item is None:
+        generated_item = QG_FLIGHTS.run(
+            key=(QG_MODEL.get_model(), context),
+            compute=lambda: generate_new_question(context),
+        )
+    if generated_item is None:
         response.status_code = 400
         message = 'The provided text is not appropriate to generate question. Use a longer one.'
         return format_response(message=message)
 
-    generated_item = QG_MODEL.generate(context=context, answer=answer)
+    return format_response(data=format_generated_question(generated_item))
+
+
+def generate_new_question(context: str) -> dict[str, str] | None:
+    """
+    Choose an answer from `context` and generate a question to it with
+    the current Question Generation model. The question is persisted in
+    the question store, if it is enabled.
+
+    Args:
+        context (str): Paragraph, to which a question is generated.
+
+    Returns:
+        dict[str, str] | None: Dictionary with a generated question,
+            an answer and a context or None if no answer can be chosen.
+    """
+    answer = ANSWER_CHOOSER.choose_answer(paragraph=context)
+    if not answer:
+        return None
+
+    model = QG_MODEL
+    generated_item = model.generate(context=context, answer=answer)
+    if QUESTION_STORE is not None:
+        QUESTION_STORE.insert_many(model=model, items=[generated_item])
+    return generated_item
+
+
+@ENDPOINTS.post('/generate_question/stream', response_model=None)
+def generate_question_stream(
+    question_context: QuestionRequest, response: Response
+) -> StreamingResponse | dict:
+    """
+    Endpoint to generate a question to the supplied context, streaming
+    the question as Server-Sent Events while it is decoded.
+
+    The stream consists of `token` events with a fragment of the question
+    under `text` key, followed by a single `question` event with the same
+    content as a response of `/generate_question` or an `error` event.
+
+    Args:
+        question_context (QuestionRequest): Context, based on which the question will be generated.
+        response (Response): Instance of response, provided automatically.
+
+    Returns:
+        StreamingResponse | dict: Stream of events if a request was
+            successful. Otherwise, under `message` there is an error message.
+    """
+    context = question_context.context
+    generated_item = find_pregenerated_question(context)
+    model = QG_MODEL
+    events: Iterator[str | dict[str, str]]
+    if generated_item is not None:
+        events = iter([generated_item['question'], generated_item])
+    else:
+        answer = ANSWER_CHOOSER.choose_answer(paragraph=context)
+        if not answer:
+            response.status_code = 400
+            message = 'The provided text is not appropriate to generate question. Use a longer one.'
+            return format_response(message=message)
+
+        events = model.generate_stream(context=context, answer=answer)
+
+    def stream() -> Iterator[str]:
+        try:
+            for event in events:
+                if isinstance(event, str):
+                    yield format_event('token', {'text': event})
+                    continue
+
+                if generated_item is None and QUESTION_STORE is not None:
+                    QUESTION_STORE.insert_many(model=model, items=[event])
+                yield format_event(
+                    'question',
+                    format_response(data=format_generated_question(event)),
+                )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            yield format_event('error', format_response(message=str(e)))
+
+    return StreamingResponse(
+        stream(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache'},
+    )
+
+
+def find_pregenerated_question(context: str) -> dict[str, str] | None:
+    """
+    Find a question generated in advance to `context` by the current
+    Question Generation model, first in the question bank, then in
+    the question store. Until the store holds
+    `question_store_per_paragraph` questions to `context`, new questions
+    are generated, so the same question is not served every time.
+
+    Args:
+        context (str): Paragraph, to which a question is requested.
+
+    Returns:
+        dict[str, str] | None: Dictionary with a generated question,
+            an answer and a context or None if there are no such questions.
+    """
+    generated_item = None
+    if QUESTION_BANK is not None:
+        generated_item = QUESTION_BANK.get(context)
+
+    if generated_item is None and QUESTION_STORE is not None:
+        stored = QUESTION_STORE.lookup(paragraph=context, model=QG_MODEL)
+        if stored and len(stored) >= config().question_store_per_paragraph:
+            generated_item = random.choice(stored)
+    return generated_item
+
+
+def format_generated_question(generated_item: dict[str, str]) -> dict:
+    """
+    Format a generated question as data of a response.
+
+    Args:
+        generated_item (dict[str, str]): Generated question with an answer.
+
+    Returns:
+        dict: Dictionary with `question` and `answer` keys, and `answer_id`
+            key if the reference answer is generated later.
+    """
     data = {
         'question': generated_item['question'],
         'answer': generated_item['answer'],
     }
-    return format_response(data=data)
+    # The reference answer is generated later, see `/reference_answer`.
+    if 'answer_id' in generated_item:
+        data['answer_id'] = generated_item['answer_id']
+    return data
+
+
+def format_event(event: str, data: Any) -> str:
+    """
+    Format a Server-Sent Event with JSON data.
+
+    Args:
+        event (str): Name of the event.
+        data (Any): JSON-serializable data of the event.
+
+    Returns:
+        str: Event in the format of the `text/event-stream` media type.
+    """
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+@ENDPOINTS.get('/reference_answer/{answer_id}')
+def get_reference_answer(answer_id: str, response: Response) -> dict:
+    """
+    Endpoint to get a reference answer to a generated question, if
+    the answer is generated later than the question. Waits until the answer
+    is generated.
+
+    Args:
+        answer_id (str): ID of the answer returned together with the question.
+        response (Response): Instance of response, provided automatically.
+
+    Returns:
+        dict: Under `data` key, there is `answer` key with the reference
+        answer. If it is unknown, only `message` key is available.
+    """
+    try:
+        answer = QG_MODEL.reference_answer(answer_id)
+    except KeyError as e:
+        response.status_code = 404
+        return format_response(message=str(e))
+
+    return format_response(data={'answer': answer})
 
 
 class AnswerEvaluationRequest(BaseModel):
@@ -350,10 +857,43 @@ def evaluate_answer(evaluation_request: AnswerEvaluationRequest) -> dict:
         dict: Under `data` key there is `evaluation` key
             with an evaluation.
     """
-    evaluation = NLI_MODEL.infer_relation(
-        premise=evaluation_request.context,
-        hypothesis=evaluation_request.user_answer,
+    context = evaluation_request.context
+    answer = evaluation_request.user_answer
+    evaluation = NLI_FLIGHTS.run(
+        key=(NLI_MODEL.get_model(), context, answer),
+        compute=lambda: evaluate_user_answer(context=context, answer=answer),
     )
 
     response_data = {'evaluation': evaluation.value}
     return format_response(data=response_data)
+
+
+def evaluate_user_answer(context: str, answer: str) -> Relation:
+    """
+    Evaluate an answer with the fast path, the semantic cache or
+    the current Natural Language Inference model, whichever decides first.
+
+    Args:
+        context (str): Learning material, which the answer is evaluated
+            against.
+        answer (str): Answer provided by a user.
+
+    Returns:
+        Relation: Evaluation of the answer.
+    """
+    evaluation = None
+    if RULE_BASED_EVALUATOR is not None:
+        evaluation = RULE_BASED_EVALUATOR.evaluate(
+            context=context, answer=answer
+        )
+    if evaluation is None and SEMANTIC_CACHE is not None:
+        evaluation = SEMANTIC_CACHE.evaluate(
+            premise=context,
+            hypothesis=answer,
+            infer=lambda premise, hypothesis: NLI_BATCHER.submit(
+                (premise, hypothesis)
+            ),
+        )
+    if evaluation is None:
+        evaluation = NLI_BATCHER.submit((context, answer))
+    return evaluation
@@ -1,12 +1,18 @@
 """Module with an interactive command-line interface."""
 
+import atexit
+
 from rich.text import Text
 
 from knowledge_verificator.io_handler import logger, console, config
 from knowledge_verificator.answer_chooser import AnswerChooser
+from knowledge_verificator.inference_service import (
+    load_natural_language_inference_model,
+    load_question_generation_model,
+)
 from knowledge_verificator.materials import MaterialDatabase
 from knowledge_verificator.nli import NaturalLanguageInference, Relation
-from knowledge_verificator.qg.qg_model_factory import create_model
+from knowledge_verificator.rule_based_evaluation import RuleBasedEvaluator
 from knowledge_verificator.utils.menu import choose_from_menu
 
 
@@ -35,6 +41,71 @@ def display_feedback(relation: Relation, chosen_answer: str) -> None:
     console.print(feedback_text)
 
 
+def load_nli_module() -> NaturalLanguageInference:
+    """
+    Load the Natural Language Inference model with settings from
+    the configuration, saving its cache once the session ends.
+
+    Returns:
+        NaturalLanguageInference: The model.
+    """
+    nli_module = load_natural_language_inference_model()
+    if nli_module.cache is not None:
+        # The session ends by interrupting it, so the cache is saved at exit.
+        atexit.register(nli_module.cache.save)
+    return nli_module
+
+
+def create_rule_based_evaluator(
+    answer_chooser: AnswerChooser,
+) -> RuleBasedEvaluator | None:
+    """
+    Create the rule-based evaluator if it is enabled in the configuration.
+
+    Args:
+        answer_chooser (AnswerChooser): Answer chooser used by the evaluator.
+
+    Returns:
+        RuleBasedEvaluator | None: The evaluator or None if it is disabled.
+    """
+    if not config().nli_fast_path:
+        return None
+    return RuleBasedEvaluator(
+        answer_chooser=answer_chooser,
+        min_overlap=config().nli_fast_path_min_overlap,
+    )
+
+
+def evaluate_answer(
+    paragraph: str,
+    user_answer: str,
+    nli_module: NaturalLanguageInference,
+    rule_based_evaluator: RuleBasedEvaluator | None,
+) -> Relation:
+    """
+    Evaluate an answer with rules first and with the NLI model if rules
+    cannot decide.
+
+    Args:
+        paragraph (str): Paragraph, which a question is based on.
+        user_answer (str): An answer provided by a user.
+        nli_module (NaturalLanguageInference): Natural Language Inference
+            model.
+        rule_based_evaluator (RuleBasedEvaluator | None): Rule-based
+            evaluator or None if it is disabled.
+
+    Returns:
+        Relation: Relation between the paragraph and the answer.
+    """
+    if rule_based_evaluator is not None:
+        relation = rule_based_evaluator.evaluate(
+            context=paragraph, answer=user_answer
+        )
+        if relation is not None:
+            return relation
+    return nli_module.infer_relation(premise=paragraph, hypothesis=user_answer)
+
+
 def run_cli_mode():
     """
     Run an interactive command-line interface.
@@ -42,11 +113,12 @@ def run_cli_mode():
     Raises:
         ValueError:
     """
-    qg_module = create_model(config().question_generation_model)
-    ac_module = AnswerChooser()
-    nli_module = NaturalLanguageInference(
-        model=config().natural_language_inference_model
+    qg_module = load_question_generation_model(
+        config().question_generation_model
     )
+    ac_module = AnswerChooser()
+    nli_module = load_nli_module()
+    rule_based_evaluator = create_rule_based_evaluator(ac_module)
 
     while True:
         options = ['knowledge database', 'my own paragraph']
@@ -136,8 +208,8 @@ def run_cli_mode():
             f'\nAnswer the question with full sentence. {question} \nYour answer: '
         )
         user_answer = input().strip()
-        relation = nli_module.infer_relation(
-            premise=paragraph, hypothesis=user_answer
+        relation = evaluate_answer(
+            paragraph, user_answer, nli_module, rule_based_evaluator
         )
 
         display_feedback(relation=relation, chosen_answer=chosen_answer)
@@ -1,21 +1,31 @@
 """Module for downloading resource required for the app to run."""
 
 from knowledge_verificator.answer_chooser import AnswerChooser
+from knowledge_verificator.inference_service import (
+    load_natural_language_inference_model,
+    load_question_generation_model,
+)
 from knowledge_verificator.io_handler import config
-from knowledge_verificator.nli import NaturalLanguageInference
-from knowledge_verificator.qg.qg_model_factory import create_model
+from knowledge_verificator.qg.qg_model_factory import release_model
 
 
 def download_models() -> None:
     """
-    Download the default models for Natural Language Inference,
+    Download the configured models for Natural Language Inference,
     Question Generation, and resources for NLTK.
 
+    Models are built with the configuration, so models they depend on,
+    e.g. a cascade screening model, an exported ONNX graph or a draft model,
+    are downloaded too.
+
     The function is used externally in building a Docker image.
     """
-    NaturalLanguageInference(config().natural_language_inference_model)
+    load_natural_language_inference_model()
     AnswerChooser()
-    create_model(config().question_generation_model)
+    release_model(
+        load_question_generation_model(config().question_generation_model),
+        unload=True,
+    )
 
 
 if __name__ == '__main__':
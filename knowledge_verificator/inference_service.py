@@ -0,0 +1,755 @@
+"""
+Module with a local inference service, whose worker processes own language
+models, so processes of the backend share them instead of loading their own
+copies.
+"""
+
+from dataclasses import dataclass, field
+import itertools
+import logging
+import multiprocessing
+from multiprocessing.connection import Client, Connection, Listener
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Lock
+import os
+import pickle
+import queue
+import secrets
+import threading
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from knowledge_verificator.io_handler import config
+from knowledge_verificator.nli import NaturalLanguageInference, Relation
+from knowledge_verificator.qg.base import QuestionGeneration
+from knowledge_verificator.qg.qg_model_factory import (
+    QuestionGenerationModel,
+    create_model,
+)
+from knowledge_verificator.utils.cache import LRUCache
+from knowledge_verificator.utils.precision import Precision
+
+# Environment variable with the key authenticating processes of the backend
+# to the inference service. Processes started by the service inherit it.
+AUTHKEY_VARIABLE = 'KNOWLEDGE_VERIFICATOR_INFERENCE_KEY'
+
+# Methods of models, which may be called remotely, grouped by a component.
+_METHODS = {
+    'qg': {
+        'generate',
+        'generate_batch',
+        'generate_stream',
+        'reference_answer',
+        'get_model',
+        'get_decoding_parameters',
+        'statistics',
+    },
+    'nli': {
+        'infer_relation',
+        'infer_relation_batch',
+        'warm_premises',
+        'get_model',
+        'cascade_statistics',
+    },
+}
+# Methods yielding items, which are sent to a client one by one.
+_STREAMED = {('qg', 'generate_stream')}
+# Methods called on every worker, e.g. to warm up caches of all of them.
+_BROADCAST = {('nli', 'warm_premises')}
+
+# Component, name of a method, its positional and keyword arguments.
+_Call = tuple[str, str, tuple, dict]
+
+
+def load_question_generation_model(
+    model: QuestionGenerationModel,
+) -> QuestionGeneration:
+    """
+    Get a Question Generation model with settings from the configuration.
+
+    Args:
+        model (QuestionGenerationModel): Chosen QG model.
+
+    Returns:
+        QuestionGeneration: The model. Has to be released with
+            `release_model`, once it is no longer used.
+    """
+    return create_model(
+        model,
+        profile=config().execution_profile,
+        reference_answers=config().qg_reference_answers,
+        draft_model=config().qg_draft_models.get(model),
+        precision=config().qg_precision.get(model, Precision.FP32),
+    )
+
+
+def load_natural_language_inference_model() -> NaturalLanguageInference:
+    """
+    Load the Natural Language Inference model with settings from
+    the configuration.
+
+    Returns:
+        NaturalLanguageInference: The model.
+    """
+    return NaturalLanguageInference(
+        config().natural_language_inference_model,
+        cache=(
+            LRUCache(
+                max_size=config().nli_cache_size, path=config().nli_cache_path
+            )
+            if config().nli_cache_size > 0
+            else None
+        ),
+        premise_sentences=config().nli_premise_sentences,
+        pool_size=config().nli_pool_size,
+        pool_memory=config().nli_pool_memory_mb * 1024**2,
+        precision=config().nli_precision,
+        engine=config().nli_engine,
+        profile=config().execution_profile,
+        cascade_model=config().nli_cascade_model,
+        cascade_threshold=config().nli_cascade_threshold,
+        premise_cache=(
+            LRUCache(max_size=config().nli_premise_cache_size)
+            if config().nli_premise_cache_size > 0
+            else None
+        ),
+    )
+
+
+def load_models() -> dict[str, Any]:
+    """
+    Load models configured for the backend, keyed by their component.
+
+    Returns:
+        dict[str, Any]: Question Generation model under `qg` key and
+            Natural Language Inference model under `nli` key.
+    """
+    return {
+        'qg': load_question_generation_model(
+            config().question_generation_model
+        ),
+        'nli': load_natural_language_inference_model(),
+    }
+
+
+def _picklable(error: Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+    except Exception:  # pylint: disable=broad-exception-caught
+        return RuntimeError(f'{type(error).__name__}: {error}')
+    return error
+
+
+def _work(
+    index: int,
+    load: Callable[[], dict[str, Any]],
+    jobs: Queue,
+    results: Queue,
+    save_lock: Lock,
+) -> None:
+    """Run jobs on models owned by a worker process until it is stopped."""
+    models = load()
+    while (job := jobs.get()) is not None:
+        job_id, component, method, args, kwargs = job
+        try:
+            output = getattr(models[component], method)(*args, **kwargs)
+            if (component, method) in _STREAMED:
+                for item in output:
+                    results.put((index, job_id, 'item', item))
+                output = None
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results.put((index, job_id, 'error', _picklable(e)))
+            continue
+        results.put((index, job_id, 'result', output))
+
+    _save_caches(models, save_lock)
+
+
+def _save_caches(models: dict[str, Any], save_lock: Lock) -> None:
+    """Save caches of models owned by a stopping worker process."""
+    # Workers share the file of the cache, so each of them adds its entries
+    # to ones saved by workers, which stopped before.
+    nli_cache = getattr(models.get('nli'), 'cache', None)
+    if nli_cache is not None:
+        with save_lock:
+            nli_cache.save(merge=True)
+
+
+# Replies to a client are sent by the thread collecting results, so
+# the connection only needs sending serialized by a lock.
+class _Channel:  # pylint: disable=too-few-public-methods
+    """Connection to a client, which may be written to from many threads."""
+
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+        self._lock = threading.Lock()
+
+    def send(self, request_id: int, kind: str, payload: Any) -> None:
+        """
+        Send a reply to a request of the client, unless it has disconnected.
+
+        Args:
+            request_id (int): ID of the request assigned by the client.
+            kind (str): Kind of the reply: `item`, `result` or `error`.
+            payload (Any): Output of a model or an exception.
+        """
+        with self._lock:
+            try:
+                self.connection.send((request_id, kind, payload))
+            except OSError:
+                # The client has disconnected, nobody waits for the reply.
+                pass
+
+
+@dataclass
+class _Job:
+    channel: _Channel
+    request_id: int
+    workers: list[int]
+    outputs: list[Any] = field(default_factory=list)
+
+
+# Workers, their queues and their load are bookkept together under one
+# lock, so jobs are assigned consistently.
+class InferenceService:  # pylint: disable=too-many-instance-attributes
+    """
+    Class running language models in worker processes and serving jobs
+    submitted by clients over a local, authenticated connection.
+
+    Every worker loads its own models and runs one job at a time, so
+    the number of workers is the number of jobs inferred in parallel.
+    A job is assigned to the worker with the fewest unfinished jobs, then
+    the fewest finished ones.
+    Reference answers generated later than questions are requested from
+    the worker, which generated the question.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], dict[str, Any]],
+        workers: int,
+        address: tuple[str, int],
+        authkey: bytes,
+    ) -> None:
+        """
+        Prepare workers and start listening for clients.
+
+        Args:
+            load (Callable[[], dict[str, Any]]): Picklable function loading
+                models keyed by their component, called in every worker.
+            workers (int): Number of worker processes.
+            address (tuple[str, int]): Host and port to listen on. Port 0
+                chooses a free port, see `address` attribute.
+            authkey (bytes): Key, which clients have to authenticate with.
+
+        Raises:
+            ValueError: Raised if `workers` is not positive.
+        """
+        if workers < 1:
+            raise ValueError(
+                'Inference service requires at least one worker. '
+                f'Supplied value: {workers}.'
+            )
+
+        self._logger = logging.getLogger(__name__)
+        # Fresh processes do not inherit threads nor CUDA state of the parent.
+        context = multiprocessing.get_context('spawn')
+        self._results: Queue = context.Queue()
+        self._jobs: list[Queue] = [context.Queue() for _ in range(workers)]
+        # Serializes saves of caches, whose file is shared by workers.
+        self._save_lock = context.Lock()
+        self._processes = [
+            context.Process(
+                target=_work,
+                args=(index, load, jobs, self._results, self._save_lock),
+                name=f'inference-worker-{index}',
+                daemon=True,
+            )
+            for index, jobs in enumerate(self._jobs)
+        ]
+        self._listener = Listener(address, authkey=authkey)
+        # A listener bound to a host and a port has a TCP address.
+        assert isinstance(self._listener.address, tuple)
+        self.address: tuple[str, int] = self._listener.address
+
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count()
+        self._pending: dict[int, _Job] = {}
+        self._unfinished = [0] * workers
+        self._finished = [0] * workers
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start worker processes and threads serving clients."""
+        for process in self._processes:
+            process.start()
+        for target, name in (
+            (self._accept, 'inference-listener'),
+            (self._collect, 'inference-collector'),
+        ):
+            threading.Thread(target=target, name=name, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop accepting clients and stop workers after their jobs."""
+        self._stopped.set()
+        self._listener.close()
+        for jobs in self._jobs:
+            jobs.put(None)
+        for process in self._processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+
+    def statistics(self) -> dict[str, Any]:
+        """
+        Get statistics of workers.
+
+        Returns:
+            dict[str, Any]: Number of `workers`, number of `alive` ones,
+                and numbers of `finished` and `unfinished` jobs per worker.
+        """
+        with self._lock:
+            return {
+                'workers': len(self._processes),
+                'alive': sum(process.is_alive() for process in self._processes),
+                'finished': list(self._finished),
+                'unfinished': list(self._unfinished),
+            }
+
+    def _accept(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                connection = self._listener.accept()
+            except multiprocessing.AuthenticationError:
+                self._logger.warning(
+                    'Rejected a client of the inference service with '
+                    'a wrong key.'
+                )
+                continue
+            except OSError:
+                # The listener has been closed.
+                break
+            threading.Thread(
+                target=self._serve,
+                args=(_Channel(connection),),
+                name='inference-client',
+                daemon=True,
+            ).start()
+
+    def _serve(self, channel: _Channel) -> None:
+        while True:
+            try:
+                request = channel.connection.recv()
+            except (EOFError, OSError):
+                break
+            request_id, *call = request
+            self._submit(channel, request_id, tuple(call))
+        channel.connection.close()
+
+    def _submit(self, channel: _Channel, request_id: int, call: _Call) -> None:
+        component, method, args, kwargs = call
+        if (component, method) == ('service', 'statistics'):
+            channel.send(request_id, 'result', self.statistics())
+            return
+        if method not in _METHODS.get(component, ()):
+            channel.send(
+                request_id,
+                'error',
+                AttributeError(
+                    f'Method `{method}` of `{component}` cannot be called '
+                    'remotely.'
+                ),
+            )
+            return
+
+        with self._lock:
+            alive = [
+                index
+                for index, process in enumerate(self._processes)
+                if process.is_alive()
+            ]
+            if method == 'reference_answer':
+                workers, args = self._route_reference_answer(*args, **kwargs)
+                workers = [index for index in workers if index in alive]
+                kwargs = {}
+            elif (component, method) in _BROADCAST:
+                workers = alive
+            elif alive:
+                # Idle workers take turns, so all of them warm up their caches.
+                workers = [
+                    min(
+                        alive,
+                        key=lambda index: (
+                            self._unfinished[index],
+                            self._finished[index],
+                        ),
+                    )
+                ]
+            else:
+                workers = []
+            if not workers:
+                channel.send(
+                    request_id,
+                    'error',
+                    RuntimeError('No inference worker is available.'),
+                )
+                return
+
+            job_id = next(self._job_ids)
+            self._pending[job_id] = _Job(channel, request_id, workers)
+            for index in workers:
+                self._unfinished[index] += 1
+                self._jobs[index].put((job_id, component, method, args, kwargs))
+
+    def _route_reference_answer(
+        self, answer_id: str
+    ) -> tuple[list[int], tuple]:
+        index, _, original_id = answer_id.partition(':')
+        if not index.isdigit() or int(index) >= len(self._processes):
+            # An unknown answer is reported by any worker.
+            return [0], (answer_id,)
+        return [int(index)], (original_id,)
+
+    def _collect(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                index, job_id, kind, payload = self._results.get(timeout=1.0)
+            except queue.Empty:
+                self._fail_jobs_of_stopped_workers()
+                continue
+
+            with self._lock:
+                if kind != 'item':
+                    self._unfinished[index] -= 1
+                    self._finished[index] += 1
+                job = self._pending.get(job_id)
+                if job is None:
+                    continue
+                if kind == 'result':
+                    job.outputs.append(payload)
+                    if len(job.outputs) < len(job.workers):
+                        continue
+                if kind != 'item':
+                    del self._pending[job_id]
+
+            if kind == 'result' and len(job.workers) > 1:
+                payload = job.outputs
+            job.channel.send(
+                job.request_id, kind, _tag_answer_ids(payload, index)
+            )
+
+    def _fail_jobs_of_stopped_workers(self) -> None:
+        stopped = {
+            index
+            for index, process in enumerate(self._processes)
+            if process.exitcode is not None
+        }
+        if not stopped:
+            return
+
+        with self._lock:
+            failed = {
+                job_id: job
+                for job_id, job in self._pending.items()
+                if stopped.intersection(job.workers)
+            }
+            for job_id in failed:
+                del self._pending[job_id]
+        for job in failed.values():
+            job.channel.send(
+                job.request_id,
+                'error',
+                RuntimeError('Inference worker has stopped unexpectedly.'),
+            )
+
+
+def _tag_answer_ids(payload: Any, index: int) -> Any:
+    """Prefix IDs of reference answers with the worker generating them."""
+    if isinstance(payload, list):
+        return [_tag_answer_ids(item, index) for item in payload]
+    if isinstance(payload, dict) and 'answer_id' in payload:
+        return {**payload, 'answer_id': f'{index}:{payload["answer_id"]}'}
+    return payload
+
+
+class InferenceClient:
+    """
+    Class submitting jobs to the inference service. Jobs may be submitted
+    concurrently from many threads over a single connection.
+    """
+
+    def __init__(self, address: tuple[str, int], authkey: bytes) -> None:
+        """
+        Connect to the inference service.
+
+        Args:
+            address (tuple[str, int]): Host and port of the service.
+            authkey (bytes): Key of the service.
+        """
+        self._connection = Client(address, authkey=authkey)
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self._replies: dict[int, queue.Queue] = {}
+        threading.Thread(
+            target=self._read, name='inference-client', daemon=True
+        ).start()
+
+    def call(self, component: str, method: str, *args, **kwargs) -> Any:
+        """
+        Call a method of a model and block until a worker returns its output.
+        Statistics of the service are returned by `statistics` method of
+        `service` component.
+
+        Args:
+            component (str): Component of the model, `qg` or `nli`.
+            method (str): Name of the method.
+
+        Raises:
+            Exception: Raised if the method raised an exception, which is
+                re-raised in the calling thread.
+
+        Returns:
+            Any: Output of the method.
+        """
+        for output in self._request((component, method, args, kwargs)):
+            return output
+        raise RuntimeError('Inference service has not returned any output.')
+
+    def stream(
+        self, component: str, method: str, *args, **kwargs
+    ) -> Iterator[Any]:
+        """
+        Call a method of a model returning an iterator, yielding its items
+        as soon as a worker yields them.
+
+        Args:
+            component (str): Component of the model, `qg` or `nli`.
+            method (str): Name of the method.
+
+        Yields:
+            Iterator[Any]: Items yielded by the method.
+        """
+        yield from self._request(
+            (component, method, args, kwargs), streamed=True
+        )
+
+    def _request(self, call: _Call, streamed: bool = False) -> Iterator[Any]:
+        replies: queue.Queue = queue.Queue()
+        with self._lock:
+            request_id = next(self._request_ids)
+            self._replies[request_id] = replies
+
+        try:
+            with self._lock:
+                self._connection.send((request_id, *call))
+            while True:
+                kind, payload = replies.get()
+                if kind == 'error':
+                    raise payload
+                if kind == 'result' and streamed:
+                    return
+                yield payload
+                if kind == 'result':
+                    return
+        finally:
+            with self._lock:
+                del self._replies[request_id]
+
+    def _read(self) -> None:
+        while True:
+            try:
+                request_id, kind, payload = self._connection.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                replies = self._replies.get(request_id)
+            if replies is not None:
+                replies.put((kind, payload))
+
+        with self._lock:
+            for replies in self._replies.values():
+                replies.put(
+                    (
+                        'error',
+                        ConnectionError(
+                            'Connection to the inference service has been '
+                            'lost.'
+                        ),
+                    )
+                )
+
+
+class RemoteQuestionGeneration(QuestionGeneration):
+    """Question Generation model running in the inference service."""
+
+    def __init__(self, client: InferenceClient) -> None:
+        """
+        Args:
+            client (InferenceClient): Client of the inference service.
+        """
+        self.client = client
+        self._model_name: str | None = None
+        self._decoding_parameters: dict[str, Any] | None = None
+
+    def generate(self, answer: str, context: str) -> dict[str, str]:
+        return self.client.call(
+            'qg', 'generate', answer=answer, context=context
+        )
+
+    def generate_batch(
+        self, items: Sequence[tuple[str, str]], batch_size: int = 8
+    ) -> list[dict[str, str]]:
+        return self.client.call(
+            'qg', 'generate_batch', items=list(items), batch_size=batch_size
+        )
+
+    def generate_stream(
+        self, answer: str, context: str
+    ) -> Iterator[str | dict[str, str]]:
+        return self.client.stream(
+            'qg', 'generate_stream', answer=answer, context=context
+        )
+
+    def reference_answer(self, answer_id: str) -> str:
+        return self.client.call('qg', 'reference_answer', answer_id)
+
+    def get_decoding_parameters(self) -> dict[str, Any]:
+        # Workers do not switch models, so their parameters never change.
+        if self._decoding_parameters is None:
+            self._decoding_parameters = self.client.call(
+                'qg', 'get_decoding_parameters'
+            )
+        return self._decoding_parameters
+
+    def statistics(self) -> dict[str, Any]:
+        return self.client.call('qg', 'statistics')
+
+    def get_model(self) -> str:
+        if self._model_name is None:
+            self._model_name = self.client.call('qg', 'get_model')
+        return self._model_name
+
+
+class RemoteNaturalLanguageInference:
+    """
+    Natural Language Inference model running in the inference service.
+
+    Caches of the model are kept by workers, so they are not available in
+    the process of a client.
+    """
+
+    cache: LRUCache | None = None
+    premise_cache: LRUCache | None = None
+
+    def __init__(self, client: InferenceClient) -> None:
+        """
+        Args:
+            client (InferenceClient): Client of the inference service.
+        """
+        self.client = client
+        self._model_name: str | None = None
+
+    def get_model(self) -> str:
+        """
+        Get a name of the model used by workers.
+
+        Returns:
+            str: Name of the model.
+        """
+        if self._model_name is None:
+            self._model_name = self.client.call('nli', 'get_model')
+        return self._model_name
+
+    def infer_relation(self, premise: str, hypothesis: str) -> Relation:
+        """
+        Infer the most probable type of relationship between `premise` and
+        `hypothesis`.
+        """
+        return self.client.call(
+            'nli', 'infer_relation', premise=premise, hypothesis=hypothesis
+        )
+
+    def infer_relation_batch(
+        self, pairs: Sequence[tuple[str, str]], batch_size: int = 16
+    ) -> list[Relation]:
+        """
+        Infer the most probable type of relationship for many pairs
+        of premise and hypothesis at once, in a single job.
+
+        Args:
+            pairs (Sequence[tuple[str, str]]): Pairs of premise and hypothesis.
+            batch_size (int, optional): Maximum number of pairs passed to
+                the model in a single forward pass. Defaults to 16.
+
+        Returns:
+            list[Relation]: The most probable relation for each pair,
+                in the order of `pairs`.
+        """
+        return self.client.call(
+            'nli',
+            'infer_relation_batch',
+            pairs=list(pairs),
+            batch_size=batch_size,
+        )
+
+    def warm_premises(self, premises: Iterable[str]) -> None:
+        """
+        Tokenize premises in advance in every worker.
+
+        Args:
+            premises (Iterable[str]): Premises, e.g. paragraphs of learning
+                materials.
+        """
+        self.client.call('nli', 'warm_premises', list(premises))
+
+    def cascade_statistics(self) -> dict[str, float]:
+        """
+        Get statistics of the cascade of one of workers.
+
+        Returns:
+            dict[str, float]: Statistics of the cascade.
+        """
+        return self.client.call('nli', 'cascade_statistics')
+
+
+def start_inference_service() -> InferenceService:
+    """
+    Start the inference service configured for the backend. Processes
+    started later by the calling process, e.g. processes of the backend,
+    inherit the key to connect to the service.
+
+    Returns:
+        InferenceService: Started service.
+    """
+    authkey = os.environ.setdefault(AUTHKEY_VARIABLE, secrets.token_hex(32))
+    service = InferenceService(
+        load=load_models,
+        workers=config().inference_workers,
+        address=('127.0.0.1', config().inference_port),
+        authkey=bytes.fromhex(authkey),
+    )
+    service.start()
+    return service
+
+
+def connect_to_inference_service() -> InferenceClient:
+    """
+    Connect to the inference service configured for the backend.
+
+    Raises:
+        RuntimeError: Raised if the key of the service is unknown, because
+            the service has not been started by the main module.
+
+    Returns:
+        InferenceClient: Client of the service.
+    """
+    authkey = os.environ.get(AUTHKEY_VARIABLE)
+    if authkey is None:
+        raise RuntimeError(
+            'The inference service has not been started. Run the backend '
+            f'with the main module or set `{AUTHKEY_VARIABLE}` to the key '
+            'of a running service.'
+        )
+    return InferenceClient(
+        address=('127.0.0.1', config().inference_port),
+        authkey=bytes.fromhex(authkey),
+    )
@@ -5,6 +5,7 @@ import subprocess
 import sys
 
 import uvicorn
+from knowledge_verificator.inference_service import start_inference_service
 from knowledge_verificator.io_handler import config
 from knowledge_verificator.utils.configuration_parser import OperatingMode
 from knowledge_verificator.command_line import run_cli_mode
@@ -12,14 +13,24 @@ from tests.model.runner import ExperimentRunner
 
 
 def run_backend() -> None:
-    """Run the HTTP backend of the system."""
-
-    uvicorn.run(
-        'knowledge_verificator.backend:ENDPOINTS',
-        host=config().backend_address,
-        port=config().backend_port,
-        reload=(not config().production_mode),
+    """
+    Run the HTTP backend of the system. If inference workers are enabled,
+    they are started first and shared by all processes of the backend.
+    """
+    service = (
+        start_inference_service() if config().inference_workers > 0 else None
     )
+    try:
+        uvicorn.run(
+            'knowledge_verificator.backend:ENDPOINTS',
+            host=config().backend_address,
+            port=config().backend_port,
+            reload=(not config().production_mode),
+            workers=config().backend_workers,
+        )
+    finally:
+        if service is not None:
+            service.stop()
 
 
 def run_frontend() -> subprocess.Popen:
@@ -1,13 +1,36 @@
 """Natural Language Inference module with pre-trained RoBERTa-Large."""
 
+from contextlib import contextmanager
+import hashlib
 import logging
 from enum import Enum
+import threading
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
 from transformers import (  # type: ignore[import-untyped]
+    AutoConfig,
     AutoTokenizer,
     AutoModelForSequenceClassification,
+    BatchEncoding,
 )
 import torch
 
+from knowledge_verificator.onnx_engine import OnnxSequenceClassifier
+from knowledge_verificator.utils.cache import LRUCache
+from knowledge_verificator.utils.execution import ExecutionProfile
+from knowledge_verificator.utils.model_pool import ModelPool, model_memory
+from knowledge_verificator.utils.precision import (
+    Precision,
+    apply_precision,
+    autocast,
+    resolve_precision,
+)
+from knowledge_verificator.utils.string import (
+    normalize_text,
+    select_relevant_sentences,
+)
+
 
 class Relation(Enum):
     """Possible relations between premise and hypothesis."""
@@ -27,31 +50,265 @@ class NaturalLanguageInferenceModel(Enum):
         'ynie/electra-large-discriminator-snli_mnli_fever_anli_R1_R2_R3-nli'
     )
     XLNET = 'ynie/xlnet-large-cased-snli_mnli_fever_anli_R1_R2_R3-nli'
+    # Small and fast model, useful as the first stage of a cascade.
+    MINILM = 'cross-encoder/nli-MiniLM2-L6-H768'
+
+
+def _relation_order(model: NaturalLanguageInferenceModel) -> list[int]:
+    """
+    Find indices of entailment, neutrality and contradiction (in this order)
+    in outputs of a model, based on names of its labels.
+
+    Args:
+        model (NaturalLanguageInferenceModel): Model to inspect.
+
+    Returns:
+        list[int]: Indices of outputs corresponding to relations. Models with
+            unnamed labels are assumed to output them in the order of
+            `Relation`.
+    """
+    id2label = AutoConfig.from_pretrained(model.value).id2label
+    labels = {
+        str(label).lower(): int(index) for index, label in id2label.items()
+    }
+    if all(relation.value in labels for relation in Relation):
+        return [labels[relation.value] for relation in Relation]
+    return list(range(len(Relation)))
+
+
+class InferenceEngine(Enum):
+    """
+    Available engines running Natural Language Inference models.
+
+    These engines mean:
+    - PYTORCH - the model is run by PyTorch in eager mode.
+    - ONNX - the model is exported once to an ONNX graph, cached on a disk,
+        and run by ONNX Runtime on CPU. Requires `onnx` and `onnxruntime`
+        packages.
+    """
+
+    PYTORCH = 'pytorch'
+    ONNX = 'onnx'
 
 
-class NaturalLanguageInference:
+@contextmanager
+def _quiet_tokenizer_warnings() -> Iterator[None]:
+    """
+    Suppress warnings of tokenizers logged by the current thread, e.g. about
+    truncation and slow padding when cached token ids are joined. Warnings of
+    other threads and errors are still logged.
+    """
+    thread = threading.get_ident()
+
+    def keep(record: logging.LogRecord) -> bool:
+        return record.thread != thread or record.levelno >= logging.ERROR
+
+    logger = logging.getLogger('transformers.tokenization_utils_base')
+    logger.addFilter(keep)
+    try:
+        yield
+    finally:
+        logger.removeFilter(keep)
+
+
+# Models, their caches and the cascade are tuned independently, and callers
+# pass only the options they change, so they are not grouped.
+class NaturalLanguageInference:  # pylint: disable=too-many-instance-attributes
     """Implementation of Natural Language Inference module."""
 
-    def __init__(self, model: NaturalLanguageInferenceModel) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        model: NaturalLanguageInferenceModel,
+        *,
+        cache: LRUCache | None = None,
+        premise_sentences: int = 0,
+        pool_size: int = 1,
+        pool_memory: int = 0,
+        precision: Precision = Precision.FP32,
+        engine: InferenceEngine = InferenceEngine.PYTORCH,
+        profile: ExecutionProfile | None = None,
+        cascade_model: NaturalLanguageInferenceModel | None = None,
+        cascade_threshold: float = 0.9,
+        premise_cache: LRUCache | None = None,
+    ) -> None:
+        """
+        Load the chosen model and its tokenizer.
+
+        Args:
+            model (NaturalLanguageInferenceModel): Desired model.
+            cache (LRUCache | None, optional): Cache of already inferred
+                probabilities. If None, nothing is cached. Defaults to None.
+            premise_sentences (int, optional): Number of sentences of
+                a premise, the most relevant to a hypothesis, passed to
+                the model. Shorter inputs are cheaper and are not truncated.
+                If 0, the whole premise is used. Defaults to 0.
+            pool_size (int, optional): Number of models kept loaded, so
+                switching back to them is instant. Defaults to 1.
+            pool_memory (int, optional): Maximum memory, in bytes, occupied
+                by the loaded models. If 0, memory is not limited.
+                Defaults to 0.
+            precision (Precision, optional): Numerical precision of
+                the model. `Precision.BF16` applies only to the PyTorch
+                engine. Defaults to Precision.FP32.
+            engine (InferenceEngine, optional): Engine running the model.
+                Defaults to InferenceEngine.PYTORCH.
+            profile (ExecutionProfile | None, optional): Settings of PyTorch
+                execution. If None, the default profile is used.
+            cascade_model (NaturalLanguageInferenceModel | None, optional):
+                Small model classifying pairs first. Only pairs, for which
+                it is unsure, are passed to `model`. If None, every pair is
+                classified by `model`. Defaults to None.
+            cascade_threshold (float, optional): Minimal probability of
+                the most probable relation, for which a verdict of
+                `cascade_model` is accepted. Defaults to 0.9.
+            premise_cache (LRUCache | None, optional): Cache of token ids
+                of premises, so a premise is tokenized once per tokenizer
+                and only hypotheses are tokenized for every pair. If None,
+                whole pairs are tokenized every time. Defaults to None.
+        """
         logging.getLogger('transformers.modeling_utils').setLevel(logging.ERROR)
         self.max_new_tokens = 256
-        self.set_model(model)
+        self.cache = cache
+        self.premise_sentences = premise_sentences
+        self.precision = resolve_precision(precision)
+        self.engine = engine
+        self.profile = profile if profile is not None else ExecutionProfile()
+        self.profile.apply()
+        self._lock = threading.Lock()
+        self.premise_cache = premise_cache
+
+        self.cascade_threshold = cascade_threshold
+        self.screened = 0
+        self.escalated = 0
+        self._screening_model: NaturalLanguageInference | None = None
+        if cascade_model is not None:
+            self._screening_model = NaturalLanguageInference(
+                model=cascade_model,
+                premise_sentences=premise_sentences,
+                precision=self.precision,
+                engine=engine,
+                profile=self.profile,
+                premise_cache=premise_cache,
+            )
+
+        self._pool: ModelPool[NaturalLanguageInferenceModel, tuple] = ModelPool(
+            load=self._load,
+            max_models=pool_size,
+            max_memory=pool_memory,
+            measure=self._measure,
+        )
+        self._model_type = model
+        self.tokenizer, self.model, self._relation_order = self.load_model(
+            model
+        )
 
     def set_model(self, model: NaturalLanguageInferenceModel) -> None:
         """
         Switch the language model and tokenizer based on the supplied option.
 
+        Models already present in the pool of loaded models are switched
+        to without loading them again. Cached results of the previous model
+        are dropped.
+
         Args:
             model (NaturalLanguageInferenceModel): Desired model.
         """
-        self._model_type = model
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            self._model_type.value, clean_up_tokenization_spaces=True
+        self.install_model(model, self.load_model(model))
+
+    def load_model(self, model: NaturalLanguageInferenceModel) -> tuple:
+        """
+        Load a model and its tokenizer without switching to them, so
+        the current model keeps serving in the meantime.
+
+        Args:
+            model (NaturalLanguageInferenceModel): Desired model.
+
+        Returns:
+            tuple: Loaded model, to be passed to `warm_up` and `install_model`.
+        """
+        return self._pool.get(model)
+
+    def warm_up(
+        self, model: NaturalLanguageInferenceModel, loaded: tuple
+    ) -> None:
+        """
+        Run a loaded model once, so its first real request is not slowed down
+        by lazy initialisation.
+
+        Args:
+            model (NaturalLanguageInferenceModel): Type of the loaded model.
+            loaded (tuple): Model returned by `load_model`.
+        """
+        tokenizer, language_model, _ = loaded
+        batch = tokenizer(
+            'Warm-up.',
+            'Warm-up.',
+            return_token_type_ids=True,
+            return_tensors='pt',
         )
-        self.model = AutoModelForSequenceClassification.from_pretrained(
-            self._model_type.value
+        with self.profile.inference('nli'), autocast(self.precision):
+            language_model(
+                batch['input_ids'],
+                attention_mask=batch['attention_mask'],
+                # `bart` model does not have `token_type_ids`.
+                token_type_ids=(
+                    batch['token_type_ids']
+                    if model != NaturalLanguageInferenceModel.BART
+                    else None
+                ),
+                labels=None,
+            )
+
+    def install_model(
+        self, model: NaturalLanguageInferenceModel, loaded: tuple
+    ) -> None:
+        """
+        Atomically switch to a loaded model. Inference in progress finishes
+        with the previous model. Cached results of the previous model are
+        dropped.
+
+        Args:
+            model (NaturalLanguageInferenceModel): Type of the loaded model.
+            loaded (tuple): Model returned by `load_model`.
+        """
+        with self._lock:
+            if self.cache is not None and self._model_type != model:
+                namespace = self._cache_namespace(self._model_type)
+                self.cache.remove_if(lambda key: key[0] == namespace)
+
+            self.tokenizer, self.model, self._relation_order = loaded
+            self._model_type = model
+
+    def _load(self, model: NaturalLanguageInferenceModel) -> tuple:
+        tokenizer = AutoTokenizer.from_pretrained(
+            model.value, clean_up_tokenization_spaces=True
+        )
+        if self.engine == InferenceEngine.ONNX:
+            onnx_model = OnnxSequenceClassifier.load(
+                model_name=model.value,
+                tokenizer=tokenizer,
+                # `bart` model does not have `token_type_ids`.
+                use_token_type_ids=model != NaturalLanguageInferenceModel.BART,
+                quantized=self.precision == Precision.INT8,
+            )
+            return tokenizer, onnx_model, _relation_order(model)
+
+        language_model = AutoModelForSequenceClassification.from_pretrained(
+            model.value
+        )
+        language_model = apply_precision(language_model, self.precision)
+        return (
+            tokenizer,
+            self.profile.prepare(language_model),
+            _relation_order(model),
         )
 
+    def _measure(self, loaded: tuple) -> int:
+        _, language_model, _ = loaded
+        if isinstance(language_model, OnnxSequenceClassifier):
+            return language_model.path.stat().st_size
+        return model_memory(language_model)
+
     def get_model(self) -> str:
         """
         Get a pretty-formatted name of the currently loaded model.
@@ -86,46 +343,9 @@ class NaturalLanguageInference:
             Relations names (entailment, neutrality, and contradiction) and
             their corresponding probabilities.
         """
-
-        tokenized_input_seq_pair = self.tokenizer.encode_plus(
-            premise,
-            hypothesis,
-            max_length=self.max_new_tokens,
-            return_token_type_ids=True,
-            truncation=True,
-        )
-
-        input_ids = (
-            torch.Tensor(tokenized_input_seq_pair['input_ids'])
-            .long()
-            .unsqueeze(0)
-        )
-
-        token_type_ids = None
-        # `bart` model does not have `token_type_ids`.
-        if self._model_type != NaturalLanguageInferenceModel.BART:
-            token_type_ids = (
-                torch.Tensor(tokenized_input_seq_pair['token_type_ids'])
-                .long()
-                .unsqueeze(0)
-            )
-
-        attention_mask = (
-            torch.Tensor(tokenized_input_seq_pair['attention_mask'])
-            .long()
-            .unsqueeze(0)
-        )
-
-        outputs = self.model(
-            input_ids,
-            attention_mask=attention_mask,
-            token_type_ids=token_type_ids,
-            labels=None,
-        )
-
-        predicted_probability = torch.softmax(outputs[0], dim=1)[
+        predicted_probability = self.infer_batch(pairs=[(premise, hypothesis)])[
             0
-        ].tolist()  # batch_size only one
+        ].tolist()
 
         entailment = round(predicted_probability[0], precision)
         neutral = round(predicted_probability[1], precision)
@@ -138,6 +358,237 @@ class NaturalLanguageInference:
             ),
         }
 
+    def infer_batch(
+        self,
+        pairs: Sequence[tuple[str, str]],
+        batch_size: int = 16,
+    ) -> np.ndarray:
+        """
+        Infer probabilities of entailment, neutrality, and contradiction
+        for many pairs of premise and hypothesis at once.
+
+        Pairs are sorted by their length and split into buckets of at most
+        `batch_size` pairs. Each bucket is padded only to the length of its
+        longest pair, so short answers are not padded to the length of
+        the longest paragraph in the whole batch.
+
+        Args:
+            pairs (Sequence[tuple[str, str]]): Pairs of premise and hypothesis.
+            batch_size (int, optional): Maximum number of pairs passed to
+                the model in a single forward pass. Defaults to 16.
+
+        Returns:
+            np.ndarray: Array of shape `(len(pairs), 3)`. The i-th row holds
+                probabilities of entailment, neutrality and contradiction
+                (in this order) for the i-th pair.
+        """
+        # A model is never switched in the middle of a batch.
+        with self._lock:
+            probabilities = np.zeros(shape=(len(pairs), len(Relation)))
+            uncached = list(range(len(pairs)))
+            if self.cache is not None:
+                uncached = []
+                for i, (premise, hypothesis) in enumerate(pairs):
+                    cached = self.cache.get(
+                        self._cache_key(premise, hypothesis)
+                    )
+                    if cached is None:
+                        uncached.append(i)
+                    else:
+                        probabilities[i] = cached
+
+            if not uncached:
+                return probabilities
+
+            probabilities[uncached] = self._cascade(
+                pairs=[pairs[i] for i in uncached], batch_size=batch_size
+            )
+
+            if self.cache is not None:
+                for i in uncached:
+                    premise, hypothesis = pairs[i]
+                    self.cache.put(
+                        self._cache_key(premise, hypothesis),
+                        probabilities[i].tolist(),
+                    )
+
+            return probabilities
+
+    def _cascade(
+        self, pairs: Sequence[tuple[str, str]], batch_size: int
+    ) -> np.ndarray:
+        if self._screening_model is None:
+            return self._forward(pairs=pairs, batch_size=batch_size)
+
+        # The screening model has no cache, so it only runs its model.
+        probabilities = self._screening_model.infer_batch(
+            pairs=pairs, batch_size=batch_size
+        )
+        unsure = [
+            i
+            for i, row in enumerate(probabilities)
+            if row.max() < self.cascade_threshold
+        ]
+        self.screened += len(pairs)
+        self.escalated += len(unsure)
+        if unsure:
+            probabilities[unsure] = self._forward(
+                pairs=[pairs[i] for i in unsure], batch_size=batch_size
+            )
+        return probabilities
+
+    def cascade_statistics(self) -> dict[str, float]:
+        """
+        Get statistics of the cascade of models.
+
+        Returns:
+            dict[str, float]: Number of pairs classified by the small model
+                (`screened`), number of pairs passed to the large model
+                (`escalated`) and the fraction of escalated pairs
+                (`escalation_rate`).
+        """
+        return {
+            'screened': self.screened,
+            'escalated': self.escalated,
+            'escalation_rate': (
+                self.escalated / self.screened if self.screened else 0.0
+            ),
+        }
+
+    def _cache_namespace(self, model: NaturalLanguageInferenceModel) -> str:
+        namespace = f'{model.name}:{self.precision.value}:{self.engine.value}'
+        if self.premise_sentences > 0:
+            # Keys hash whole premises, while the model sees only a window.
+            namespace += f':{self.premise_sentences}s'
+        if self._screening_model is not None:
+            # Verdicts of a cascade differ from verdicts of a single model.
+            namespace += (
+                f':{self._screening_model.get_model()}'
+                f'@{self.cascade_threshold}'
+            )
+        return namespace
+
+    def _cache_key(self, premise: str, hypothesis: str) -> tuple[str, str, str]:
+        return (
+            self._cache_namespace(self._model_type),
+            hashlib.sha256(premise.encode(encoding='utf-8')).hexdigest(),
+            normalize_text(hypothesis),
+        )
+
+    def warm_premises(self, premises: Iterable[str]) -> None:
+        """
+        Tokenize premises in advance and store their token ids in the premise
+        cache, so inferring relations with them only tokenizes hypotheses.
+        Does nothing without the premise cache or with `premise_sentences`,
+        as then the model receives sentences chosen for every hypothesis,
+        which are not known in advance.
+
+        Args:
+            premises (Iterable[str]): Premises, e.g. paragraphs of
+                learning materials.
+        """
+        if self.premise_cache is None or self.premise_sentences > 0:
+            return
+
+        premises = list(premises)
+        for premise in premises:
+            with self._lock:
+                self._premise_ids(premise)
+        if self._screening_model is not None:
+            self._screening_model.warm_premises(premises)
+
+    def _premise_ids(self, premise: str) -> list[int]:
+        assert self.premise_cache is not None
+        key = (
+            self._model_type.value,
+            hashlib.sha256(premise.encode(encoding='utf-8')).hexdigest(),
+        )
+        premise_ids = self.premise_cache.get(key)
+        if premise_ids is None:
+            premise_ids = self.tokenizer(premise, add_special_tokens=False)[
+                'input_ids'
+            ]
+            self.premise_cache.put(key, premise_ids)
+        return premise_ids
+
+    def _tokenize(self, pairs: Sequence[tuple[str, str]]) -> BatchEncoding:
+        if self.premise_cache is None:
+            return self.tokenizer(
+                [premise for premise, _ in pairs],
+                [hypothesis for _, hypothesis in pairs],
+                max_length=self.max_new_tokens,
+                padding=True,
+                return_token_type_ids=True,
+                truncation=True,
+                return_tensors='pt',
+            )
+
+        # Join cached ids of a premise with freshly tokenized hypothesis,
+        # adding special tokens and truncating the same way as above.
+        with _quiet_tokenizer_warnings():
+            encodings = [
+                self.tokenizer.prepare_for_model(
+                    self._premise_ids(premise),
+                    self.tokenizer(hypothesis, add_special_tokens=False)[
+                        'input_ids'
+                    ],
+                    max_length=self.max_new_tokens,
+                    return_token_type_ids=True,
+                    truncation=True,
+                )
+                for premise, hypothesis in pairs
+            ]
+            return self.tokenizer.pad(
+                encodings, padding=True, return_tensors='pt'
+            )
+
+    def _forward(
+        self, pairs: Sequence[tuple[str, str]], batch_size: int
+    ) -> np.ndarray:
+        probabilities = np.zeros(shape=(len(pairs), len(Relation)))
+        if self.premise_sentences > 0:
+            pairs = [
+                (
+                    select_relevant_sentences(
+                        text=premise,
+                        query=hypothesis,
+                        count=self.premise_sentences,
+                    ),
+                    hypothesis,
+                )
+                for premise, hypothesis in pairs
+            ]
+
+        # Buckets of similar length minimise the number of padding tokens.
+        order = sorted(
+            range(len(pairs)),
+            key=lambda i: len(pairs[i][0]) + len(pairs[i][1]),
+        )
+        for start in range(0, len(order), batch_size):
+            bucket = order[start : start + batch_size]
+            batch = self._tokenize([pairs[i] for i in bucket])
+
+            token_type_ids = None
+            # `bart` model does not have `token_type_ids`.
+            if self._model_type != NaturalLanguageInferenceModel.BART:
+                token_type_ids = batch['token_type_ids']
+
+            with self.profile.inference('nli'), autocast(self.precision):
+                outputs = self.model(
+                    batch['input_ids'],
+                    attention_mask=batch['attention_mask'],
+                    token_type_ids=token_type_ids,
+                    labels=None,
+                )
+
+            probabilities[bucket] = (
+                torch.softmax(outputs[0], dim=1)[:, self._relation_order]
+                .float()
+                .numpy()
+            )
+
+        return probabilities
+
     def infer_relation(
         self,
         premise: str,
@@ -147,17 +598,29 @@ class NaturalLanguageInference:
         Infer the most probable type of relationship between `premise` and
         `hypothesis`.
         """
-        inference = self.infer(
-            premise=premise, hypothesis=hypothesis, precision=10
-        )
+        return self.infer_relation_batch(pairs=[(premise, hypothesis)])[0]
+
+    def infer_relation_batch(
+        self,
+        pairs: Sequence[tuple[str, str]],
+        batch_size: int = 16,
+    ) -> list[Relation]:
+        """
+        Infer the most probable type of relationship for many pairs
+        of premise and hypothesis at once.
 
-        max_probability = 0.0
-        most_probable = Relation.CONTRADICTION
-        for relation, probability in inference.items():
-            if probability > max_probability:
-                max_probability = probability
-                most_probable = relation
-        return most_probable
+        Args:
+            pairs (Sequence[tuple[str, str]]): Pairs of premise and hypothesis.
+            batch_size (int, optional): Maximum number of pairs passed to
+                the model in a single forward pass. Defaults to 16.
+
+        Returns:
+            list[Relation]: The most probable relation for each pair,
+                in the order of `pairs`.
+        """
+        probabilities = self.infer_batch(pairs=pairs, batch_size=batch_size)
+        relations = list(Relation)
+        return [relations[index] for index in probabilities.argmax(axis=1)]
 
 
 def get_available_nli_models() -> list[str]:
@@ -0,0 +1,202 @@
+"""
+Module with the ONNX Runtime engine running sequence classification models
+exported from PyTorch to an optimised ONNX graph.
+"""
+
+from pathlib import Path
+
+from huggingface_hub import constants
+import torch
+from transformers import (  # type: ignore[import-untyped]
+    AutoModelForSequenceClassification,
+    PreTrainedTokenizerBase,
+)
+
+from knowledge_verificator.utils.filesystem import write_atomically
+
+try:
+    import onnxruntime  # type: ignore[import-untyped]
+    from onnxruntime.quantization import (  # type: ignore[import-untyped]
+        QuantType,
+        quantize_dynamic,
+    )
+except ImportError:
+    onnxruntime = None
+
+
+def _require_onnxruntime() -> None:
+    if onnxruntime is None:
+        raise ImportError(
+            'The ONNX Runtime engine requires the `onnxruntime` package. '
+            'Install it with `poetry install --extras onnx`.'
+        )
+
+
+def onnx_model_path(model_name: str, quantized: bool = False) -> Path:
+    """
+    Get the location of an exported ONNX graph next to the Hugging Face cache.
+
+    Args:
+        model_name (str): Name of a model in the Hugging Face Hub.
+        quantized (bool, optional): Location of the graph with weights
+            quantized to int8. Defaults to False.
+
+    Returns:
+        Path: Path to the ONNX graph.
+    """
+    directory = Path(constants.HF_HOME).joinpath(
+        'onnx', 'models--' + model_name.replace('/', '--')
+    )
+    return directory / ('model_int8.onnx' if quantized else 'model.onnx')
+
+
+def export_to_onnx(
+    model_name: str,
+    tokenizer: PreTrainedTokenizerBase,
+    use_token_type_ids: bool,
+    path: Path,
+) -> None:
+    """
+    Export a sequence classification model to an ONNX graph with dynamic
+    batch size and sequence length. The graph appears at `path` only once
+    it is exported completely.
+
+    Args:
+        model_name (str): Name of a model in the Hugging Face Hub.
+        tokenizer (PreTrainedTokenizerBase): Tokenizer of the model.
+        use_token_type_ids (bool): If the model accepts `token_type_ids`.
+        path (Path): Location of the exported graph.
+    """
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    input_names = ['input_ids', 'attention_mask']
+    if use_token_type_ids:
+        input_names.append('token_type_ids')
+
+    sample = tokenizer(
+        'Premise.',
+        'Hypothesis.',
+        return_token_type_ids=True,
+        return_tensors='pt',
+    )
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['logits'] = {0: 'batch'}
+
+    def export(destination: Path) -> None:
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                args=(),
+                f=str(destination),
+                kwargs={name: sample[name] for name in input_names},
+                input_names=input_names,
+                output_names=['logits'],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                dynamo=False,
+            )
+
+    write_atomically(path, export)
+
+
+class OnnxSequenceClassifier:
+    """
+    Class running an exported sequence classification model with ONNX Runtime
+    on CPU. It is called the same way as a PyTorch model.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Start an ONNX Runtime session with all graph optimisations enabled.
+
+        Args:
+            path (Path): Path to an ONNX graph.
+        """
+        _require_onnxruntime()
+        self.path = path
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        self.session = onnxruntime.InferenceSession(
+            str(path), options, providers=['CPUExecutionProvider']
+        )
+        self._input_names = {
+            model_input.name for model_input in self.session.get_inputs()
+        }
+
+    @classmethod
+    def load(
+        cls,
+        model_name: str,
+        tokenizer: PreTrainedTokenizerBase,
+        use_token_type_ids: bool,
+        quantized: bool = False,
+    ) -> 'OnnxSequenceClassifier':
+        """
+        Load an ONNX graph of a model, exporting it first if it has not been
+        exported yet.
+
+        Args:
+            model_name (str): Name of a model in the Hugging Face Hub.
+            tokenizer (PreTrainedTokenizerBase): Tokenizer of the model.
+            use_token_type_ids (bool): If the model accepts `token_type_ids`.
+            quantized (bool, optional): Use the graph with weights dynamically
+                quantized to int8. Defaults to False.
+
+        Returns:
+            OnnxSequenceClassifier: Model ready for inference.
+        """
+        _require_onnxruntime()
+        path = onnx_model_path(model_name)
+        if not path.exists():
+            export_to_onnx(model_name, tokenizer, use_token_type_ids, path)
+
+        if quantized:
+            quantized_path = onnx_model_path(model_name, quantized=True)
+            if not quantized_path.exists():
+                write_atomically(
+                    quantized_path,
+                    lambda destination: quantize_dynamic(
+                        path, destination, weight_type=QuantType.QInt8
+                    ),
+                )
+            path = quantized_path
+
+        return cls(path)
+
+    def __call__(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor | None = None,
+        token_type_ids: torch.Tensor | None = None,
+        labels: None = None,  # pylint: disable=unused-argument
+    ) -> tuple[torch.Tensor]:
+        """
+        Classify a batch of tokenized inputs.
+
+        Args:
+            input_ids (torch.Tensor): Token ids.
+            attention_mask (torch.Tensor | None, optional): Attention mask.
+                Defaults to None.
+            token_type_ids (torch.Tensor | None, optional): Token type ids,
+                ignored if the graph does not accept them. Defaults to None.
+            labels (None, optional): Unused, present for compatibility with
+                PyTorch models.
+
+        Returns:
+            tuple[torch.Tensor]: One-element tuple with logits.
+        """
+        inputs = {
+            'input_ids': input_ids,
+            'attention_mask': attention_mask,
+            'token_type_ids': token_type_ids,
+        }
+        feeds = {
+            name: tensor.numpy()
+            for name, tensor in inputs.items()
+            if name in self._input_names and tensor is not None
+        }
+        (logits,) = self.session.run(['logits'], feeds)
+        return (torch.from_numpy(logits),)
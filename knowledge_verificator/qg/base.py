@@ -1,6 +1,7 @@
 """Module with an interface of question generation module."""
 
 from abc import ABC, abstractmethod
+from typing import Any, Iterator, Sequence
 
 
 class QuestionGeneration(ABC):
@@ -19,6 +20,103 @@ class QuestionGeneration(ABC):
             dict[str, str]: Dictionary with a generated question, and a provided answer and context.
         """
 
+    def generate_batch(
+        self,
+        items: Sequence[tuple[str, str]],
+        batch_size: int = 8,  # pylint: disable=unused-argument
+    ) -> list[dict[str, str]]:
+        """
+        Generate questions for many pairs of answer and context at once.
+
+        The default implementation generates questions one by one, so it
+        does not need `batch_size`. Models should override it to generate
+        a whole batch in one pass.
+
+        Args:
+            items (Sequence[tuple[str, str]]): Pairs of a correct answer and
+                a context.
+            batch_size (int, optional): Maximum number of questions generated
+                in a single pass. Defaults to 8.
+
+        Returns:
+            list[dict[str, str]]: Dictionaries with a generated question,
+                and a provided answer and context, in the order of `items`.
+        """
+        return [
+            self.generate(answer=answer, context=context)
+            for answer, context in items
+        ]
+
+    def generate_stream(
+        self, answer: str, context: str
+    ) -> Iterator[str | dict[str, str]]:
+        """
+        Generate a question, yielding fragments of the question as soon as
+        they are decoded.
+
+        The default implementation yields the whole question at once. Models
+        should override it to yield fragments during decoding.
+
+        Args:
+            answer (str): Correct answer to a question to be generated.
+            context (str): Contextual information, useful for question generation.
+
+        Yields:
+            Iterator[str | dict[str, str]]: Fragments of the question and,
+                as the last element, a dictionary the same as returned by
+                `generate`.
+        """
+        generated_item = self.generate(answer=answer, context=context)
+        yield generated_item['question']
+        yield generated_item
+
+    def reference_answer(self, answer_id: str) -> str:
+        """
+        Get a reference answer generated later than its question.
+
+        Models generating answers together with questions have no such
+        answers.
+
+        Args:
+            answer_id (str): Identifier of the answer returned together with
+                the question.
+
+        Raises:
+            KeyError: Raised if there is no answer with such identifier.
+
+        Returns:
+            str: Reference answer to the question.
+        """
+        raise KeyError(f'There is no reference answer with id = {answer_id}.')
+
+    def get_decoding_parameters(self) -> dict[str, Any]:
+        """
+        Get parameters of decoding affecting generated questions, e.g. to
+        tell apart questions generated with different settings.
+
+        Returns:
+            dict[str, Any]: JSON-serializable parameters of decoding.
+        """
+        return {}
+
+    def statistics(self) -> dict[str, Any]:
+        """
+        Get statistics of decoding, e.g. budgets of decoded tokens.
+
+        Returns:
+            dict[str, Any]: Statistics of the model. Empty by default.
+        """
+        return {}
+
+    def close(self) -> None:
+        """
+        Stop background threads of the model, so it can be garbage-collected
+        once it is no longer referenced. The model cannot be used afterwards.
+
+        Models without background threads do nothing.
+        """
+        return
+
     @abstractmethod
     def get_model(self) -> str:
         """
@@ -0,0 +1,54 @@
+"""Module with loading of Question Generation models and their draft models."""
+
+from typing import Any
+
+from transformers import AutoModelForSeq2SeqLM  # type: ignore[import-untyped]
+
+from knowledge_verificator.utils.execution import ExecutionProfile
+from knowledge_verificator.utils.precision import Precision, apply_precision
+
+
+def prepare_model(
+    model: Any, precision: Precision, profile: ExecutionProfile
+) -> Any:
+    """
+    Prepare a loaded model for inference in the desired precision.
+
+    Args:
+        model (Any): Loaded sequence-to-sequence model.
+        precision (Precision): Precision supported by the device, see
+            `resolve_precision`.
+        profile (ExecutionProfile): Settings of PyTorch execution.
+
+    Returns:
+        Any: Model ready for inference.
+    """
+    model.eval()
+    model = apply_precision(model, precision)
+    return profile.prepare(model)
+
+
+def load_draft_model(
+    name: str | None, precision: Precision, profile: ExecutionProfile
+) -> Any | None:
+    """
+    Load a smaller checkpoint drafting tokens verified by a model
+    (assisted decoding). It has to share the tokenizer with the model.
+
+    Args:
+        name (str | None): Name of the checkpoint in the Hugging Face Hub.
+            If None, no draft model is used.
+        precision (Precision): Precision of the model, which the draft model
+            uses too.
+        profile (ExecutionProfile): Settings of PyTorch execution.
+
+    Returns:
+        Any | None: Draft model ready for inference or None if `name` is None.
+    """
+    if name is None:
+        return None
+    return prepare_model(
+        AutoModelForSeq2SeqLM.from_pretrained(name, device_map='auto'),
+        precision,
+        profile,
+    )
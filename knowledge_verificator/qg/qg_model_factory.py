@@ -1,10 +1,23 @@
 """Module with factory of Question Generation (QG) models."""
 
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
 from enum import Enum
+import threading
+from typing import Any
 from knowledge_verificator.qg.base import QuestionGeneration
 
 from knowledge_verificator.qg.t5_fine_tuned import T5FineTuned
-from knowledge_verificator.qg.t5_flan_base import T5FlanBase
+from knowledge_verificator.qg.t5_flan_base import (
+    ReferenceAnswerMode,
+    T5FlanBase,
+)
+from knowledge_verificator.utils.execution import ExecutionProfile
+from knowledge_verificator.utils.precision import (
+    Precision,
+    resolve_precision,
+)
 
 
 class QuestionGenerationModel(Enum):
@@ -14,17 +27,226 @@ class QuestionGenerationModel(Enum):
     FLAN_T5 = T5FlanBase
 
 
-def create_model(model: QuestionGenerationModel) -> QuestionGeneration:
+# Key of a loaded model: the model and settings it was loaded with.
+_RegistryKey = tuple[
+    QuestionGenerationModel, str, str | None, Precision, str | None
+]
+
+
+@dataclass
+class _RegisteredModel:
+    # Resolved once the model is loaded, which is done without the lock.
+    instance: Future
+    references: int
+
+    def loaded(self) -> QuestionGeneration | None:
+        """
+        Get the model if it has been loaded successfully.
+
+        Returns:
+            QuestionGeneration | None: Loaded model or None if it is still
+                loading or its loading failed.
+        """
+        if not self.instance.done() or self.instance.exception() is not None:
+            return None
+        return self.instance.result()
+
+
+# Process-wide registry of loaded models, so a model is never loaded twice.
+# Released models stay loaded (up to `_MAX_IDLE_MODELS`), so switching back
+# to them does not load their weights again.
+_MAX_IDLE_MODELS = 1
+_REGISTRY: OrderedDict[_RegistryKey, _RegisteredModel] = OrderedDict()
+_REGISTRY_LOCK = threading.Lock()
+
+
+def create_model(
+    model: QuestionGenerationModel,
+    profile: ExecutionProfile | None = None,
+    reference_answers: ReferenceAnswerMode = ReferenceAnswerMode.EAGER,
+    draft_model: str | None = None,
+    precision: Precision = Precision.FP32,
+) -> QuestionGeneration:
     """
-    Instantiate a Question Generation module with the desired model.
+    Get a Question Generation module with the desired model, loading it only
+    if the model with the same settings is not loaded yet. Concurrent calls
+    for a model being loaded wait for it, while the registry stays
+    available to other calls.
+
+    Every call has to be paired with `release_model`, once the returned
+    instance is no longer used.
 
     Args:
         model (QuestionGenerationModel): Chosen QG model.
+        profile (ExecutionProfile | None, optional): Settings of PyTorch
+            execution. If None, the default profile is used.
+        reference_answers (ReferenceAnswerMode, optional): Moment of
+            generating reference answers, used only by models generating
+            them. Defaults to ReferenceAnswerMode.EAGER.
+        draft_model (str | None, optional): Name of a smaller checkpoint
+            drafting tokens for assisted decoding. If None, assisted decoding
+            is disabled. Defaults to None.
+        precision (Precision, optional): Numerical precision of the model.
+            Defaults to Precision.FP32.
+
+    Raises:
+        Exception: Raised if the model cannot be loaded. Calls waiting for
+            the model raise the same exception.
 
     Returns:
         QuestionGeneration: Instance of Question Generation model.
     """
-    return model.value()
+    if model != QuestionGenerationModel.FLAN_T5:
+        # Other models do not generate reference answers.
+        reference_answers = ReferenceAnswerMode.EAGER
+    # Unsupported precisions fall back to the same model as supported ones.
+    precision = resolve_precision(precision)
+    key: _RegistryKey = (
+        model,
+        reference_answers.value,
+        draft_model,
+        precision,
+        None if profile is None else repr(profile),
+    )
+
+    with _REGISTRY_LOCK:
+        registered = _REGISTRY.get(key)
+        loading = registered is None
+        if registered is None:
+            registered = _RegisteredModel(instance=Future(), references=0)
+            _REGISTRY[key] = registered
+        registered.references += 1
+        _REGISTRY.move_to_end(key)
+
+    if loading:
+        try:
+            registered.instance.set_result(
+                _load(model, profile, reference_answers, draft_model, precision)
+            )
+        except Exception as e:
+            with _REGISTRY_LOCK:
+                del _REGISTRY[key]
+            registered.instance.set_exception(e)
+            raise
+
+    instance = registered.instance.result()
+    with _REGISTRY_LOCK:
+        evicted = _evict_idle_models()
+    _close(evicted)
+    return instance
+
+
+def release_model(instance: QuestionGeneration, unload: bool = False) -> None:
+    """
+    Release an instance returned by `create_model`. Once all its users have
+    released it, the instance stays loaded for later use, unless `unload`
+    is set or other models have been released since then. Unloaded instances
+    are closed.
+
+    Args:
+        instance (QuestionGeneration): Instance of Question Generation model.
+        unload (bool, optional): Remove the instance from the registry as
+            soon as it is not used, so its memory is freed when the last
+            reference to it is dropped. Defaults to False.
+
+    Raises:
+        KeyError: Raised if the instance is not in the registry or all its
+            users have already released it.
+    """
+    with _REGISTRY_LOCK:
+        key = next(
+            (
+                key
+                for key, registered in _REGISTRY.items()
+                if registered.loaded() is instance and registered.references
+            ),
+            None,
+        )
+        if key is None:
+            raise KeyError(
+                f'Model {instance.get_model()} is not used, so it cannot be '
+                'released.'
+            )
+
+        registered = _REGISTRY[key]
+        registered.references -= 1
+        evicted = []
+        if registered.references == 0 and unload:
+            del _REGISTRY[key]
+            evicted.append(instance)
+        evicted.extend(_evict_idle_models())
+    _close(evicted)
+
+
+def loaded_models() -> list[dict[str, Any]]:
+    """
+    Get loaded Question Generation models with settings they were loaded
+    with and their number of users.
+
+    Returns:
+        list[dict[str, Any]]: For every model, its `model`,
+            `reference_answers`, `draft_model`, `precision` and `profile`,
+            number of `users` (0 for idle models) and if it is still
+            `loading`. Ordered from the least recently used.
+    """
+    with _REGISTRY_LOCK:
+        return [
+            {
+                'model': model.name,
+                'reference_answers': reference_answers,
+                'draft_model': draft_model,
+                'precision': precision.value,
+                'profile': profile,
+                'users': registered.references,
+                'loading': not registered.instance.done(),
+            }
+            for (
+                model,
+                reference_answers,
+                draft_model,
+                precision,
+                profile,
+            ), registered in _REGISTRY.items()
+        ]
+
+
+def _load(
+    model: QuestionGenerationModel,
+    profile: ExecutionProfile | None,
+    reference_answers: ReferenceAnswerMode,
+    draft_model: str | None,
+    precision: Precision,
+) -> QuestionGeneration:
+    if model == QuestionGenerationModel.FLAN_T5:
+        return T5FlanBase(
+            profile=profile,
+            reference_answers=reference_answers,
+            draft_model=draft_model,
+            precision=precision,
+        )
+    return model.value(
+        profile=profile, draft_model=draft_model, precision=precision
+    )
+
+
+def _evict_idle_models() -> list[QuestionGeneration]:
+    idle = [
+        key
+        for key, registered in _REGISTRY.items()
+        if not registered.references
+    ]
+    # Keys are ordered from the least recently used. Idle models are loaded,
+    # since models being loaded have users.
+    return [
+        _REGISTRY.pop(key).instance.result()
+        for key in idle[: max(len(idle) - _MAX_IDLE_MODELS, 0)]
+    ]
+
+
+def _close(instances: list[QuestionGeneration]) -> None:
+    # Closing waits for background threads, so it is done without the lock.
+    for instance in instances:
+        instance.close()
 
 
 def get_available_qg_models() -> list[str]:
@@ -0,0 +1,157 @@
+"""
+Module with limits of decoding, which stop generating tokens once a text is
+complete or exceeds lengths usually observed.
+"""
+
+from collections import deque
+import math
+import threading
+from typing import Any, Iterable
+
+import numpy as np
+import torch
+from transformers import StoppingCriteria  # type: ignore[import-untyped]
+
+
+# Transformers calls stopping criteria, so `__call__` is the only method
+# the interface needs.
+class QuestionComplete(StoppingCriteria):  # pylint: disable=too-few-public-methods
+    """
+    Stopping criterion finishing a sequence as soon as its last token ends
+    with a question mark, so no tokens are decoded after the question.
+    """
+
+    def __init__(self, tokenizer: Any) -> None:
+        """
+        Find tokens of the vocabulary ending with a question mark.
+
+        Args:
+            tokenizer (Any): Tokenizer of the decoding model.
+        """
+        self.question_mark_ids = torch.tensor(
+            [
+                token_id
+                for token, token_id in tokenizer.get_vocab().items()
+                if token.endswith('?')
+            ],
+            dtype=torch.long,
+        )
+
+    def __call__(
+        self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs
+    ) -> torch.BoolTensor:
+        return torch.isin(
+            input_ids[:, -1], self.question_mark_ids.to(input_ids.device)
+        )
+
+
+class AdaptiveTokenBudget:
+    """
+    Class limiting the number of decoded tokens to lengths observed in
+    previous outputs of a model.
+
+    Until enough outputs are observed, the budget is `maximum`. Then, it is
+    a high quantile of observed lengths enlarged by a margin, but never
+    more than `maximum` nor less than `minimum`. Outputs truncated by
+    the budget are observed with its length, so the budget grows back if
+    outputs become longer.
+    """
+
+    # Each option tunes a different aspect of adapting; they are
+    # keyword-only, so call sites name what they change.
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        maximum: int,
+        *,
+        minimum: int = 8,
+        quantile: float = 0.95,
+        margin: float = 1.5,
+        window: int = 256,
+        min_observations: int = 16,
+    ) -> None:
+        """
+        Create a budget without any observed outputs.
+
+        Args:
+            maximum (int): Maximum number of decoded tokens.
+            minimum (int, optional): Minimum number of decoded tokens.
+                Defaults to 8.
+            quantile (float, optional): Quantile of observed lengths, which
+                the budget is based on. Defaults to 0.95.
+            margin (float, optional): Factor enlarging the quantile.
+                Defaults to 1.5.
+            window (int, optional): Number of the most recent outputs taken
+                into account. Defaults to 256.
+            min_observations (int, optional): Number of outputs observed
+                before the budget adapts. Defaults to 16.
+
+        Raises:
+            ValueError: Raised if `minimum` is not positive or exceeds
+                `maximum`.
+        """
+        if not 0 < minimum <= maximum:
+            raise ValueError(
+                'Token budget requires 0 < minimum <= maximum. '
+                f'Supplied values: {minimum}, {maximum}.'
+            )
+
+        self.maximum = maximum
+        self.minimum = minimum
+        self.quantile = quantile
+        self.margin = margin
+        self.min_observations = min_observations
+        self._lengths: deque[int] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        """
+        Get the current number of tokens, which may be decoded.
+
+        Returns:
+            int: Number of tokens.
+        """
+        with self._lock:
+            if len(self._lengths) < self.min_observations:
+                return self.maximum
+            observed = float(np.quantile(self._lengths, self.quantile))
+        budget = math.ceil(observed * self.margin)
+        return max(self.minimum, min(self.maximum, budget))
+
+    def observe(self, lengths: Iterable[int]) -> None:
+        """
+        Record numbers of tokens of decoded outputs.
+
+        Args:
+            lengths (Iterable[int]): Numbers of decoded tokens.
+        """
+        with self._lock:
+            self._lengths.extend(lengths)
+
+    def observe_outputs(
+        self, output_ids: torch.Tensor, pad_token_id: int
+    ) -> None:
+        """
+        Record numbers of tokens decoded by an encoder-decoder model.
+
+        Args:
+            output_ids (torch.Tensor): Outputs of `generate`, starting with
+                the decoder start token and padded with `pad_token_id`.
+            pad_token_id (int): Identifier of the padding token.
+        """
+        self.observe((output_ids[:, 1:] != pad_token_id).sum(dim=1).tolist())
+
+    def statistics(self) -> dict[str, int]:
+        """
+        Get statistics of the budget.
+
+        Returns:
+            dict[str, int]: The current `budget`, `maximum` and number of
+                `observed` outputs.
+        """
+        with self._lock:
+            observed = len(self._lengths)
+        return {
+            'budget': self.current(),
+            'maximum': self.maximum,
+            'observed': observed,
+        }
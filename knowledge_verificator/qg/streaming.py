@@ -0,0 +1,48 @@
+"""Module streaming text decoded by a Hugging Face model token by token."""
+
+import threading
+from typing import Any, Callable, Iterator
+
+from transformers import TextIteratorStreamer  # type: ignore[import-untyped]
+
+
+def stream_generation(
+    tokenizer: Any, generate: Callable[[TextIteratorStreamer], Any]
+) -> Iterator[str]:
+    """
+    Run generation in a background thread and yield fragments of the text
+    as soon as they are decoded.
+
+    Args:
+        tokenizer (Any): Tokenizer decoding generated tokens.
+        generate (Callable[[TextIteratorStreamer], Any]): Function running
+            generation of a single sequence, which passes the supplied
+            streamer as `streamer` to `generate` of a model.
+
+    Raises:
+        Exception: Re-raised if generation in the background thread fails.
+
+    Yields:
+        Iterator[str]: Consecutive fragments of the generated text.
+    """
+    streamer = TextIteratorStreamer(
+        tokenizer, skip_special_tokens=True, clean_up_tokenization_spaces=True
+    )
+    errors: list[Exception] = []
+
+    def run() -> None:
+        try:
+            generate(streamer)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            errors.append(e)
+            # Unblock the consumer waiting for the next fragment.
+            streamer.end()
+
+    thread = threading.Thread(target=run, name='qg-streaming', daemon=True)
+    thread.start()
+    for fragment in streamer:
+        if fragment:
+            yield fragment
+    thread.join()
+    if errors:
+        raise errors[0]
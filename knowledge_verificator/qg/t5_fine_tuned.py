@@ -1,16 +1,55 @@
 """Module with implementation of T5 Fine-Tuned Question Generation model."""
 
+from typing import Any, Iterator, Sequence
 import warnings
 import torch
-from transformers import T5Tokenizer, T5ForConditionalGeneration  # type: ignore[import-untyped]
+from transformers import (  # type: ignore[import-untyped]
+    StoppingCriteriaList,
+    T5Tokenizer,
+    T5ForConditionalGeneration,
+)
 from knowledge_verificator.qg.base import QuestionGeneration
+from knowledge_verificator.qg.loading import load_draft_model, prepare_model
+from knowledge_verificator.qg.stopping import (
+    AdaptiveTokenBudget,
+    QuestionComplete,
+)
+from knowledge_verificator.qg.streaming import stream_generation
+from knowledge_verificator.utils.execution import ExecutionProfile
+from knowledge_verificator.utils.precision import (
+    Precision,
+    autocast,
+    resolve_precision,
+)
 
 
-class T5FineTuned(QuestionGeneration):
+# The model, its draft model and its stopping criteria are all used by
+# every generation, so they are kept together.
+class T5FineTuned(QuestionGeneration):  # pylint: disable=too-many-instance-attributes
     """Class for generating question based on supplied context."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        profile: ExecutionProfile | None = None,
+        draft_model: str | None = None,
+        precision: Precision = Precision.FP32,
+    ) -> None:
+        """
+        Load the model and its tokenizer.
+
+        Args:
+            profile (ExecutionProfile | None, optional): Settings of PyTorch
+                execution. If None, the default profile is used.
+            draft_model (str | None, optional): Name of a smaller checkpoint
+                sharing the tokenizer, which drafts tokens verified by
+                the model (assisted decoding). If None, the model decodes
+                on its own. Defaults to None.
+            precision (Precision, optional): Numerical precision of the model
+                and the draft model. Defaults to Precision.FP32.
+        """
         warnings.filterwarnings('ignore', category=FutureWarning)
+        self.profile = profile if profile is not None else ExecutionProfile()
+        self.profile.apply()
         self._trained_model_path = (
             'ZhangCheng/T5-Base-Fine-Tuned-for-Question-Generation'
         )
@@ -33,7 +72,16 @@ class T5FineTuned(QuestionGeneration):
         )
         self.model = self.model  # .to(self.device)
         self.max_length = 32
-        self.model.eval()
+        # The budget of decoded tokens adapts to lengths of questions.
+        self.question_budget = AdaptiveTokenBudget(maximum=self.max_length)
+        self._question_complete = StoppingCriteriaList(
+            [QuestionComplete(self.tokenizer)]
+        )
+        self.precision = resolve_precision(precision)
+        self.model = prepare_model(self.model, self.precision, self.profile)
+        self.draft_model = load_draft_model(
+            draft_model, self.precision, self.profile
+        )
 
     def generate(self, answer: str, context: str) -> dict[str, str]:
         """
@@ -46,24 +94,129 @@ class T5FineTuned(QuestionGeneration):
         Returns:
             dict[str, str]: Dictionary with a generated question, and a provided answer and context.
         """
-        input_text = f'<answer> {answer} <context> {context} '
-        encoding = self.tokenizer.encode_plus(
-            input_text,
-            return_tensors='pt',
-        )
-        input_ids = encoding['input_ids'].to(self.device)
-        attention_mask = encoding['attention_mask'].to(self.device)
-        outputs = self.model.generate(
-            input_ids=input_ids,
-            attention_mask=attention_mask,
-            max_new_tokens=self.max_length,
-        )
-        question = self.tokenizer.decode(
-            outputs[0],
-            skip_special_tokens=True,
-            clean_up_tokenization_spaces=True,
+        return self.generate_batch(items=[(answer, context)])[0]
+
+    def generate_batch(
+        self, items: Sequence[tuple[str, str]], batch_size: int = 8
+    ) -> list[dict[str, str]]:
+        """
+        Generate questions for many pairs of answer and context at once.
+
+        Args:
+            items (Sequence[tuple[str, str]]): Pairs of a correct answer and
+                a context.
+            batch_size (int, optional): Maximum number of questions generated
+                in a single pass. Defaults to 8.
+
+        Returns:
+            list[dict[str, str]]: Dictionaries with a generated question,
+                and a provided answer and context, in the order of `items`.
+        """
+        if self.draft_model is not None:
+            # Assisted decoding supports only a single sequence at a time.
+            batch_size = 1
+
+        generated: list[dict[str, str]] = []
+        for start in range(0, len(items), batch_size):
+            batch = items[start : start + batch_size]
+            encoding = self.tokenizer(
+                [
+                    f'<answer> {answer} <context> {context} '
+                    for answer, context in batch
+                ],
+                padding=True,
+                return_tensors='pt',
+            )
+            input_ids = encoding['input_ids'].to(self.device)
+            attention_mask = encoding['attention_mask'].to(self.device)
+            with self.profile.inference('qg'), autocast(self.precision):
+                outputs = self.model.generate(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    max_new_tokens=self.question_budget.current(),
+                    stopping_criteria=self._question_complete,
+                    assistant_model=self.draft_model,
+                )
+            self.question_budget.observe_outputs(
+                outputs, self.tokenizer.pad_token_id
+            )
+            questions = self.tokenizer.batch_decode(
+                outputs,
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=True,
+            )
+            generated.extend(
+                {'question': question, 'answer': answer, 'context': context}
+                for question, (answer, context) in zip(
+                    questions, batch, strict=True
+                )
+            )
+        return generated
+
+    def generate_stream(
+        self, answer: str, context: str
+    ) -> Iterator[str | dict[str, str]]:
+        """
+        Generate a question, yielding fragments of the question as soon as
+        they are decoded.
+
+        Args:
+            answer (str): Correct answer to a question to be generated.
+            context (str): Contextual information, useful for question generation.
+
+        Yields:
+            Iterator[str | dict[str, str]]: Fragments of the question and,
+                as the last element, a dictionary with the generated question,
+                and a provided answer and context.
+        """
+        encoding = self.tokenizer(
+            f'<answer> {answer} <context> {context} ', return_tensors='pt'
         )
-        return {'question': question, 'answer': answer, 'context': context}
+
+        def generate(streamer: Any) -> None:
+            with self.profile.inference('qg'), autocast(self.precision):
+                outputs = self.model.generate(
+                    input_ids=encoding['input_ids'].to(self.device),
+                    attention_mask=encoding['attention_mask'].to(self.device),
+                    max_new_tokens=self.question_budget.current(),
+                    stopping_criteria=self._question_complete,
+                    assistant_model=self.draft_model,
+                    streamer=streamer,
+                )
+            self.question_budget.observe_outputs(
+                outputs, self.tokenizer.pad_token_id
+            )
+
+        fragments = []
+        for fragment in stream_generation(self.tokenizer, generate):
+            fragments.append(fragment)
+            yield fragment
+        yield {
+            'question': ''.join(fragments),
+            'answer': answer,
+            'context': context,
+        }
+
+    def get_decoding_parameters(self) -> dict[str, Any]:
+        """
+        Get parameters of decoding affecting generated questions.
+
+        Returns:
+            dict[str, Any]: JSON-serializable parameters of decoding.
+        """
+        return {
+            'max_new_tokens': self.max_length,
+            'precision': self.precision.value,
+        }
+
+    def statistics(self) -> dict[str, Any]:
+        """
+        Get statistics of decoding.
+
+        Returns:
+            dict[str, Any]: Statistics of budgets of decoded tokens.
+        """
+        return {'question_budget': self.question_budget.statistics()}
 
     def get_model(self) -> str:
         """
@@ -1,17 +1,111 @@
 """The module with implementation of fine-tuned version of T5 (called FLAN T5)."""
 
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+import hashlib
+import threading
+from typing import Any, Iterator, Sequence
 import warnings
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM  # type: ignore[import-untyped]
+from transformers import (  # type: ignore[import-untyped]
+    AutoTokenizer,
+    AutoModelForSeq2SeqLM,
+    StoppingCriteriaList,
+)
+from transformers.modeling_outputs import BaseModelOutput  # type: ignore[import-untyped]
 import torch
 from knowledge_verificator.qg.base import QuestionGeneration
+from knowledge_verificator.qg.loading import load_draft_model, prepare_model
+from knowledge_verificator.qg.stopping import (
+    AdaptiveTokenBudget,
+    QuestionComplete,
+)
+from knowledge_verificator.qg.streaming import stream_generation
+from knowledge_verificator.utils.batching import MicroBatcher
+from knowledge_verificator.utils.cache import LRUCache
+from knowledge_verificator.utils.execution import ExecutionProfile
+from knowledge_verificator.utils.precision import (
+    Precision,
+    autocast,
+    resolve_precision,
+)
 
 
-class T5FlanBase(QuestionGeneration):
+class ReferenceAnswerMode(Enum):
+    """
+    Available moments of generating reference answers to questions.
+
+    These modes mean:
+    - EAGER - the answer is generated together with the question.
+    - BACKGROUND - the question is returned right away, the answer is
+        generated in the background, batched with other pending answers.
+    - ON_DEMAND - the question is returned right away, the answer is
+        generated only when it is requested.
+    """
+
+    EAGER = 'eager'
+    BACKGROUND = 'background'
+    ON_DEMAND = 'on_demand'
+
+
+# Questions and reference answers are generated by the same model with
+# separate budgets, caches and threads, so the state is kept together.
+class T5FlanBase(QuestionGeneration):  # pylint: disable=too-many-instance-attributes
     """Class for generating question based on supplied context."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        profile: ExecutionProfile | None = None,
+        reference_answers: ReferenceAnswerMode = ReferenceAnswerMode.EAGER,
+        draft_model: str | None = None,
+        precision: Precision = Precision.FP32,
+    ) -> None:
+        """
+        Load the model and its tokenizer.
+
+        Args:
+            profile (ExecutionProfile | None, optional): Settings of PyTorch
+                execution. If None, the default profile is used.
+            reference_answers (ReferenceAnswerMode, optional): Moment of
+                generating reference answers. Unless it is
+                `ReferenceAnswerMode.EAGER`, generated items have an empty
+                `answer` and an `answer_id` to retrieve the answer with
+                `reference_answer`. Defaults to ReferenceAnswerMode.EAGER.
+            draft_model (str | None, optional): Name of a smaller checkpoint
+                sharing the tokenizer, e.g. `google/flan-t5-small`, which
+                drafts tokens verified by the model (assisted decoding).
+                If None, the model decodes on its own. Defaults to None.
+            precision (Precision, optional): Numerical precision of the model
+                and the draft model. Defaults to Precision.FP32.
+        """
         warnings.filterwarnings('ignore', category=FutureWarning)
+        self.profile = profile if profile is not None else ExecutionProfile()
+        self.profile.apply()
+        self.reference_answers = reference_answers
+        self.question_decoding = {
+            'temperature': 0.5,  # Adjust temperature for randomness
+            'top_k': 100,  # Limit to top-k words
+            'top_p': 0.95,  # Nucleus sampling
+            'do_sample': True,  # Enable sampling
+        }
+        # Values are either pending prompts, answers being generated or answers.
+        self._answers = LRUCache(max_size=1024)
+        self._answers_lock = threading.Lock()
+        self._answer_batcher: MicroBatcher[str, str] = MicroBatcher(
+            process_batch=self._generate_answers, window=0.05, max_batch_size=8
+        )
+        # Encoder states of question prompts, reused by every question
+        # generated from the same context.
+        self._encoder_states = LRUCache(max_size=64)
+        self._executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix='reference-answers'
+        )
         self.tokenizer = AutoTokenizer.from_pretrained('google/flan-t5-large')
+        # Budgets of decoded tokens adapt to lengths of generated texts.
+        self.question_budget = AdaptiveTokenBudget(maximum=100)
+        self.answer_budget = AdaptiveTokenBudget(maximum=20)
+        self._question_complete = StoppingCriteriaList(
+            [QuestionComplete(self.tokenizer)]
+        )
         self.model = AutoModelForSeq2SeqLM.from_pretrained(
             'google/flan-t5-large', device_map='auto'
         )
@@ -20,7 +114,21 @@ class T5FlanBase(QuestionGeneration):
             'cuda' if torch.cuda.is_available() else 'cpu'
         )
         self.model = self.model  # .to(self.device)
-        self.model.eval()
+        self.precision = resolve_precision(precision)
+        self.model = prepare_model(self.model, self.precision, self.profile)
+        self.draft_model = load_draft_model(
+            draft_model, self.precision, self.profile
+        )
+
+    def close(self) -> None:
+        """
+        Stop threads generating reference answers. Answers not generated yet
+        are cancelled. Threads refer to the model, so it cannot be
+        garbage-collected until they are stopped.
+        """
+        # Running tasks wait for the batcher, so it is stopped after them.
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._answer_batcher.shutdown()
 
     def generate(self, answer: str, context: str) -> dict[str, str]:
         """
@@ -33,39 +141,277 @@ class T5FlanBase(QuestionGeneration):
         Returns:
             dict[str, str]: Dictionary with a generated question, and a provided answer and context.
         """
-        input_text = (
+        return self.generate_batch(items=[(answer, context)])[0]
+
+    def generate_batch(
+        self, items: Sequence[tuple[str, str]], batch_size: int = 8
+    ) -> list[dict[str, str]]:
+        """
+        Generate questions and their reference answers for many contexts
+        at once.
+
+        Args:
+            items (Sequence[tuple[str, str]]): Pairs of an answer, which is
+                not used at all, and a context.
+            batch_size (int, optional): Maximum number of questions generated
+                in a single pass. Defaults to 8.
+
+        Returns:
+            list[dict[str, str]]: Dictionaries with a generated question,
+                and a provided answer and context, in the order of `items`.
+        """
+        generated: list[dict[str, str]] = []
+        for start in range(0, len(items), batch_size):
+            contexts = [
+                context for _, context in items[start : start + batch_size]
+            ]
+            questions = self._generate_texts(
+                [self._question_prompt(context) for context in contexts],
+                budget=self.question_budget,
+                cache_encoder=True,
+                stopping_criteria=self._question_complete,
+                **self.question_decoding,
+            )
+            generated.extend(self._complete(questions, contexts))
+        return generated
+
+    def generate_stream(
+        self, answer: str, context: str
+    ) -> Iterator[str | dict[str, str]]:
+        """
+        Generate a question, yielding fragments of the question as soon as
+        they are decoded. The reference answer is generated afterwards,
+        according to `reference_answers`.
+
+        Args:
+            answer (str): This answer is not used at all.
+            context (str): Contextual information used to generate the question.
+
+        Yields:
+            Iterator[str | dict[str, str]]: Fragments of the question and,
+                as the last element, a dictionary the same as returned by
+                `generate`.
+        """
+
+        def generate(streamer: Any) -> None:
+            with self.profile.inference('qg'), autocast(self.precision):
+                output_ids = self.model.generate(
+                    **self._generation_inputs(
+                        [self._question_prompt(context)], cache_encoder=True
+                    ),
+                    max_new_tokens=self.question_budget.current(),
+                    stopping_criteria=self._question_complete,
+                    streamer=streamer,
+                    **self.question_decoding,
+                )
+            self.question_budget.observe_outputs(
+                output_ids, self.tokenizer.pad_token_id
+            )
+
+        fragments = []
+        for fragment in stream_generation(self.tokenizer, generate):
+            fragments.append(fragment)
+            yield fragment
+        yield self._complete([''.join(fragments)], [context])[0]
+
+    def reference_answer(self, answer_id: str) -> str:
+        """
+        Get a reference answer generated later than its question, waiting
+        until it is generated if needed.
+
+        Args:
+            answer_id (str): Identifier of the answer returned together with
+                the question.
+
+        Raises:
+            KeyError: Raised if there is no answer with such identifier,
+                for instance it has been evicted.
+
+        Returns:
+            str: Reference answer to the question.
+        """
+        with self._answers_lock:
+            pending = self._answers.get((answer_id,))
+            if pending is None:
+                raise KeyError(
+                    f'There is no reference answer with id = {answer_id}.'
+                )
+
+            if isinstance(pending, str):
+                pending = self._executor.submit(
+                    self._answer_batcher.submit, pending
+                )
+                self._answers.put((answer_id,), pending)
+        return pending.result()
+
+    def _question_prompt(self, context: str) -> str:
+        return (
             f'TEXT:\n{context}\n\n---\nAsk a question about TEXT. '
             'Your question cannot be taken directly from the text.'
         )
-        input_ids = self.tokenizer(
-            input_text, return_tensors='pt'
-        ).input_ids.to(self.device)
-        output_ids = self.model.generate(
-            input_ids,
-            max_length=100,
-            temperature=0.5,  # Adjust temperature for randomness
-            top_k=100,  # Limit to top-k words
-            top_p=0.95,  # Nucleus sampling
-            do_sample=True,  # Enable sampling
-        )
-        question = self.tokenizer.decode(
-            output_ids[0], skip_special_tokens=True
-        )
 
-        input_text = (
+    def _complete(
+        self, questions: list[str], contexts: list[str]
+    ) -> list[dict[str, str]]:
+        # Attach reference answers, or their identifiers, to questions.
+        prompts = [
             f'TEXT:\n{context}\n\n---\nPlease answer to the following '
             'question based on TEXT. '
             f'{question}\n'
             'Do not cite TEXT while answering.'
             'Explain your reasoning step by step.'
+            for context, question in zip(contexts, questions, strict=True)
+        ]
+        if self.reference_answers == ReferenceAnswerMode.EAGER:
+            return [
+                {'question': question, 'answer': answer, 'context': context}
+                for question, answer, context in zip(
+                    questions,
+                    self._generate_answers(prompts),
+                    contexts,
+                    strict=True,
+                )
+            ]
+
+        return [
+            {
+                'question': question,
+                'answer': '',
+                'context': context,
+                'answer_id': self._defer_answer(prompt),
+            }
+            for question, context, prompt in zip(
+                questions, contexts, prompts, strict=True
+            )
+        ]
+
+    def _defer_answer(self, prompt: str) -> str:
+        answer_id = hashlib.sha256(prompt.encode(encoding='utf-8')).hexdigest()
+        if (answer_id,) in self._answers:
+            return answer_id
+
+        pending: str | Future = prompt
+        if self.reference_answers == ReferenceAnswerMode.BACKGROUND:
+            pending = self._executor.submit(self._answer_batcher.submit, prompt)
+        self._answers.put((answer_id,), pending)
+        return answer_id
+
+    def _generate_answers(self, prompts: Sequence[str]) -> list[str]:
+        return self._generate_texts(list(prompts), budget=self.answer_budget)
+
+    def _generate_texts(
+        self,
+        prompts: list[str],
+        budget: AdaptiveTokenBudget,
+        cache_encoder: bool = False,
+        **kwargs: Any,
+    ) -> list[str]:
+        # Assisted decoding supports only a single sequence at a time.
+        batches = (
+            [prompts]
+            if self.draft_model is None
+            else [[prompt] for prompt in prompts]
         )
-        input_ids = self.tokenizer(
-            input_text, return_tensors='pt'
-        ).input_ids.to(self.device)
-        output_ids = self.model.generate(input_ids)
-        answer = self.tokenizer.decode(output_ids[0], skip_special_tokens=True)
+        output_ids: list[torch.Tensor] = []
+        with self.profile.inference('qg'), autocast(self.precision):
+            for batch in batches:
+                batch_output_ids = self.model.generate(
+                    **self._generation_inputs(batch, cache_encoder),
+                    max_new_tokens=budget.current(),
+                    **kwargs,
+                )
+                budget.observe_outputs(
+                    batch_output_ids, self.tokenizer.pad_token_id
+                )
+                output_ids.extend(batch_output_ids)
+        return self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)
 
-        return {'question': question, 'answer': answer, 'context': context}
+    def _generation_inputs(
+        self, prompts: list[str], cache_encoder: bool
+    ) -> dict[str, Any]:
+        hidden_states, attention_mask = self._encode(
+            prompts, cache=cache_encoder
+        )
+        inputs: dict[str, Any] = {
+            'encoder_outputs': BaseModelOutput(last_hidden_state=hidden_states),
+            'attention_mask': attention_mask,
+        }
+        if self.draft_model is not None:
+            # The draft model runs its own encoder over `input_ids`.
+            inputs['input_ids'] = self.tokenizer(prompts, return_tensors='pt')[
+                'input_ids'
+            ].to(self.device)
+            inputs['assistant_model'] = self.draft_model
+        return inputs
+
+    def _encode(
+        self, prompts: list[str], cache: bool = False
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        # The encoder runs once per distinct prompt, unless its states are
+        # cached, and only the decoder runs per generated text.
+        states: dict[str, torch.Tensor] = {}
+        if cache:
+            for prompt in prompts:
+                cached = self._encoder_states.get((prompt,))
+                if cached is not None:
+                    states[prompt] = cached
+
+        missing = list(dict.fromkeys(p for p in prompts if p not in states))
+        if missing:
+            encoding = self.tokenizer(
+                missing, padding=True, return_tensors='pt'
+            ).to(self.device)
+            with torch.no_grad():
+                hidden_states = self.model.get_encoder()(
+                    input_ids=encoding['input_ids'],
+                    attention_mask=encoding['attention_mask'],
+                ).last_hidden_state
+            for prompt, states_of_prompt, mask in zip(
+                missing, hidden_states, encoding['attention_mask'], strict=True
+            ):
+                # Padding is dropped, so states fit any batch.
+                states[prompt] = states_of_prompt[mask.bool()]
+                if cache:
+                    self._encoder_states.put((prompt,), states[prompt])
+
+        batch = [states[prompt] for prompt in prompts]
+        attention_mask = torch.zeros(
+            (len(batch), max(len(s) for s in batch)),
+            dtype=torch.long,
+            device=batch[0].device,
+        )
+        for i, states_of_prompt in enumerate(batch):
+            attention_mask[i, : len(states_of_prompt)] = 1
+        return (
+            torch.nn.utils.rnn.pad_sequence(batch, batch_first=True),
+            attention_mask,
+        )
+
+    def get_decoding_parameters(self) -> dict[str, Any]:
+        """
+        Get parameters of decoding affecting generated questions.
+
+        Returns:
+            dict[str, Any]: JSON-serializable parameters of decoding.
+        """
+        return {
+            **self.question_decoding,
+            'max_new_tokens': self.question_budget.maximum,
+            'precision': self.precision.value,
+            'reference_answers': self.reference_answers.value,
+        }
+
+    def statistics(self) -> dict[str, Any]:
+        """
+        Get statistics of decoding.
+
+        Returns:
+            dict[str, Any]: Statistics of budgets of decoded tokens.
+        """
+        return {
+            'question_budget': self.question_budget.statistics(),
+            'answer_budget': self.answer_budget.statistics(),
+        }
 
     def get_model(self) -> str:
         """
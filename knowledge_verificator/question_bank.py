@@ -0,0 +1,222 @@
+"""Module with a bank of questions generated in advance for known paragraphs."""
+
+import logging
+import queue
+import random
+import threading
+from typing import Callable, Iterable
+
+from knowledge_verificator.answer_chooser import AnswerChooser
+from knowledge_verificator.qg.base import QuestionGeneration
+from knowledge_verificator.question_store import QuestionStore, paragraph_hash
+
+
+# The bank owns its worker thread and the state shared with it, which would
+# only be split artificially by grouping.
+class QuestionBank:  # pylint: disable=too-many-instance-attributes
+    """
+    Class generating questions for paragraphs in a background thread and
+    keeping them in memory, so questions to known paragraphs are served
+    without running any model.
+
+    Questions are kept per Question Generation model, so questions of
+    a previous model are never served after the model is switched.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        get_model: Callable[[], QuestionGeneration],
+        answer_chooser: AnswerChooser,
+        *,
+        questions_per_paragraph: int = 3,
+        batch_size: int = 8,
+        store: QuestionStore | None = None,
+    ) -> None:
+        """
+        Start a background thread generating questions.
+
+        Args:
+            get_model (Callable[[], QuestionGeneration]): Function returning
+                the current Question Generation model.
+            answer_chooser (AnswerChooser): Instance choosing answers, to
+                which questions are generated.
+            questions_per_paragraph (int, optional): Maximum number of
+                questions generated for a paragraph. Defaults to 3.
+            batch_size (int, optional): Maximum number of questions generated
+                in a single pass. Defaults to 8.
+            store (QuestionStore | None, optional): Persistent store, from
+                which questions are read before generating them and to which
+                generated questions are written. Defaults to None.
+
+        Raises:
+            ValueError: Raised if `questions_per_paragraph` or `batch_size`
+                is not positive.
+        """
+        if questions_per_paragraph < 1 or batch_size < 1:
+            raise ValueError(
+                'Number of questions per paragraph and batch size have to be '
+                f'positive. Supplied values: {questions_per_paragraph}, '
+                f'{batch_size}.'
+            )
+
+        self.get_model = get_model
+        self.answer_chooser = answer_chooser
+        self.questions_per_paragraph = questions_per_paragraph
+        self.batch_size = batch_size
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._questions: dict[tuple[str, str], list[dict[str, str]]] = {}
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[str] = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name='question-bank', daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, paragraphs: Iterable[str]) -> None:
+        """
+        Schedule generating questions for paragraphs. Paragraphs already
+        waiting for generation are skipped.
+
+        Args:
+            paragraphs (Iterable[str]): Paragraphs, e.g. of learning materials.
+        """
+        for paragraph in paragraphs:
+            with self._lock:
+                if paragraph in self._pending:
+                    continue
+                self._pending.add(paragraph)
+            self._queue.put(paragraph)
+
+    def get(self, context: str) -> dict[str, str] | None:
+        """
+        Get a random question generated in advance for `context` by
+        the current model.
+
+        Args:
+            context (str): Paragraph, to which a question is requested.
+
+        Returns:
+            dict[str, str] | None: Dictionary with a generated question,
+                an answer and a context or None if there are no questions
+                for `context`.
+        """
+        key = self._key(self.get_model(), context)
+        with self._lock:
+            questions = self._questions.get(key)
+            if not questions:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return random.choice(questions)
+
+    def clear(self) -> None:
+        """Remove all questions, e.g. after the model has been switched."""
+        with self._lock:
+            self._questions.clear()
+
+    def statistics(self) -> dict[str, int]:
+        """
+        Get statistics of the question bank.
+
+        Returns:
+            dict[str, int]: Number of `paragraphs` and `questions` in
+                the bank, paragraphs waiting for generation (`pending`),
+                and requests served from the bank (`hits`) or not (`misses`).
+        """
+        with self._lock:
+            return {
+                'paragraphs': len(self._questions),
+                'questions': sum(map(len, self._questions.values())),
+                'pending': len(self._pending),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def _key(
+        self, model: QuestionGeneration, paragraph: str
+    ) -> tuple[str, str]:
+        return model.get_model(), paragraph_hash(paragraph)
+
+    def _run(self) -> None:
+        while True:
+            paragraphs = [self._queue.get()]
+            while len(paragraphs) < self.batch_size:
+                try:
+                    paragraphs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._generate(paragraphs)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logging.getLogger(__name__).exception(
+                    'Cannot generate questions for the question bank.'
+                )
+            finally:
+                with self._lock:
+                    self._pending.difference_update(paragraphs)
+
+    def _generate(self, paragraphs: list[str]) -> None:
+        model = self.get_model()
+        questions: dict[tuple[str, str], list[dict[str, str]]] = {}
+        if self.store is not None:
+            for paragraph in paragraphs:
+                stored = self.store.lookup(paragraph=paragraph, model=model)
+                if stored:
+                    questions[self._key(model, paragraph)] = stored
+
+        items: list[tuple[str, str]] = []
+        for paragraph in paragraphs:
+            if self._key(model, paragraph) in questions:
+                continue
+            try:
+                answers = {
+                    self.answer_chooser.choose_answer(paragraph)
+                    for _ in range(self.questions_per_paragraph)
+                }
+            except IndexError:
+                # A paragraph without nouns has no good candidates.
+                continue
+            items.extend(
+                (answer, paragraph) for answer in answers if answer is not None
+            )
+
+        generated = self._resolve_answers(
+            model,
+            model.generate_batch(items=items, batch_size=self.batch_size),
+        )
+        if self.store is not None:
+            self.store.insert_many(model=model, items=generated)
+
+        for item in generated:
+            questions.setdefault(self._key(model, item['context']), []).append(
+                item
+            )
+        with self._lock:
+            for paragraph in paragraphs:
+                key = self._key(model, paragraph)
+                self._questions[key] = questions.get(key, [])
+
+    def _resolve_answers(
+        self, model: QuestionGeneration, generated: list[dict[str, str]]
+    ) -> list[dict[str, str]]:
+        """
+        Replace identifiers of reference answers generated later with
+        the answers, since identifiers expire while questions stay in
+        the bank. Questions, whose answers have expired, are dropped.
+        """
+        resolved = []
+        for item in generated:
+            if 'answer_id' in item:
+                item = dict(item)
+                try:
+                    item['answer'] = model.reference_answer(
+                        item.pop('answer_id')
+                    )
+                except KeyError:
+                    continue
+            resolved.append(item)
+        return resolved
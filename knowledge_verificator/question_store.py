@@ -0,0 +1,196 @@
+"""
+Module with a persistent store of generated questions, so they survive
+restarts of the application.
+"""
+
+from contextlib import closing, contextmanager
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator
+
+from knowledge_verificator.qg.base import QuestionGeneration
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    paragraph_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    decoding TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    context TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS questions_by_key
+    ON questions (paragraph_hash, model, decoding);
+CREATE INDEX IF NOT EXISTS questions_by_last_use ON questions (last_used);
+"""
+
+
+def paragraph_hash(paragraph: str) -> str:
+    """
+    Hash content of a paragraph the same way as identifiers of learning
+    materials are computed.
+
+    Args:
+        paragraph (str): Paragraph to hash.
+
+    Returns:
+        str: Hexadecimal SHA-256 digest of the paragraph.
+    """
+    return hashlib.sha256(paragraph.encode(encoding='utf-8')).hexdigest()
+
+
+class QuestionStore:
+    """
+    Class storing generated questions in an SQLite database.
+
+    Questions are keyed by a hash of the paragraph, a name of the Question
+    Generation model and its decoding parameters, so changing any of them
+    never serves stale questions. When the store exceeds its size,
+    the least recently used questions are evicted.
+    """
+
+    def __init__(self, path: Path | str, max_items: int = 10000) -> None:
+        """
+        Open the store, creating its database if it does not exist.
+
+        Args:
+            path (Path | str): Path to an SQLite database file.
+            max_items (int, optional): Maximum number of stored questions.
+                Defaults to 10000.
+
+        Raises:
+            ValueError: Raised if `max_items` is not positive.
+        """
+        if max_items < 1:
+            raise ValueError(
+                'Size of a question store has to be positive. '
+                f'Supplied value: {max_items}.'
+            )
+        if isinstance(path, str):
+            path = Path(path)
+
+        self.path = path
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        with self._connect() as connection:
+            (count,) = connection.execute(
+                'SELECT COUNT(*) FROM questions'
+            ).fetchone()
+        return count
+
+    def insert_many(
+        self, model: QuestionGeneration, items: Iterable[dict[str, str]]
+    ) -> None:
+        """
+        Store questions generated by `model`, evicting the least recently
+        used questions if the store is full.
+
+        Questions with reference answers generated later than questions,
+        i.e. with `answer_id`, are not stored, as their answers would not
+        survive a restart.
+
+        Args:
+            model (QuestionGeneration): Model, which generated the questions.
+            items (Iterable[dict[str, str]]): Generated questions with
+                an answer and a context.
+        """
+        name, decoding = _model_key(model)
+        now = time.time()
+        rows = [
+            (
+                paragraph_hash(item['context']),
+                name,
+                decoding,
+                item['question'],
+                item['answer'],
+                item['context'],
+                now,
+            )
+            for item in items
+            if 'answer_id' not in item
+        ]
+        with self._lock, self._connect() as connection:
+            connection.executemany(
+                'INSERT INTO questions (paragraph_hash, model, decoding, '
+                'question, answer, context, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+            connection.execute(
+                'DELETE FROM questions WHERE id IN (SELECT id FROM questions '
+                'ORDER BY last_used DESC, id DESC LIMIT -1 OFFSET ?)',
+                (self.max_items,),
+            )
+
+    def lookup(
+        self, paragraph: str, model: QuestionGeneration
+    ) -> list[dict[str, str]]:
+        """
+        Get questions to `paragraph` generated by `model` with its current
+        decoding parameters, and mark them as recently used.
+
+        Args:
+            paragraph (str): Paragraph, to which questions were generated.
+            model (QuestionGeneration): Model generating questions.
+
+        Returns:
+            list[dict[str, str]]: Stored questions with an answer and
+                a context. Empty if there are none.
+        """
+        name, decoding = _model_key(model)
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                'SELECT id, question, answer, context FROM questions '
+                'WHERE paragraph_hash = ? AND model = ? AND decoding = ?',
+                (paragraph_hash(paragraph), name, decoding),
+            ).fetchall()
+            connection.executemany(
+                'UPDATE questions SET last_used = ? WHERE id = ?',
+                [(time.time(), row[0]) for row in rows],
+            )
+        return [
+            {'question': question, 'answer': answer, 'context': context}
+            for _, question, answer, context in rows
+        ]
+
+    def invalidate(self, paragraphs: Iterable[str]) -> int:
+        """
+        Remove questions to paragraphs, e.g. after they have been changed.
+
+        Args:
+            paragraphs (Iterable[str]): Paragraphs, to which questions were
+                generated by any model.
+
+        Returns:
+            int: Number of removed questions.
+        """
+        hashes = [(paragraph_hash(paragraph),) for paragraph in paragraphs]
+        with self._lock, self._connect() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                'DELETE FROM questions WHERE paragraph_hash = ?', hashes
+            )
+            return connection.total_changes - before
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.path)) as connection:
+            # Commits a transaction, while the outer context closes.
+            with connection:
+                yield connection
+
+
+def _model_key(model: QuestionGeneration) -> tuple[str, str]:
+    decoding = json.dumps(model.get_decoding_parameters(), sort_keys=True)
+    return model.get_model(), decoding
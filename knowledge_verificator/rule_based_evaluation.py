@@ -0,0 +1,138 @@
+"""
+Module with cheap rules evaluating trivially decidable answers before
+Natural Language Inference.
+"""
+
+from enum import Enum
+import re
+import threading
+
+from knowledge_verificator.answer_chooser import AnswerChooser
+from knowledge_verificator.nli import Relation
+from knowledge_verificator.utils.cache import LRUCache
+from knowledge_verificator.utils.string import normalize_text, split_sentences
+
+
+class Rule(Enum):
+    """
+    Rules deciding a relation without Natural Language Inference.
+
+    These rules mean:
+    - EMPTY - the answer is empty, so it is neutral.
+    - STOP_WORDS_ONLY - the answer has only stop words, so it is neutral.
+    - COPIED_SENTENCE - the answer is a verbatim copy of a sentence of
+        the context, so it is entailed.
+    - NO_OVERLAP - the answer shares too few content words with the context,
+        so it is neutral.
+    """
+
+    EMPTY = 'empty'
+    STOP_WORDS_ONLY = 'stop_words_only'
+    COPIED_SENTENCE = 'copied_sentence'
+    NO_OVERLAP = 'no_overlap'
+
+
+class RuleBasedEvaluator:
+    """
+    Class deciding relations between a context and an answer with cheap
+    lexical rules, so only unclear answers require a forward pass of
+    a Natural Language Inference model.
+    """
+
+    def __init__(
+        self, answer_chooser: AnswerChooser, min_overlap: float = 0.0
+    ) -> None:
+        """
+        Create an evaluator with no answers evaluated yet.
+
+        Args:
+            answer_chooser (AnswerChooser): Instance used to remove stop words.
+            min_overlap (float, optional): Fraction of content words of
+                an answer present in the context, at or below which the answer
+                is neutral. If 0, only answers sharing no content words with
+                the context are neutral. Defaults to 0.0.
+        """
+        self.answer_chooser = answer_chooser
+        self.min_overlap = min_overlap
+        self.evaluated = 0
+        self.decided = {rule: 0 for rule in Rule}
+        self._context_words = LRUCache(max_size=256)
+        self._lock = threading.Lock()
+
+    def evaluate(self, context: str, answer: str) -> Relation | None:
+        """
+        Decide a relation between `context` and `answer` if it is clear.
+
+        Args:
+            context (str): Context, e.g. a paragraph of a learning material.
+            answer (str): Answer provided by a user.
+
+        Returns:
+            Relation | None: Relation decided by the first matching rule or
+                None if the answer has to be evaluated by a model.
+        """
+        rule = self._match(context=context, answer=answer)
+        with self._lock:
+            self.evaluated += 1
+            if rule is not None:
+                self.decided[rule] += 1
+
+        match rule:
+            case None:
+                return None
+            case Rule.COPIED_SENTENCE:
+                return Relation.ENTAILMENT
+            case _:
+                return Relation.NEUTRAL
+
+    def statistics(self) -> dict[str, int]:
+        """
+        Get statistics of the evaluated answers.
+
+        Returns:
+            dict[str, int]: Number of `evaluated` answers, number of answers
+                decided without a model (`short_circuited`) and number of
+                answers decided by each rule.
+        """
+        with self._lock:
+            statistics = {
+                'evaluated': self.evaluated,
+                'short_circuited': sum(self.decided.values()),
+            }
+            statistics.update(
+                {rule.value: count for rule, count in self.decided.items()}
+            )
+        return statistics
+
+    def _match(self, context: str, answer: str) -> Rule | None:
+        if not answer.strip():
+            return Rule.EMPTY
+
+        answer_words = self._content_words(answer)
+        if not answer_words:
+            return Rule.STOP_WORDS_ONLY
+
+        copied_sentence = _strip_sentence(answer)
+        if any(
+            _strip_sentence(sentence) == copied_sentence
+            for sentence in split_sentences(context)
+        ):
+            return Rule.COPIED_SENTENCE
+
+        context_words = self._context_words.get((context,))
+        if context_words is None:
+            context_words = self._content_words(context)
+            self._context_words.put((context,), context_words)
+        overlap = len(answer_words & context_words) / len(answer_words)
+        if overlap <= self.min_overlap:
+            return Rule.NO_OVERLAP
+
+        return None
+
+    def _content_words(self, text: str) -> set[str]:
+        text = self.answer_chooser.remove_stopwords(text)
+        return set(re.findall(r'\w+', text.lower()))
+
+
+def _strip_sentence(sentence: str) -> str:
+    return normalize_text(sentence).rstrip('.!?')
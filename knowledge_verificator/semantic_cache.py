@@ -0,0 +1,210 @@
+"""
+Module with a cache reusing verdicts of Natural Language Inference for
+answers semantically equivalent to the already evaluated ones.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import random
+import threading
+from typing import Callable
+
+import numpy as np
+from sentence_transformers import SentenceTransformer  # type: ignore[import-untyped]
+
+from knowledge_verificator.nli import Relation
+
+
+@dataclass
+class _PremiseEntry:
+    embeddings: np.ndarray
+    relations: list[Relation]
+
+
+# Every option is a separate configuration setting, and the counters are
+# reported as statistics, so neither is grouped.
+class SemanticCache:  # pylint: disable=too-many-instance-attributes
+    """
+    Class caching verdicts of Natural Language Inference per premise,
+    so an answer almost identical in meaning to an already evaluated one
+    reuses its verdict.
+
+    For every premise, embeddings of evaluated answers are kept as rows of
+    a matrix. An answer reuses the verdict of the most similar answer if
+    their cosine similarity reaches `threshold`. A fraction of reused
+    verdicts is audited, i.e. evaluated again, to measure how often reusing
+    a verdict gives a different result than the model.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        threshold: float = 0.95,
+        max_premises: int = 256,
+        max_answers: int = 64,
+        audit_rate: float = 0.05,
+        model_name: str = 'sentence-transformers/all-distilroberta-v1',
+    ) -> None:
+        """
+        Load the embedding model and create an empty cache.
+
+        Args:
+            threshold (float, optional): Minimal cosine similarity of two
+                answers to reuse a verdict. Defaults to 0.95.
+            max_premises (int, optional): Maximum number of premises.
+                If exceeded, the least recently used premise is evicted.
+                Defaults to 256.
+            max_answers (int, optional): Maximum number of answers kept for
+                a premise. If exceeded, the oldest answer is evicted.
+                Defaults to 64.
+            audit_rate (float, optional): Fraction of reused verdicts
+                evaluated again to measure disagreement. Defaults to 0.05.
+            model_name (str, optional): Name of a Sentence Transformers model
+                embedding answers. Defaults to
+                'sentence-transformers/all-distilroberta-v1'.
+
+        Raises:
+            ValueError: Raised if `max_premises` or `max_answers` is not
+                positive.
+        """
+        if max_premises < 1 or max_answers < 1:
+            raise ValueError(
+                'Sizes of a semantic cache have to be positive. Supplied '
+                f'values: {max_premises} premises, {max_answers} answers.'
+            )
+
+        self.threshold = threshold
+        self.max_premises = max_premises
+        self.max_answers = max_answers
+        self.audit_rate = audit_rate
+        self.model = SentenceTransformer(model_name)
+        self.lookups = 0
+        self.reused = 0
+        self.audited = 0
+        self.disagreements = 0
+        self._entries: OrderedDict[str, _PremiseEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def evaluate(
+        self,
+        premise: str,
+        hypothesis: str,
+        infer: Callable[[str, str], Relation],
+    ) -> Relation:
+        """
+        Get a relation between `premise` and `hypothesis`, reusing a verdict
+        for a semantically equivalent hypothesis if possible.
+
+        Args:
+            premise (str): Premise, e.g. a paragraph of a learning material.
+            hypothesis (str): Hypothesis, e.g. an answer provided by a user.
+            infer (Callable[[str, str], Relation]): Function inferring
+                the relation with a model, called on a miss or an audit.
+
+        Returns:
+            Relation: Reused or inferred relation.
+        """
+        key = hashlib.sha256(premise.encode(encoding='utf-8')).hexdigest()
+        embedding = self.model.encode(
+            hypothesis, normalize_embeddings=True, convert_to_numpy=True
+        )
+
+        match = self._find(key, embedding)
+        if match is not None and random.random() >= self.audit_rate:
+            with self._lock:
+                self.reused += 1
+            return match[1]
+
+        relation = infer(premise, hypothesis)
+        with self._lock:
+            if match is None:
+                self._store(key, embedding, relation)
+                return relation
+
+            self.audited += 1
+            if match[1] != relation:
+                self.disagreements += 1
+                # Correct the verdict, unless it has been evicted meanwhile.
+                best = self._most_similar(key, embedding)
+                if best is not None:
+                    self._entries[key].relations[best] = relation
+        return relation
+
+    def clear(self) -> None:
+        """
+        Remove all cached verdicts, e.g. after the model has been switched.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def statistics(self) -> dict[str, float]:
+        """
+        Get statistics of the cache usage.
+
+        Returns:
+            dict[str, float]: Number of `lookups`, `reused` verdicts,
+                `audited` verdicts and `disagreements` among them, cached
+                `premises`, the fraction of reused verdicts (`reuse_rate`)
+                and the fraction of audited verdicts different from
+                the model (`disagreement_rate`).
+        """
+        with self._lock:
+            return {
+                'lookups': self.lookups,
+                'reused': self.reused,
+                'audited': self.audited,
+                'disagreements': self.disagreements,
+                'premises': len(self._entries),
+                'reuse_rate': (
+                    self.reused / self.lookups if self.lookups else 0.0
+                ),
+                'disagreement_rate': (
+                    self.disagreements / self.audited if self.audited else 0.0
+                ),
+            }
+
+    def _find(
+        self, key: str, embedding: np.ndarray
+    ) -> tuple[int, Relation] | None:
+        with self._lock:
+            self.lookups += 1
+            best = self._most_similar(key, embedding)
+            if best is None:
+                return None
+
+            self._entries.move_to_end(key)
+            return best, self._entries[key].relations[best]
+
+    def _most_similar(self, key: str, embedding: np.ndarray) -> int | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        # Embeddings are normalised, so dot products are cosine similarities.
+        similarities = entry.embeddings @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] < self.threshold:
+            return None
+        return best
+
+    def _store(
+        self, key: str, embedding: np.ndarray, relation: Relation
+    ) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _PremiseEntry(
+                embeddings=np.empty(
+                    (0, embedding.shape[0]), dtype=embedding.dtype
+                ),
+                relations=[],
+            )
+            self._entries[key] = entry
+
+        entry.embeddings = np.vstack((entry.embeddings, embedding))[
+            -self.max_answers :
+        ]
+        entry.relations = (entry.relations + [relation])[-self.max_answers :]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_premises:
+            self._entries.popitem(last=False)
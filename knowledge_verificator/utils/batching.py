@@ -0,0 +1,131 @@
+"""Module with a micro-batcher coalescing concurrent requests into batches."""
+
+from concurrent.futures import Future
+import queue
+import threading
+import time
+from typing import Callable, Generic, Sequence, TypeVar
+
+Item = TypeVar('Item')
+Output = TypeVar('Output')
+
+
+class MicroBatcher(Generic[Item, Output]):
+    """
+    Class gathering items submitted concurrently from many threads and
+    processing them together as a single batch.
+
+    A batch is closed when either `window` seconds passed since its first
+    item arrived or it contains `max_batch_size` items. Items are processed
+    by a single background thread, so `process_batch` is never called
+    concurrently.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[Sequence[Item]], Sequence[Output]],
+        window: float = 0.01,
+        max_batch_size: int = 16,
+    ) -> None:
+        """
+        Start a background thread processing batches.
+
+        Args:
+            process_batch (Callable[[Sequence[Item]], Sequence[Output]]):
+                Function processing a batch of items and returning outputs
+                in the same order.
+            window (float, optional): Maximum time, in seconds, the first
+                item of a batch waits for other items. Defaults to 0.01.
+            max_batch_size (int, optional): Maximum number of items in
+                a batch. Defaults to 16.
+
+        Raises:
+            ValueError: Raised if `window` is negative or `max_batch_size`
+                is not positive.
+        """
+        if window < 0:
+            raise ValueError(
+                f'Batching window cannot be negative. Supplied value: {window}.'
+            )
+        if max_batch_size < 1:
+            raise ValueError(
+                'Maximum batch size has to be positive. '
+                f'Supplied value: {max_batch_size}.'
+            )
+
+        self.process_batch = process_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.processed_batches = 0
+        self.processed_items = 0
+
+        self._queue: queue.Queue[tuple[Item, Future] | None] = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name='micro-batcher', daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, item: Item) -> Output:
+        """
+        Submit an item and block until its batch has been processed.
+
+        Args:
+            item (Item): Item to be processed.
+
+        Returns:
+            Output: Output corresponding to the submitted item.
+        """
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future.result()
+
+    def shutdown(self) -> None:
+        """Stop the background thread after processing the pending items."""
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect_batch(self) -> tuple[list[tuple[Item, Future]], bool]:
+        entry = self._queue.get()
+        if entry is None:
+            return [], True
+
+        batch = [entry]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    entry = self._queue.get(timeout=timeout)
+                else:
+                    entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            batch, stopped = self._collect_batch()
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                outputs = self.process_batch(items)
+                if len(outputs) != len(items):
+                    raise ValueError(
+                        f'Processing a batch of {len(items)} items returned '
+                        f'{len(outputs)} outputs.'
+                    )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.processed_batches += 1
+            self.processed_items += len(batch)
+            for (_, future), output in zip(batch, outputs, strict=True):
+                future.set_result(output)
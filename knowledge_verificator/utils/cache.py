@@ -0,0 +1,194 @@
+"""Module with a bounded cache with the least recently used eviction policy."""
+
+from collections import OrderedDict
+import itertools
+import json
+import logging
+from pathlib import Path
+import threading
+from typing import Any, Callable
+
+from knowledge_verificator.utils.filesystem import write_atomically
+
+
+class LRUCache:
+    """
+    Thread-safe cache of a bounded size, which evicts the least recently
+    used entries first.
+
+    Keys are tuples of hashable values. If the cache is persisted to a disk,
+    both values in keys and cached values have to be JSON-serializable.
+    """
+
+    def __init__(self, max_size: int, path: Path | str | None = None) -> None:
+        """
+        Create an empty cache or load it from a file if it exists.
+
+        Args:
+            max_size (int): Maximum number of entries. If exceeded,
+                the least recently used entry is evicted.
+            path (Path | str | None, optional): Path to a JSON file, where
+                the cache is persisted. If None, the cache lives only in
+                memory. Defaults to None.
+
+        Raises:
+            ValueError: Raised if `max_size` is not positive.
+        """
+        if max_size < 1:
+            raise ValueError(
+                f'Size of a cache has to be positive. Supplied value: {max_size}.'
+            )
+        if isinstance(path, str):
+            path = Path(path)
+
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    def get(self, key: tuple, default: Any = None) -> Any:
+        """
+        Get a value stored under `key` and mark it as recently used.
+
+        Args:
+            key (tuple): Key of an entry.
+            default (Any, optional): Value returned on a miss. Defaults to None.
+
+        Returns:
+            Any: Cached value or `default` if there is no such entry.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: tuple, value: Any) -> None:
+        """
+        Store `value` under `key`, evicting the least recently used entry
+        if the cache is full.
+
+        Args:
+            key (tuple): Key of an entry.
+            value (Any): Value to be cached.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def remove_if(self, predicate: Callable[[tuple], bool]) -> int:
+        """
+        Remove all entries whose keys satisfy `predicate`.
+
+        Args:
+            predicate (Callable[[tuple], bool]): Function deciding if
+                an entry with the supplied key should be removed.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        with self._lock:
+            to_remove = [key for key in self._entries if predicate(key)]
+            for key in to_remove:
+                del self._entries[key]
+            return len(to_remove)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def statistics(self) -> dict[str, int]:
+        """
+        Get statistics of the cache usage.
+
+        Returns:
+            dict[str, int]: Number of `hits`, `misses` and cached `entries`.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+        }
+
+    def save(self, merge: bool = False) -> None:
+        """
+        Persist the cache to its file. Does nothing for an in-memory cache.
+
+        Args:
+            merge (bool, optional): Keep entries already in the file, which
+                were saved by other caches sharing it. Own entries are
+                treated as more recent. Saves of caches sharing the file
+                have to be serialized by the caller. Defaults to False.
+        """
+        if self.path is None:
+            return
+
+        merged: OrderedDict[tuple, Any] = OrderedDict()
+        if merge and self.path.exists():
+            merged.update(self._read(self.path))
+        with self._lock:
+            for key, value in self._entries.items():
+                merged[key] = value
+                merged.move_to_end(key)
+        entries = [
+            [list(key), value]
+            for key, value in itertools.islice(
+                merged.items(), max(len(merged) - self.max_size, 0), None
+            )
+        ]
+
+        def write(destination: Path) -> None:
+            with open(destination, 'wt', encoding='utf-8') as fd:
+                json.dump(entries, fd)
+
+        # A file truncated by an interrupted save would be lost on the next
+        # start, so it is replaced only once it is complete.
+        write_atomically(self.path, write)
+
+    def load(self) -> None:
+        """
+        Load entries persisted in the cache file, replacing the current ones.
+        An unreadable file is discarded, leaving the cache empty.
+
+        Raises:
+            ValueError: Raised if the cache has no file assigned.
+        """
+        if self.path is None:
+            raise ValueError('Cannot load a cache without a path to its file.')
+
+        entries = list(self._read(self.path).items())
+        with self._lock:
+            self._entries.clear()
+            self._entries.update(entries[-self.max_size :])
+
+    def _read(self, path: Path) -> OrderedDict[tuple, Any]:
+        try:
+            with open(path, 'rt', encoding='utf-8') as fd:
+                return OrderedDict(
+                    (tuple(key), value) for key, value in json.load(fd)
+                )
+        except (OSError, ValueError, TypeError) as e:
+            logging.getLogger(__name__).warning(
+                'The cache file `%s` cannot be read, so it is discarded: %s',
+                path,
+                e,
+            )
+            return OrderedDict()
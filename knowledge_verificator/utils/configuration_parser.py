@@ -1,6 +1,6 @@
 """Module with the parser for YAML configuration files."""
 
-from dataclasses import dataclass
+from dataclasses import MISSING, dataclass, field, fields
 from enum import Enum
 import logging
 from pathlib import Path
@@ -8,10 +8,16 @@ import sys
 from typing import Any
 import yaml  # type: ignore[import-untyped]
 
-from knowledge_verificator.nli import NaturalLanguageInferenceModel
+from knowledge_verificator.nli import (
+    InferenceEngine,
+    NaturalLanguageInferenceModel,
+)
 from knowledge_verificator.qg.qg_model_factory import (
     QuestionGenerationModel,  # type: ignore[import-untyped]
 )
+from knowledge_verificator.qg.t5_flan_base import ReferenceAnswerMode
+from knowledge_verificator.utils.execution import ExecutionProfile
+from knowledge_verificator.utils.precision import Precision
 
 
 class OperatingMode(Enum):
@@ -56,6 +62,94 @@ class Configuration:
             implementation of experiments on language models.
         experiment_results (Path): Path to a directory, where results
             should be saved.
+        nli_batch_window_ms (float): Maximum time, in milliseconds,
+            concurrent answer evaluations are gathered before they are
+            inferred as a single batch.
+        nli_max_batch_size (int): Maximum number of answer evaluations
+            inferred as a single batch.
+        nli_cache_size (int): Maximum number of cached results of Natural
+            Language Inference. If 0, results are not cached.
+        nli_cache_path (Path | None): Path to a file, where cached results of
+            Natural Language Inference are persisted between restarts.
+            If None, the cache is kept only in memory.
+        nli_premise_sentences (int): Number of sentences of a learning
+            material, the most relevant to an answer, used to evaluate
+            the answer. If 0, the whole material is used.
+        nli_pool_size (int): Number of Natural Language Inference models
+            kept loaded, so switching back to them does not load them again.
+        nli_pool_memory_mb (int): Maximum memory, in megabytes, occupied by
+            the loaded Natural Language Inference models. If 0, memory is not
+            limited.
+        nli_precision (Precision): Numerical precision of the Natural
+            Language Inference model. `int8` dynamically quantizes linear
+            layers, which is faster and lighter on CPUs. `bf16` runs
+            computations with bf16 autocast if the CPU supports it,
+            otherwise falls back to `int8`.
+        nli_engine (InferenceEngine): Engine running the Natural Language
+            Inference model, either `pytorch` or `onnx`.
+        execution_profile (ExecutionProfile): Settings of PyTorch execution
+            shared by all language models, under a nested YAML section.
+        nli_cascade_model (NaturalLanguageInferenceModel | None): Small model
+            evaluating answers first. Only answers, for which it is unsure,
+            are evaluated by `natural_language_inference_model`. If None,
+            the cascade is disabled.
+        nli_cascade_threshold (float): Minimal probability of the most
+            probable relation, for which a verdict of the small model is
+            accepted.
+        nli_premise_cache_size (int): Maximum number of tokenized premises,
+            e.g. paragraphs of learning materials, kept for Natural Language
+            Inference. If 0, premises are tokenized with every answer.
+        nli_fast_path (bool): Decide trivial answers, e.g. empty ones or
+            copied sentences of a material, with lexical rules instead of
+            Natural Language Inference.
+        nli_fast_path_min_overlap (float): Fraction of content words of
+            an answer present in a material, at or below which the fast path
+            evaluates the answer as neutral.
+        nli_semantic_cache_size (int): Maximum number of materials, for which
+            verdicts of Natural Language Inference are reused for answers
+            similar in meaning. If 0, verdicts are not reused.
+        nli_semantic_cache_answers (int): Maximum number of answers kept
+            for a material in the semantic cache.
+        nli_semantic_cache_threshold (float): Minimal cosine similarity of
+            embeddings of two answers to reuse a verdict.
+        nli_semantic_cache_audit_rate (float): Fraction of reused verdicts
+            evaluated again to measure how often reusing them is wrong.
+        qg_reference_answers (ReferenceAnswerMode): Moment of generating
+            reference answers by Question Generation models generating them:
+            `eager` together with questions, `background` after questions
+            are returned or `on_demand` only when they are requested.
+        qg_draft_models (dict[QuestionGenerationModel, str]): Smaller
+            checkpoints drafting tokens for Question Generation models
+            (assisted decoding), keyed by names of the models. Models
+            without a draft checkpoint decode on their own.
+        qg_precision (dict[QuestionGenerationModel, Precision]): Numerical
+            precisions of Question Generation models, keyed by names of
+            the models. `bf16` runs computations with bf16 autocast if
+            the CPU supports it, otherwise falls back to `int8`. Models
+            without a precision use `fp32`.
+        question_bank_size (int): Number of questions generated in advance
+            for every paragraph of learning materials, so requesting
+            a question to a known paragraph does not run any model. If 0,
+            questions are generated only on request.
+        question_store_path (Path | None): Path to an SQLite database, where
+            generated questions are persisted between restarts. If None,
+            questions are kept only in memory.
+        question_store_size (int): Maximum number of questions persisted in
+            the database. The least recently used questions are evicted.
+        question_store_per_paragraph (int): Number of questions persisted
+            for a paragraph, before persisted questions are served instead
+            of generating new ones, so a paragraph is not always asked
+            the same question.
+        backend_workers (int): Number of processes of the backend serving
+            requests. Ignored outside of `production_mode`. More than one
+            process requires `inference_workers`.
+        inference_workers (int): Number of worker processes owning
+            the Question Generation and Natural Language Inference models,
+            shared by all processes of the backend. Switching models is not
+            available with workers. If 0, every process of the backend
+            loads its own models.
+        inference_port (int): Local port, on which the worker processes
+            accept jobs from processes of the backend.
     """
 
     learning_materials: Path
@@ -71,6 +165,41 @@ class Configuration:
     frontend_address: str = '127.0.0.1'
     frontend_port: int = 3000
     protocol: str = 'http'
+    nli_batch_window_ms: float = 10.0
+    nli_max_batch_size: int = 16
+    nli_cache_size: int = 1024
+    nli_cache_path: Path | None = None
+    nli_premise_sentences: int = 0
+    nli_pool_size: int = 1
+    nli_pool_memory_mb: int = 0
+    nli_precision: Precision = Precision.FP32
+    nli_engine: InferenceEngine = InferenceEngine.PYTORCH
+    execution_profile: ExecutionProfile = field(
+        default_factory=ExecutionProfile
+    )
+    nli_cascade_model: NaturalLanguageInferenceModel | None = None
+    nli_cascade_threshold: float = 0.9
+    nli_premise_cache_size: int = 4096
+    nli_fast_path: bool = False
+    nli_fast_path_min_overlap: float = 0.0
+    nli_semantic_cache_size: int = 0
+    nli_semantic_cache_answers: int = 64
+    nli_semantic_cache_threshold: float = 0.95
+    nli_semantic_cache_audit_rate: float = 0.05
+    qg_reference_answers: ReferenceAnswerMode = ReferenceAnswerMode.EAGER
+    qg_draft_models: dict[QuestionGenerationModel, str] = field(
+        default_factory=dict
+    )
+    qg_precision: dict[QuestionGenerationModel, Precision] = field(
+        default_factory=dict
+    )
+    question_bank_size: int = 0
+    question_store_path: Path | None = None
+    question_store_size: int = 10000
+    question_store_per_paragraph: int = 3
+    backend_workers: int = 1
+    inference_workers: int = 0
+    inference_port: int = 8100
 
     def __post_init__(self) -> None:
         logger = logging.Logger('Configuration parser', level=logging.DEBUG)
@@ -113,9 +242,116 @@ class Configuration:
             )
             sys.exit(1)
 
+        try:
+            if isinstance(self.nli_cascade_model, str):
+                self.nli_cascade_model = NaturalLanguageInferenceModel[
+                    self.nli_cascade_model.upper()
+                ]
+        except KeyError as e:
+            logger.critical(
+                'Unknown configuration option for `nli_cascade_model`: %s.',
+                e,
+            )
+            sys.exit(1)
+
+        try:
+            if isinstance(self.nli_precision, str):
+                self.nli_precision = Precision(self.nli_precision.lower())
+        except ValueError as e:
+            logger.critical(
+                'Unknown configuration option for `nli_precision`: %s.', e
+            )
+            sys.exit(1)
+
+        try:
+            if isinstance(self.nli_engine, str):
+                self.nli_engine = InferenceEngine(self.nli_engine.lower())
+        except ValueError as e:
+            logger.critical(
+                'Unknown configuration option for `nli_engine`: %s.', e
+            )
+            sys.exit(1)
+
+        try:
+            if isinstance(self.qg_reference_answers, str):
+                self.qg_reference_answers = ReferenceAnswerMode(
+                    self.qg_reference_answers.lower()
+                )
+        except ValueError as e:
+            logger.critical(
+                'Unknown configuration option for `qg_reference_answers`: %s.',
+                e,
+            )
+            sys.exit(1)
+
+        try:
+            self.qg_draft_models = {
+                (
+                    QuestionGenerationModel[model.upper()]
+                    if isinstance(model, str)
+                    else model
+                ): draft_model
+                for model, draft_model in (self.qg_draft_models or {}).items()
+            }
+        except KeyError as e:
+            logger.critical(
+                'Unknown Question Generation model in `qg_draft_models`: %s.',
+                e,
+            )
+            sys.exit(1)
+
+        try:
+            self.qg_precision = {
+                (
+                    QuestionGenerationModel[model.upper()]
+                    if isinstance(model, str)
+                    else model
+                ): Precision(precision.lower())
+                if isinstance(precision, str)
+                else precision
+                for model, precision in (self.qg_precision or {}).items()
+            }
+        except (KeyError, ValueError) as e:
+            logger.critical(
+                'Unknown configuration option for `qg_precision`: %s.', e
+            )
+            sys.exit(1)
+
+        try:
+            if isinstance(self.execution_profile, dict):
+                self.execution_profile = ExecutionProfile(
+                    **self.execution_profile
+                )
+        except (TypeError, ValueError) as e:
+            logger.critical(
+                'Incorrect configuration option for `execution_profile`: %s.',
+                e,
+            )
+            sys.exit(1)
+
         self.mode: OperatingMode = OperatingMode(self.mode)
         self.experiment_implementation = Path(self.experiment_implementation)
         self.experiment_results = Path(self.experiment_results)
+        if self.nli_cache_path is not None:
+            self.nli_cache_path = Path(self.nli_cache_path)
+
+        if self.question_store_path is not None:
+            self.question_store_path = Path(self.question_store_path)
+
+        # Processes of the backend loading their own models would overwrite
+        # each other's cache file, and a deferred reference answer would be
+        # requested from a process, which has not generated it.
+        if (
+            self.production_mode
+            and self.backend_workers > 1
+            and self.inference_workers < 1
+        ):
+            logger.critical(
+                'Running %d processes of the backend requires '
+                '`inference_workers` to be at least 1.',
+                self.backend_workers,
+            )
+            sys.exit(1)
 
 
 class ConfigurationParser:
@@ -167,9 +403,15 @@ class ConfigurationParser:
         """
         configuration_arguments: dict[str, Any] = {}
         # Attributes of `Configuration` are YAML keys.
-        for option_name, _ in Configuration.__annotations__.items():
-            configuration_arguments[option_name] = self._config_data[
-                option_name
+        for option in fields(Configuration):
+            # Options with a default value may be omitted in a YAML file.
+            if option.name not in self._config_data and (
+                option.default is not MISSING
+                or option.default_factory is not MISSING
+            ):
+                continue
+            configuration_arguments[option.name] = self._config_data[
+                option.name
             ]
 
         # Feed key, value pairs to constructor.
@@ -0,0 +1,103 @@
+"""Module with the execution profile shared by all language models."""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+from typing import Any, Iterator
+
+import torch
+
+MATMUL_PRECISIONS = ('highest', 'high', 'medium')
+
+
+@dataclass
+class ExecutionProfile:
+    """
+    A dataclass describing how PyTorch executes language models.
+
+    Attributes:
+        inference_mode (bool): Run models in `torch.inference_mode`, which
+            disables autograd bookkeeping. Otherwise, only gradients are
+            disabled.
+        compile (bool): Compile forward passes of models with `torch.compile`.
+            The first requests become slower, the following ones faster.
+        matmul_precision (str): Internal precision of float32 matrix
+            multiplications, one of `highest`, `high`, `medium`.
+        interop_threads (int): Number of threads used for inter-op
+            parallelism. If 0, PyTorch decides.
+        threads (dict[str, int]): Number of threads used for intra-op
+            parallelism by a component, either `nli` or `qg`. If a component
+            is missing or has 0 threads, PyTorch decides.
+    """
+
+    inference_mode: bool = True
+    compile: bool = False
+    matmul_precision: str = 'highest'
+    interop_threads: int = 0
+    threads: dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.matmul_precision not in MATMUL_PRECISIONS:
+            raise ValueError(
+                f'Unknown matmul precision `{self.matmul_precision}`. '
+                f'Available: {", ".join(MATMUL_PRECISIONS)}.'
+            )
+
+    def apply(self) -> None:
+        """
+        Apply process-wide settings: matmul precision and the number of
+        inter-op threads.
+        """
+        torch.set_float32_matmul_precision(self.matmul_precision)
+        if (
+            self.interop_threads
+            and torch.get_num_interop_threads() != self.interop_threads
+        ):
+            try:
+                torch.set_num_interop_threads(self.interop_threads)
+            except RuntimeError:
+                # Allowed only before any inter-op parallel work has started.
+                logging.getLogger(__name__).warning(
+                    'Cannot set the number of inter-op threads to %d.',
+                    self.interop_threads,
+                )
+
+    def prepare(self, model: Any) -> Any:
+        """
+        Prepare a loaded model for execution, compiling its forward pass
+        if requested.
+
+        Args:
+            model (Any): Loaded model. Models other than `torch.nn.Module`
+                are returned unchanged.
+
+        Returns:
+            Any: Model ready for execution.
+        """
+        if self.compile and isinstance(model, torch.nn.Module):
+            model.forward = torch.compile(model.forward)
+        return model
+
+    @contextmanager
+    def inference(self, component: str) -> Iterator[None]:
+        """
+        Context, in which a component runs its models.
+
+        Args:
+            component (str): Name of a component, either `nli` or `qg`.
+        """
+        threads = self.threads.get(component, 0)
+        previous_threads = torch.get_num_threads()
+        if threads:
+            torch.set_num_threads(threads)
+
+        try:
+            with (
+                torch.inference_mode()
+                if self.inference_mode
+                else torch.no_grad()
+            ):
+                yield
+        finally:
+            if threads:
+                torch.set_num_threads(previous_threads)
@@ -1,6 +1,9 @@
 """Module with filesystem utility functions."""
 
+import os
 from pathlib import Path
+import tempfile
+from typing import Callable
 
 
 def in_directory(file: Path, directory: Path) -> bool:
@@ -41,3 +44,27 @@ def create_text_file(path: Path | str, content: str = '') -> None:
 
     with open(path.resolve(), 'wt', encoding='utf-8') as fd:
         fd.write(content)
+
+
+def write_atomically(path: Path, write: Callable[[Path], None]) -> None:
+    """
+    Write a file to a temporary location in the same directory and move it
+    into place, so an interrupted or concurrent write never leaves
+    a truncated file at `path`.
+
+    Args:
+        path (Path): Final location of the file.
+        write (Callable[[Path], None]): Function writing the file to
+            the supplied location.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(
+        dir=path.parent, prefix=f'.{path.stem}-', suffix=path.suffix
+    )
+    os.close(descriptor)
+    try:
+        write(Path(temporary))
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
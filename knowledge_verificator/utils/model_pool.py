@@ -0,0 +1,127 @@
+"""Module with a pool keeping already loaded language models in memory."""
+
+from collections import OrderedDict
+import threading
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+Key = TypeVar('Key', bound=Hashable)
+Entry = TypeVar('Entry')
+
+
+def model_memory(model: Any) -> int:
+    """
+    Calculate memory occupied by the state (parameters, buffers and packed
+    quantized weights) of a PyTorch model.
+
+    Args:
+        model (Any): Instance of `torch.nn.Module`.
+
+    Returns:
+        int: Occupied memory in bytes.
+    """
+    tensors: list[Any] = []
+    for value in model.state_dict().values():
+        # Quantized linear layers keep their weights in tuples.
+        tensors.extend(value if isinstance(value, tuple) else (value,))
+    return sum(
+        tensor.numel() * tensor.element_size()
+        for tensor in tensors
+        if hasattr(tensor, 'element_size')
+    )
+
+
+class ModelPool(Generic[Key, Entry]):
+    """
+    Class keeping loaded models, so switching back to a model does not
+    require loading its weights again.
+
+    When the pool exceeds either its size or its memory limit, the least
+    recently used models are evicted. The most recently requested model is
+    never evicted, even if it alone exceeds the memory limit.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[Key], Entry],
+        max_models: int = 1,
+        max_memory: int = 0,
+        measure: Callable[[Entry], int] = lambda _: 0,
+    ) -> None:
+        """
+        Create an empty pool.
+
+        Args:
+            load (Callable[[Key], Entry]): Function loading a model
+                identified by a key.
+            max_models (int, optional): Maximum number of models kept
+                in the pool. Defaults to 1.
+            max_memory (int, optional): Maximum memory, in bytes, occupied
+                by models in the pool. If 0, memory is not limited.
+                Defaults to 0.
+            measure (Callable[[Entry], int], optional): Function returning
+                memory, in bytes, occupied by a loaded model. By default,
+                models are assumed to occupy no memory.
+
+        Raises:
+            ValueError: Raised if `max_models` is not positive or
+                `max_memory` is negative.
+        """
+        if max_models < 1:
+            raise ValueError(
+                'Size of a model pool has to be positive. '
+                f'Supplied value: {max_models}.'
+            )
+        if max_memory < 0:
+            raise ValueError(
+                'Memory limit of a model pool cannot be negative. '
+                f'Supplied value: {max_memory}.'
+            )
+
+        self.load = load
+        self.max_models = max_models
+        self.max_memory = max_memory
+        self.measure = measure
+        self._entries: OrderedDict[Key, tuple[Entry, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Key) -> Entry:
+        """
+        Get a model from the pool, loading it if it is not there yet.
+
+        Args:
+            key (Key): Identifier of a model.
+
+        Returns:
+            Entry: Loaded model.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+
+            entry = self.load(key)
+            self._entries[key] = (entry, self.measure(entry))
+            self._evict()
+            return entry
+
+    def memory_usage(self) -> int:
+        """
+        Get memory occupied by all models in the pool.
+
+        Returns:
+            int: Occupied memory in bytes.
+        """
+        return sum(memory for _, memory in self._entries.values())
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models
+            or (self.max_memory and self.memory_usage() > self.max_memory)
+        ):
+            self._entries.popitem(last=False)
@@ -0,0 +1,152 @@
+"""Module with background switching of language models."""
+
+from enum import Enum
+import gc
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+
+class SwapState(Enum):
+    """
+    States of a switch of a model.
+
+    These states mean:
+    - IDLE - no model has been switched yet.
+    - LOADING - the new model is being loaded, the old one keeps serving.
+    - WARMING - the new model is run once, the old one keeps serving.
+    - DONE - the new model serves requests.
+    - FAILED - the new model could not be loaded or run, the old one
+        keeps serving.
+    """
+
+    IDLE = 'idle'
+    LOADING = 'loading'
+    WARMING = 'warming'
+    DONE = 'done'
+    FAILED = 'failed'
+
+
+class ModelSwapper:
+    """
+    Class switching models in a background thread, so requests are served
+    by the old model until the new one is ready.
+
+    Only one switch runs at a time, so a switch loads at most one model
+    at a time. Old models are released after a switch, but pools of loaded
+    models may keep them, so switching back to them is instant.
+    """
+
+    def __init__(self) -> None:
+        """Create a swapper without any switch in progress."""
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._status: dict[str, Any] = {'state': SwapState.IDLE.value}
+
+    def is_running(self) -> bool:
+        """
+        Check if a switch is in progress.
+
+        Returns:
+            bool: True if a switch is in progress.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def switch(
+        self,
+        component: str,
+        target: str,
+        load: Callable[[], Any],
+        install: Callable[[Any], None],
+        warm_up: Callable[[Any], None] = lambda _: None,
+    ) -> bool:
+        """
+        Start switching a model in the background.
+
+        Args:
+            component (str): Name of a component, either `nli` or `qg`.
+            target (str): Name of the new model.
+            load (Callable[[], Any]): Function loading the new model.
+            install (Callable[[Any], None]): Function atomically replacing
+                the old model with the loaded one.
+            warm_up (Callable[[Any], None], optional): Function running
+                the loaded model once before it is installed. By default,
+                the model is not warmed up.
+
+        Returns:
+            bool: True if the switch has started, False if another switch
+                is still in progress.
+        """
+        with self._lock:
+            if self.is_running():
+                return False
+
+            self._status = {
+                'component': component,
+                'target': target,
+                'state': SwapState.LOADING.value,
+                'started': time.time(),
+            }
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(load, install, warm_up),
+                name=f'{component}-model-swap',
+                daemon=True,
+            )
+            self._thread.start()
+            return True
+
+    def status(self) -> dict[str, Any]:
+        """
+        Get the status of the last switch.
+
+        Returns:
+            dict[str, Any]: `state` of the switch and, if any switch has been
+                started, its `component`, `target`, `started` time and,
+                once finished, `finished` time and an `error` if it failed.
+        """
+        with self._lock:
+            return dict(self._status)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """
+        Block until the current switch, if any, is finished.
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait, in seconds.
+                If None, there is no limit. Defaults to None.
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _set_state(self, state: SwapState, **details: Any) -> None:
+        with self._lock:
+            self._status.update(state=state.value, **details)
+
+    def _run(
+        self,
+        load: Callable[[], Any],
+        install: Callable[[Any], None],
+        warm_up: Callable[[Any], None],
+    ) -> None:
+        try:
+            loaded = load()
+            self._set_state(SwapState.WARMING)
+            warm_up(loaded)
+            install(loaded)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.getLogger(__name__).exception(
+                'Cannot switch the model to `%s`.', self._status['target']
+            )
+            self._set_state(
+                SwapState.FAILED, finished=time.time(), error=str(e)
+            )
+            return
+        finally:
+            loaded = None
+            # Collect models no longer referenced before the next switch.
+            gc.collect()
+
+        self._set_state(SwapState.DONE, finished=time.time())
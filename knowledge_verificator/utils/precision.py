@@ -0,0 +1,102 @@
+"""Module with reduced-precision variants of language models."""
+
+from contextlib import nullcontext
+from enum import Enum
+import logging
+from typing import ContextManager
+
+import torch
+
+
+class Precision(Enum):
+    """
+    Available numerical precisions of language models.
+
+    These precisions mean:
+    - FP32 - original 32-bit floating point weights.
+    - BF16 - computations run in 16-bit brain floating point with
+        autocast, while weights stay in 32 bits. Requires a CPU (or a GPU)
+        supporting bf16, otherwise INT8 is used instead.
+    - INT8 - weights of linear layers are dynamically quantized to 8-bit
+        integers. Recommended on CPUs, where it reduces memory usage
+        and latency at a small cost of accuracy.
+    """
+
+    FP32 = 'fp32'
+    BF16 = 'bf16'
+    INT8 = 'int8'
+
+
+def bf16_supported() -> bool:
+    """
+    Check if the device running models supports bf16 computations.
+
+    Returns:
+        bool: True if bf16 is supported natively.
+    """
+    if torch.cuda.is_available():
+        return torch.cuda.is_bf16_supported()
+    return (
+        torch.backends.mkldnn.is_available()
+        and torch.ops.mkldnn._is_mkldnn_bf16_supported()  # pylint: disable=protected-access
+    )
+
+
+def resolve_precision(precision: Precision) -> Precision:
+    """
+    Get a precision supported by the device, replacing unsupported bf16
+    with int8.
+
+    Args:
+        precision (Precision): Desired precision.
+
+    Returns:
+        Precision: Precision, which is used.
+    """
+    if precision == Precision.BF16 and not bf16_supported():
+        logging.getLogger(__name__).warning(
+            'The device does not support bf16, int8 is used instead.'
+        )
+        return Precision.INT8
+    return precision
+
+
+def autocast(precision: Precision) -> ContextManager:
+    """
+    Context, in which models run computations in the desired precision.
+
+    Args:
+        precision (Precision): Precision resolved with `resolve_precision`.
+
+    Returns:
+        ContextManager: Autocast to bf16 for `Precision.BF16`, otherwise
+            a context doing nothing.
+    """
+    if precision == Precision.BF16:
+        device_type = 'cuda' if torch.cuda.is_available() else 'cpu'
+        return torch.autocast(device_type=device_type, dtype=torch.bfloat16)
+    return nullcontext()
+
+
+def apply_precision(
+    model: torch.nn.Module, precision: Precision
+) -> torch.nn.Module:
+    """
+    Convert a loaded model to the desired precision.
+
+    Args:
+        model (torch.nn.Module): Model with 32-bit floating point weights.
+        precision (Precision): Desired precision.
+
+    Returns:
+        torch.nn.Module: Converted model. For `Precision.FP32` and
+            `Precision.BF16`, which is applied with `autocast`, it is
+            the supplied model.
+    """
+    match precision:
+        case Precision.INT8:
+            return torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        case _:
+            return model
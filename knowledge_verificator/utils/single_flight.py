@@ -0,0 +1,72 @@
+"""Module with single-flight de-duplication of concurrent identical calls."""
+
+from concurrent.futures import Future
+import threading
+from typing import Callable, Generic, Hashable, TypeVar
+
+Key = TypeVar('Key', bound=Hashable)
+Output = TypeVar('Output')
+
+
+class SingleFlight(Generic[Key, Output]):
+    """
+    Class running a computation only once for concurrent calls with
+    the same key. Calls arriving while the computation is in flight wait
+    for it and receive its output, or its exception.
+
+    Outputs are not kept once the computation finishes, so a later call
+    with the same key computes again.
+    """
+
+    def __init__(self) -> None:
+        """Create a group without any computations in flight."""
+        self.executed = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._in_flight: dict[Key, Future] = {}
+
+    def run(self, key: Key, compute: Callable[[], Output]) -> Output:
+        """
+        Run `compute` or, if a computation with the same key is in flight,
+        wait for its output.
+
+        Args:
+            key (Key): Key identifying identical computations, e.g. a model
+                and its input.
+            compute (Callable[[], Output]): Computation of the output.
+
+        Returns:
+            Output: Output of the computation.
+        """
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                future: Future = Future()
+                self._in_flight[key] = future
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if in_flight is not None:
+            return in_flight.result()
+
+        try:
+            output = compute()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        future.set_result(output)
+        return output
+
+    def statistics(self) -> dict[str, int]:
+        """
+        Get statistics of computations.
+
+        Returns:
+            dict[str, int]: Number of `executed` computations and number of
+                `coalesced` calls, which waited for a computation in flight.
+        """
+        with self._lock:
+            return {'executed': self.executed, 'coalesced': self.coalesced}
@@ -1,5 +1,7 @@
 """Module with string-related utility function."""
 
+import re
+
 
 def clip_text(text: str, max_length: int) -> str:
     """
@@ -24,3 +26,63 @@ def clip_text(text: str, max_length: int) -> str:
     if text_length > max_length:
         return text[: max_length - 3] + '...'
     return text
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize `text` by lowercasing it and collapsing all whitespace
+    characters into single spaces.
+
+    Args:
+        text (str): Text to normalize.
+
+    Returns:
+        str: Normalized text.
+    """
+    return ' '.join(text.lower().split())
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Split `text` into sentences at terminal punctuation marks followed by
+    whitespace and at blank lines.
+
+    Args:
+        text (str): Text to split.
+
+    Returns:
+        list[str]: Non-empty sentences, in the order of appearance.
+    """
+    sentences = re.split(r'(?<=[.!?])\s+|\n\s*\n', text.strip())
+    return [sentence.strip() for sentence in sentences if sentence.strip()]
+
+
+def select_relevant_sentences(text: str, query: str, count: int) -> str:
+    """
+    Reduce `text` to `count` sentences sharing the most words with `query`.
+
+    The relevance is a cheap lexical score: the number of distinct words
+    of `query` present in a sentence. Ties are resolved in favour of earlier
+    sentences. The selected sentences keep their original order.
+
+    Args:
+        text (str): Text to reduce.
+        query (str): Text, to which sentences have to be relevant.
+        count (int): Maximum number of sentences to keep.
+
+    Returns:
+        str: Selected sentences joined with spaces or unchanged `text` if it
+            does not have more than `count` sentences.
+    """
+    sentences = split_sentences(text)
+    if len(sentences) <= count:
+        return text
+
+    query_words = set(re.findall(r'\w+', query.lower()))
+    scores = [
+        len(query_words.intersection(re.findall(r'\w+', sentence.lower())))
+        for sentence in sentences
+    ]
+    ranking = sorted(range(len(sentences)), key=lambda i: (-scores[i], i))
+    selected = sorted(ranking[:count])
+    return ' '.join(sentences[i] for i in selected)
@@ -0,0 +1,106 @@
+"""
+Module with experiments comparing Natural Language Inference models in
+the full (fp32) precision with their dynamically quantized (int8) variants.
+"""
+
+from pathlib import Path
+from time import perf_counter
+import warnings
+import numpy as np
+import yaml  # type: ignore[import-untyped]
+
+from knowledge_verificator.nli import (
+    NaturalLanguageInference,
+    NaturalLanguageInferenceModel,
+    Relation,
+)
+from knowledge_verificator.utils.model_pool import model_memory
+from knowledge_verificator.utils.precision import (
+    Precision,
+    resolve_precision,
+)
+from tests.model.runner import Metric, Result
+
+warnings.filterwarnings('ignore')
+
+# Quantizing every available model would take hours on a CPU.
+EVALUATED_MODELS = (NaturalLanguageInferenceModel.ROBERTA,)
+
+
+def get_test_data() -> list[dict[str, str]]:
+    """
+    Retrieve held-out pairs of premise and hypothesis from a YAML file.
+
+    Returns:
+        list[dict[str, str]]: List of dictionaries each having
+            keys: premise, hypothesis, relation.
+    """
+    with open(
+        Path('tests/model/nli_test_data.yaml'), 'rt', encoding='utf-8'
+    ) as fd:
+        return [test_item['item'] for test_item in yaml.safe_load(fd)]
+
+
+def _infer_with_timing(
+    nli: NaturalLanguageInference, test_data: list[dict[str, str]]
+) -> tuple[list[Relation], np.ndarray]:
+    relations: list[Relation] = []
+    latencies: np.ndarray = np.zeros(shape=(len(test_data), 1))
+    for i, item in enumerate(test_data):
+        start = perf_counter()
+        relations.append(
+            nli.infer_relation(
+                premise=item['premise'], hypothesis=item['hypothesis']
+            )
+        )
+        latencies[i] = (perf_counter() - start) * 1000
+    return relations, latencies
+
+
+def measure_nli_quantization_latency_memory_and_agreement() -> list[Result]:
+    """
+    Measure latency, memory usage and agreement of verdicts with
+    the fp32 model for each precision of the evaluated NLI models.
+
+    Returns:
+        list[Result]: List of evaluations of test data items.
+    """
+    test_data = get_test_data()
+    results: list[Result] = []
+
+    for model in EVALUATED_MODELS:
+        reference_relations: list[Relation] = []
+        for precision in Precision:
+            # Falling back to a precision already measured would report
+            # the same model twice under different names.
+            if resolve_precision(precision) != precision:
+                continue
+            nli = NaturalLanguageInference(model=model, precision=precision)
+            model_name = f'{nli.get_model()} ({precision.value})'
+
+            # Warm up, so one-time initialisation is not measured.
+            nli.infer_relation(premise='Warm up.', hypothesis='Warm up.')
+            relations, latencies = _infer_with_timing(nli, test_data)
+            if precision == Precision.FP32:
+                reference_relations = relations
+
+            agreement = np.array(
+                [
+                    [float(relation == reference)]
+                    for relation, reference in zip(
+                        relations, reference_relations, strict=True
+                    )
+                ]
+            )
+            memory = np.array([[model_memory(nli.model) / 1024**2]])
+
+            results.extend(
+                (
+                    Result(model_name, Metric.LATENCY_MS, latencies),
+                    Result(model_name, Metric.MEMORY_MB, memory),
+                    Result(model_name, Metric.AGREEMENT, agreement),
+                )
+            )
+            del nli
+
+    return results
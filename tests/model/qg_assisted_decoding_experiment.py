@@ -0,0 +1,96 @@
+"""
+Module with experiments comparing Question Generation with and without
+assisted decoding, in which a small draft model proposes tokens verified
+by the full model.
+"""
+
+from pathlib import Path
+from time import perf_counter
+import warnings
+import numpy as np
+import yaml  # type: ignore[import-untyped]
+
+from knowledge_verificator.qg.qg_model_factory import (
+    QuestionGenerationModel,
+    create_model,
+    release_model,
+)
+from knowledge_verificator.qg.t5_flan_base import (
+    ReferenceAnswerMode,
+    T5FlanBase,
+)
+from tests.model.runner import Metric, Result
+
+warnings.filterwarnings('ignore')
+
+DRAFT_MODEL = 'google/flan-t5-small'
+
+
+def get_contexts() -> list[str]:
+    """
+    Retrieve contexts of the Question Generation test data from a YAML file.
+
+    Returns:
+        list[str]: List of contexts.
+    """
+    with open(
+        Path('tests/model/qg_test_data.yaml'), 'rt', encoding='utf-8'
+    ) as fd:
+        return [
+            test_item['item']['context'] for test_item in yaml.safe_load(fd)
+        ]
+
+
+def measure_qg_assisted_decoding_latency_and_acceptance() -> list[Result]:
+    """
+    Measure latency of generating a question with FLAN T5 and the number of
+    tokens generated per forward pass of FLAN T5, with and without
+    the draft model. Without it, exactly one token is generated per step.
+
+    Returns:
+        list[Result]: List of evaluations of test data items.
+    """
+    contexts = get_contexts()
+    results: list[Result] = []
+    for draft_model in (None, DRAFT_MODEL):
+        # Reference answers are not part of the measured questions.
+        qg = create_model(
+            QuestionGenerationModel.FLAN_T5,
+            reference_answers=ReferenceAnswerMode.ON_DEMAND,
+            draft_model=draft_model,
+        )
+        assert isinstance(qg, T5FlanBase)
+        steps = 0
+
+        def count_step(*_) -> None:
+            nonlocal steps
+            steps += 1
+
+        hook = qg.model.register_forward_pre_hook(count_step)
+        # Warm up, so one-time initialisation is not measured.
+        qg.generate(answer='', context='Warm up.')
+
+        latencies: np.ndarray = np.zeros(shape=(len(contexts), 1))
+        tokens_per_step: np.ndarray = np.zeros(shape=(len(contexts), 1))
+        for i, context in enumerate(contexts):
+            steps = 0
+            start = perf_counter()
+            question = qg.generate(answer='', context=context)['question']
+            latencies[i] = (perf_counter() - start) * 1000
+            # Tokens of the question and the end of the sequence.
+            tokens = len(qg.tokenizer(question)['input_ids'])
+            tokens_per_step[i] = tokens / max(steps, 1)
+
+        variant = 'no draft' if draft_model is None else f'draft {draft_model}'
+        model_name = f'{qg.get_model()} ({variant})'
+        results.extend(
+            (
+                Result(model_name, Metric.LATENCY_MS, latencies),
+                Result(model_name, Metric.TOKENS_PER_STEP, tokens_per_step),
+            )
+        )
+        hook.remove()
+        release_model(qg, unload=True)
+        del qg
+
+    return results
@@ -0,0 +1,77 @@
+"""
+Module with experiments measuring how much reusing encoder states saves
+when several questions are generated from one context.
+"""
+
+from pathlib import Path
+from time import perf_counter
+import warnings
+import numpy as np
+import yaml  # type: ignore[import-untyped]
+
+from knowledge_verificator.qg.qg_model_factory import (
+    QuestionGenerationModel,
+    create_model,
+    release_model,
+)
+from knowledge_verificator.qg.t5_flan_base import T5FlanBase
+from tests.model.runner import Metric, Result
+
+warnings.filterwarnings('ignore')
+
+# The question bank generates this many questions for every paragraph.
+QUESTIONS_PER_CONTEXT = 3
+
+
+def get_contexts() -> list[str]:
+    """
+    Retrieve contexts of the Question Generation test data from a YAML file.
+
+    Returns:
+        list[str]: List of contexts.
+    """
+    with open(
+        Path('tests/model/qg_test_data.yaml'), 'rt', encoding='utf-8'
+    ) as fd:
+        return [
+            test_item['item']['context'] for test_item in yaml.safe_load(fd)
+        ]
+
+
+def measure_qg_encoder_reuse_latency() -> list[Result]:
+    """
+    Measure latency of generating several questions from each context with
+    FLAN T5, encoding the context for every question and encoding it once.
+
+    Returns:
+        list[Result]: Latencies of generating all questions to a context.
+    """
+    contexts = get_contexts()
+    qg = create_model(QuestionGenerationModel.FLAN_T5)
+    assert isinstance(qg, T5FlanBase)
+    # Warm up, so one-time initialisation is not measured.
+    qg.generate(answer='', context='Warm up.')
+
+    results: list[Result] = []
+    for reuse_encoder in (False, True):
+        latencies: np.ndarray = np.zeros(shape=(len(contexts), 1))
+        for i, context in enumerate(contexts):
+            qg._encoder_states.clear()  # pylint: disable=protected-access
+            start = perf_counter()
+            for _ in range(QUESTIONS_PER_CONTEXT):
+                if not reuse_encoder:
+                    qg._encoder_states.clear()  # pylint: disable=protected-access
+                qg.generate(answer='', context=context)
+            latencies[i] = (perf_counter() - start) * 1000
+
+        variant = 'encoded once' if reuse_encoder else 'encoded per question'
+        results.append(
+            Result(
+                model_name=f'{qg.get_model()} ({variant})',
+                metric=Metric.LATENCY_MS,
+                data_points=latencies,
+            )
+        )
+
+    release_model(qg, unload=True)
+    return results
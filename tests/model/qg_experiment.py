@@ -9,7 +9,11 @@ import yaml  # type: ignore[import-untyped]
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
-from knowledge_verificator.qg.qg_model_factory import QuestionGenerationModel
+from knowledge_verificator.qg.qg_model_factory import (
+    QuestionGenerationModel,
+    create_model,
+    release_model,
+)
 from knowledge_verificator.utils.metrics import (
     calculate_bleu_4,
     calculate_meteor,
@@ -62,7 +66,7 @@ def _generate_responses() -> dict[str, list[dict[str, str]]]:
     response_data: dict[str, list[dict[str, str]]] = {}
 
     for qg_model in QuestionGenerationModel:
-        qg = qg_model.value()
+        qg = create_model(qg_model)
 
         model_name = qg.get_model()
 
@@ -85,6 +89,7 @@ def _generate_responses() -> dict[str, list[dict[str, str]]]:
                 }
             )
 
+        release_model(qg, unload=True)
         del qg
         torch.cuda.empty_cache()
     return response_data
@@ -0,0 +1,95 @@
+"""
+Module with experiments comparing quality and latency of Question Generation
+models in the full (fp32) precision with their reduced-precision variants.
+"""
+
+from time import perf_counter
+from typing import Callable
+import warnings
+import numpy as np
+from transformers import set_seed  # type: ignore[import-untyped]
+
+from knowledge_verificator.qg.qg_model_factory import (
+    QuestionGenerationModel,
+    create_model,
+    release_model,
+)
+from knowledge_verificator.utils.metrics import (
+    calculate_bleu_4,
+    calculate_meteor,
+    calculate_rouge_n,
+)
+from knowledge_verificator.utils.model_pool import model_memory
+from knowledge_verificator.utils.precision import (
+    Precision,
+    resolve_precision,
+)
+from tests.model.qg_experiment import get_test_data
+from tests.model.runner import Metric, Result
+
+warnings.filterwarnings('ignore')
+
+QUALITY_METRICS: dict[Metric, Callable[[str, str], float]] = {
+    Metric.BLEU_4: calculate_bleu_4,
+    Metric.METEOR: calculate_meteor,
+    Metric.ROUGE_3: lambda reference, hypothesis: calculate_rouge_n(
+        reference=reference, hypothesis=hypothesis, n=3
+    ),
+}
+
+
+def measure_qg_precision_quality_latency_and_memory() -> list[Result]:
+    """
+    Measure quality of generated questions, latency and memory usage of
+    every Question Generation model in each precision. Quality of
+    a reduced-precision variant should stay close to its fp32 model.
+
+    Returns:
+        list[Result]: List of evaluations of test data items.
+    """
+    test_data = [test_item['item'] for test_item in get_test_data()]
+    results: list[Result] = []
+
+    for qg_model in QuestionGenerationModel:
+        for precision in Precision:
+            # A precision unsupported by the CPU falls back to another one,
+            # which is measured on its own, so the fallback is skipped.
+            if resolve_precision(precision) != precision:
+                continue
+            qg = create_model(qg_model, precision=precision)
+            model_name = f'{qg.get_model()} ({precision.value})'
+
+            # Warm up, so one-time initialisation is not measured.
+            qg.generate(answer='Warm-up.', context='This is a warm-up.')
+            # Sampling models draw the same random numbers in every precision.
+            set_seed(0)
+
+            latencies: np.ndarray = np.zeros(shape=(len(test_data), 1))
+            scores = {
+                metric: np.zeros(shape=(len(test_data), 1))
+                for metric in QUALITY_METRICS
+            }
+            for i, item in enumerate(test_data):
+                start = perf_counter()
+                question = qg.generate(
+                    answer=item['answer'], context=item['context']
+                )['question']
+                latencies[i] = (perf_counter() - start) * 1000
+                for metric, evaluate in QUALITY_METRICS.items():
+                    scores[metric][i] = evaluate(item['question'], question)
+
+            memory = np.array([[model_memory(qg.model) / 1024**2]])  # type: ignore[attr-defined]
+            results.extend(
+                Result(model_name, metric, data_points)
+                for metric, data_points in scores.items()
+            )
+            results.extend(
+                (
+                    Result(model_name, Metric.LATENCY_MS, latencies),
+                    Result(model_name, Metric.MEMORY_MB, memory),
+                )
+            )
+            release_model(qg, unload=True)
+            del qg
+
+    return results
@@ -24,6 +24,10 @@ class Metric(Enum):
     BLEU_4 = 1
     METEOR = 2
     ROUGE_3 = 3
+    LATENCY_MS = 4
+    MEMORY_MB = 5
+    AGREEMENT = 6
+    TOKENS_PER_STEP = 7
 
 
 @dataclass
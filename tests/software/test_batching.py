@@ -0,0 +1,44 @@
+"""Module with tests for the micro-batcher of concurrent requests."""
+
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from knowledge_verificator.utils.batching import MicroBatcher
+
+
+@pytest.mark.code_quality
+def test_concurrent_items_are_processed_in_batches():
+    """
+    Test if items submitted concurrently are gathered into batches and
+    each caller receives the output corresponding to its item.
+    """
+    batch_sizes: list[int] = []
+
+    def square_all(items):
+        batch_sizes.append(len(items))
+        return [item**2 for item in items]
+
+    batcher = MicroBatcher(
+        process_batch=square_all, window=0.05, max_batch_size=4
+    )
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outputs = list(executor.map(batcher.submit, range(8)))
+    batcher.shutdown()
+
+    assert outputs == [item**2 for item in range(8)]
+    assert sum(batch_sizes) == 8
+    assert max(batch_sizes) <= 4
+    assert len(batch_sizes) < 8, 'Items have not been batched at all.'
+
+
+@pytest.mark.code_quality
+def test_failure_is_propagated_to_all_callers():
+    """Test if an exception raised while processing reaches the callers."""
+
+    def fail(items):
+        raise RuntimeError('Processing failed.')
+
+    batcher = MicroBatcher(process_batch=fail, window=0.0)
+    with pytest.raises(RuntimeError):
+        batcher.submit(1)
+    batcher.shutdown()
@@ -0,0 +1,99 @@
+"""Module with tests for the cache with the LRU eviction policy."""
+
+from pathlib import Path
+import pytest
+
+from knowledge_verificator.utils.cache import LRUCache
+
+
+@pytest.mark.code_quality
+def test_least_recently_used_entry_is_evicted():
+    """Test if the least recently used entry is evicted when cache is full."""
+    cache = LRUCache(max_size=2)
+    cache.put(('a',), 1)
+    cache.put(('b',), 2)
+    cache.get(('a',))
+    cache.put(('c',), 3)
+
+    assert ('a',) in cache
+    assert ('b',) not in cache
+    assert ('c',) in cache
+
+
+@pytest.mark.code_quality
+def test_hits_and_misses_are_counted():
+    """Test if cache hits and misses are counted."""
+    cache = LRUCache(max_size=2)
+    cache.put(('a',), 1)
+    cache.get(('a',))
+    cache.get(('b',))
+
+    assert cache.statistics() == {'hits': 1, 'misses': 1, 'entries': 1}
+
+
+@pytest.mark.code_quality
+def test_entries_matching_predicate_are_removed():
+    """Test if only entries with keys matching a predicate are removed."""
+    cache = LRUCache(max_size=4)
+    cache.put(('ROBERTA', 'premise'), [0.1, 0.2, 0.7])
+    cache.put(('BART', 'premise'), [0.3, 0.3, 0.4])
+
+    removed = cache.remove_if(lambda key: key[0] == 'ROBERTA')
+
+    assert removed == 1
+    assert ('BART', 'premise') in cache
+    assert ('ROBERTA', 'premise') not in cache
+
+
+@pytest.mark.code_quality
+def test_cache_survives_restart(tmp_path: Path):
+    """Test if a persisted cache is loaded by a new instance."""
+    path = tmp_path / 'cache.json'
+    cache = LRUCache(max_size=2, path=path)
+    cache.put(('ROBERTA', 'premise', 'hypothesis'), [0.1, 0.2, 0.7])
+    cache.save()
+
+    restored_cache = LRUCache(max_size=2, path=path)
+
+    assert restored_cache.get(('ROBERTA', 'premise', 'hypothesis')) == [
+        0.1,
+        0.2,
+        0.7,
+    ]
+
+
+@pytest.mark.code_quality
+def test_caches_sharing_file_merge_entries(tmp_path: Path):
+    """
+    Test if caches loaded from the same file keep entries of each other
+    when they are saved with `merge`.
+    """
+    path = tmp_path / 'cache.json'
+    first = LRUCache(max_size=2, path=path)
+    second = LRUCache(max_size=2, path=path)
+    first.put(('a',), 1)
+    second.put(('b',), 2)
+    second.put(('c',), 3)
+
+    second.save(merge=True)
+    first.save(merge=True)
+    restored_cache = LRUCache(max_size=2, path=path)
+
+    # Entries of the last saved cache are the most recent ones.
+    assert ('b',) not in restored_cache
+    assert restored_cache.get(('c',)) == 3
+    assert restored_cache.get(('a',)) == 1
+
+
+@pytest.mark.code_quality
+def test_unreadable_file_is_discarded(tmp_path: Path):
+    """Test if a truncated cache file does not prevent creating a cache."""
+    path = tmp_path / 'cache.json'
+    path.write_text('[[["ROBERTA", "premise"], [0.1', encoding='utf-8')
+
+    cache = LRUCache(max_size=2, path=path)
+    cache.put(('a',), 1)
+    cache.save(merge=True)
+
+    assert len(cache) == 1
+    assert LRUCache(max_size=2, path=path).get(('a',)) == 1
@@ -0,0 +1,39 @@
+"""Module with tests for the execution profile of language models."""
+
+import pytest
+import torch
+
+from knowledge_verificator.utils.execution import ExecutionProfile
+
+
+@pytest.mark.code_quality
+@pytest.mark.parametrize('inference_mode', (True, False))
+def test_inference_context_disables_gradients(inference_mode: bool):
+    """Test if no gradients are tracked inside the inference context."""
+    profile = ExecutionProfile(inference_mode=inference_mode)
+    weights = torch.ones(2, requires_grad=True)
+
+    with profile.inference('nli'):
+        output = weights * 2
+
+    assert not output.requires_grad
+    assert torch.is_inference_mode_enabled() is False
+
+
+@pytest.mark.code_quality
+def test_thread_count_is_restored():
+    """Test if a per-component thread count is restored after inference."""
+    previous_threads = torch.get_num_threads()
+    profile = ExecutionProfile(threads={'qg': 1})
+
+    with profile.inference('qg'):
+        assert torch.get_num_threads() == 1
+
+    assert torch.get_num_threads() == previous_threads
+
+
+@pytest.mark.code_quality
+def test_unknown_matmul_precision_is_rejected():
+    """Test if an unknown matmul precision is rejected."""
+    with pytest.raises(ValueError):
+        ExecutionProfile(matmul_precision='lowest')
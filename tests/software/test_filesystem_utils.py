@@ -3,7 +3,10 @@
 from pathlib import Path
 import pytest
 
-from knowledge_verificator.utils.filesystem import in_directory
+from knowledge_verificator.utils.filesystem import (
+    in_directory,
+    write_atomically,
+)
 
 
 @pytest.mark.code_quality
@@ -28,3 +31,32 @@ def test_in_directory(file: str, directory: str, exists_there: bool):
     assert (
         in_directory(file=Path(file), directory=Path(directory)) == exists_there
     )
+
+
+@pytest.mark.code_quality
+def test_written_file_appears_complete(tmp_path: Path):
+    """Test if a file is moved into place once it is written."""
+    path = tmp_path / 'onnx' / 'model.onnx'
+
+    def write(destination: Path) -> None:
+        destination.write_bytes(b'1')
+
+    write_atomically(path, write)
+
+    assert path.read_bytes() == b'1'
+    assert list(path.parent.iterdir()) == [path]
+
+
+@pytest.mark.code_quality
+def test_interrupted_write_leaves_no_file(tmp_path: Path):
+    """Test if a failed write leaves neither the file nor a temporary one."""
+    path = tmp_path / 'model.onnx'
+
+    def interrupted(destination: Path) -> None:
+        destination.write_bytes(b'truncated')
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        write_atomically(path, interrupted)
+
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,136 @@
+"""Module with tests for the inference service sharing models between processes."""
+
+import os
+from typing import Iterable, Iterator
+
+import pytest
+
+from knowledge_verificator.inference_service import (
+    InferenceClient,
+    InferenceService,
+    RemoteNaturalLanguageInference,
+    RemoteQuestionGeneration,
+)
+from knowledge_verificator.qg.base import QuestionGeneration
+
+AUTHKEY = b'test'
+
+
+class FakeQuestionGeneration(QuestionGeneration):
+    """Fake Question Generation model, which tells its process."""
+
+    def __init__(self) -> None:
+        self.answers: dict[str, str] = {}
+
+    def generate(self, answer: str, context: str) -> dict[str, str]:
+        answer_id = str(len(self.answers))
+        self.answers[answer_id] = str(os.getpid())
+        return {
+            'question': f'{context}?',
+            'answer': self.answers[answer_id],
+            'answer_id': answer_id,
+        }
+
+    def generate_stream(
+        self, answer: str, context: str
+    ) -> Iterator[str | dict[str, str]]:
+        yield from context.split()
+        yield self.generate(answer=answer, context=context)
+
+    def reference_answer(self, answer_id: str) -> str:
+        return self.answers[answer_id]
+
+    def get_model(self) -> str:
+        return str(os.getpid())
+
+
+class FakeNaturalLanguageInference:
+    """Fake Natural Language Inference model, which tells its process."""
+
+    def get_model(self) -> str:
+        return str(os.getpid())
+
+    def warm_premises(self, premises: Iterable[str]) -> int:
+        return os.getpid()
+
+
+def load_fake_models() -> dict:
+    """Load fake models in a worker process."""
+    return {
+        'qg': FakeQuestionGeneration(),
+        'nli': FakeNaturalLanguageInference(),
+    }
+
+
+@pytest.fixture(scope='module')
+def client() -> Iterator[InferenceClient]:
+    """Provide a client of a service with two workers."""
+    service = InferenceService(
+        load=load_fake_models,
+        workers=2,
+        address=('127.0.0.1', 0),
+        authkey=AUTHKEY,
+    )
+    service.start()
+    yield InferenceClient(address=service.address, authkey=AUTHKEY)
+    service.stop()
+
+
+@pytest.mark.code_quality
+def test_models_are_run_in_worker_processes(client):
+    """Test if models are run in other processes than the client."""
+    model_name = RemoteQuestionGeneration(client).get_model()
+
+    assert model_name != str(os.getpid())
+
+
+@pytest.mark.code_quality
+def test_jobs_are_sent_to_every_worker(client):
+    """Test if a job broadcast to workers is run by every one of them."""
+    processes = client.call('nli', 'warm_premises', [])
+
+    assert len(set(processes)) == 2
+    assert os.getpid() not in processes
+
+
+@pytest.mark.code_quality
+def test_streamed_items_arrive_in_order(client):
+    """Test if items yielded by a worker are yielded by the client."""
+    qg = RemoteQuestionGeneration(client)
+
+    events = list(qg.generate_stream(answer='', context='What is it'))
+
+    *words, generated_item = events
+    assert words == ['What', 'is', 'it']
+    assert isinstance(generated_item, dict)
+    assert generated_item['question'] == 'What is it?'
+
+
+@pytest.mark.code_quality
+def test_reference_answer_is_requested_from_its_worker(client):
+    """
+    Test if a reference answer is requested from the worker, which
+    generated its question.
+    """
+    qg = RemoteQuestionGeneration(client)
+
+    # Both workers number their answers from 0, so IDs have to be routed.
+    generated_items = [
+        qg.generate(answer='', context='Context') for _ in range(4)
+    ]
+
+    for generated_item in generated_items:
+        answer = qg.reference_answer(generated_item['answer_id'])
+        assert answer == generated_item['answer']
+
+
+@pytest.mark.code_quality
+def test_errors_are_raised_in_client(client):
+    """Test if exceptions raised by a model are raised by the client."""
+    qg = RemoteQuestionGeneration(client)
+
+    with pytest.raises(KeyError):
+        qg.reference_answer('unknown')
+    with pytest.raises(AttributeError):
+        client.call('nli', 'load_model')
+    assert RemoteNaturalLanguageInference(client).get_model()
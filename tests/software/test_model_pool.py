@@ -0,0 +1,67 @@
+"""Module with tests for the pool of loaded language models."""
+
+import pytest
+
+from knowledge_verificator.utils.model_pool import ModelPool
+
+
+class CountingLoader:
+    """Fake loader of models counting how many times models were loaded."""
+
+    def __init__(self) -> None:
+        self.loaded: list[str] = []
+
+    def __call__(self, name: str) -> str:
+        self.loaded.append(name)
+        return f'model {name}'
+
+
+@pytest.mark.code_quality
+def test_pooled_model_is_not_loaded_again():
+    """Test if switching back to a pooled model does not load it again."""
+    loader = CountingLoader()
+    pool = ModelPool(load=loader, max_models=2)
+
+    pool.get('ROBERTA')
+    pool.get('BART')
+    model = pool.get('ROBERTA')
+
+    assert model == 'model ROBERTA'
+    assert loader.loaded == ['ROBERTA', 'BART']
+
+
+@pytest.mark.code_quality
+def test_least_recently_used_model_is_evicted():
+    """Test if the least recently used model is evicted from a full pool."""
+    loader = CountingLoader()
+    pool = ModelPool(load=loader, max_models=2)
+
+    pool.get('ROBERTA')
+    pool.get('BART')
+    pool.get('ROBERTA')
+    pool.get('ELECTRA')
+
+    assert 'ROBERTA' in pool
+    assert 'BART' not in pool
+    assert 'ELECTRA' in pool
+
+
+@pytest.mark.code_quality
+def test_memory_limit_is_respected():
+    """
+    Test if models are evicted when the memory limit is exceeded, but
+    the most recently requested model is always kept.
+    """
+    pool = ModelPool(
+        load=CountingLoader(),
+        max_models=3,
+        max_memory=100,
+        measure=lambda _: 60,
+    )
+
+    pool.get('ROBERTA')
+    pool.get('BART')
+
+    assert len(pool) == 1
+    assert 'BART' in pool
+    assert pool.memory_usage() == 60
@@ -0,0 +1,89 @@
+"""Module with tests for background switching of language models."""
+
+import threading
+
+import pytest
+
+from knowledge_verificator.utils.model_swap import ModelSwapper
+
+
+@pytest.mark.code_quality
+def test_old_model_serves_until_new_one_is_installed():
+    """
+    Test if a model is replaced only after the new one is loaded and
+    warmed up.
+    """
+    serving = {'model': 'old'}
+    loading = threading.Event()
+    warmed_up: list[str] = []
+    swapper = ModelSwapper()
+
+    def load() -> str:
+        loading.wait(timeout=5)
+        return 'new'
+
+    started = swapper.switch(
+        component='nli',
+        target='new',
+        load=load,
+        install=lambda model: serving.update(model=model),
+        warm_up=warmed_up.append,
+    )
+
+    assert started
+    assert swapper.status()['state'] == 'loading'
+    assert serving['model'] == 'old'
+
+    loading.set()
+    swapper.wait(timeout=5)
+
+    assert warmed_up == ['new']
+    assert serving['model'] == 'new'
+    assert swapper.status()['state'] == 'done'
+
+
+@pytest.mark.code_quality
+def test_only_one_switch_runs_at_a_time():
+    """Test if a switch is refused while another one is in progress."""
+    loading = threading.Event()
+    swapper = ModelSwapper()
+
+    swapper.switch(
+        component='qg',
+        target='T5',
+        load=lambda: loading.wait(timeout=5),
+        install=lambda _: None,
+    )
+    started = swapper.switch(
+        component='nli',
+        target='BART',
+        load=lambda: None,
+        install=lambda _: None,
+    )
+    loading.set()
+    swapper.wait(timeout=5)
+
+    assert not started
+    assert swapper.status()['target'] == 'T5'
+
+
+@pytest.mark.code_quality
+def test_failed_switch_keeps_old_model():
+    """Test if a failure while loading keeps the old model serving."""
+    serving = {'model': 'old'}
+    swapper = ModelSwapper()
+
+    def load() -> str:
+        raise OSError('No such model.')
+
+    swapper.switch(
+        component='nli',
+        target='new',
+        load=load,
+        install=lambda model: serving.update(model=model),
+    )
+    swapper.wait(timeout=5)
+
+    assert serving['model'] == 'old'
+    assert swapper.status()['state'] == 'failed'
+    assert swapper.status()['error'] == 'No such model.'
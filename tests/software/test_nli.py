@@ -7,6 +7,7 @@ from knowledge_verificator.nli import (
     Relation,
     NaturalLanguageInference,
 )
+from knowledge_verificator.utils.cache import LRUCache
 
 
 @pytest.fixture
@@ -45,3 +46,132 @@ def test_basic_examples(
     assert (
         nli.infer_relation(premise=premise, hypothesis=hypothesis) == expected
     )
+
+
+@pytest.mark.code_quality
+def test_batch_inference_matches_single_inference(nli) -> None:
+    """
+    Test if inferring relations in a batch gives the same results as
+    inferring them one by one, regardless of padding and bucketing.
+    """
+    pairs = [
+        ('You know Alice.', "You don't know Alice."),
+        (
+            'You are in love with Alice.',
+            'You have an intimate relationship with Alice.',
+        ),
+        (
+            'Neutrons are located in the atomic nucleus.',
+            'Wroclaw University of Science and Technology is a leading Polish university.',
+        ),
+    ]
+
+    batch_relations = nli.infer_relation_batch(pairs=pairs, batch_size=2)
+    single_relations = [
+        nli.infer_relation(premise=premise, hypothesis=hypothesis)
+        for premise, hypothesis in pairs
+    ]
+
+    assert batch_relations == single_relations
+    assert nli.infer_batch(pairs=pairs).shape == (len(pairs), 3)
+
+
+@pytest.mark.code_quality
+def test_cascade_escalates_only_unsure_pairs(nli) -> None:
+    """
+    Test if the cascade accepts confident verdicts of the small model and
+    passes every other pair to the large model.
+    """
+    pairs = [
+        ('You know Alice.', "You don't know Alice."),
+        (
+            'You are in love with Alice.',
+            'You have an intimate relationship with Alice.',
+        ),
+    ]
+
+    always_escalating = NaturalLanguageInference(
+        model=NaturalLanguageInferenceModel.ROBERTA,
+        cascade_model=NaturalLanguageInferenceModel.MINILM,
+        cascade_threshold=1.1,
+    )
+    assert always_escalating.infer_relation_batch(
+        pairs
+    ) == nli.infer_relation_batch(pairs)
+    assert always_escalating.cascade_statistics()['escalation_rate'] == 1.0
+
+    never_escalating = NaturalLanguageInference(
+        model=NaturalLanguageInferenceModel.ROBERTA,
+        cascade_model=NaturalLanguageInferenceModel.MINILM,
+        cascade_threshold=0.0,
+    )
+    never_escalating.infer_batch(pairs)
+    assert never_escalating.cascade_statistics() == {
+        'screened': len(pairs),
+        'escalated': 0,
+        'escalation_rate': 0.0,
+    }
+
+
+@pytest.mark.code_quality
+def test_cached_premise_tokens_give_the_same_results(nli) -> None:
+    """
+    Test if joining cached token ids of premises with tokenized hypotheses
+    gives the same probabilities as tokenizing whole pairs.
+    """
+    premise = 'You are in love with Alice. ' * 100
+    pairs = [
+        (premise, 'You have an intimate relationship with Alice.'),
+        (premise, "You don't know Alice."),
+    ]
+    cached = NaturalLanguageInference(
+        model=NaturalLanguageInferenceModel.ROBERTA,
+        premise_cache=LRUCache(max_size=8),
+    )
+    cached.warm_premises([premise])
+
+    assert cached.infer_batch(pairs) == pytest.approx(nli.infer_batch(pairs))
+    assert cached.premise_cache is not None
+    assert cached.premise_cache.statistics()['hits'] == len(pairs)
+
+
+@pytest.mark.code_quality
+def test_premises_are_not_warmed_with_relevant_sentences() -> None:
+    """
+    Test if premises are not tokenized in advance, when the model receives
+    only sentences chosen for every hypothesis.
+    """
+    premise_cache = LRUCache(max_size=8)
+    model = NaturalLanguageInference(
+        model=NaturalLanguageInferenceModel.ROBERTA,
+        premise_sentences=1,
+        premise_cache=premise_cache,
+    )
+
+    model.warm_premises(['You are in love with Alice. You know Bob.'])
+
+    assert len(premise_cache) == 0
+
+
+@pytest.mark.code_quality
+def test_verdicts_are_not_shared_between_premise_windows() -> None:
+    """
+    Test if results cached for whole premises are not served to a model
+    receiving only the most relevant sentences of premises.
+    """
+    cache = LRUCache(max_size=8)
+    premise = 'You are in love with Alice. You know Bob.'
+    whole = NaturalLanguageInference(
+        model=NaturalLanguageInferenceModel.ROBERTA, cache=cache
+    )
+    whole.infer_relation(premise=premise, hypothesis='You know Alice.')
+
+    windowed = NaturalLanguageInference(
+        model=NaturalLanguageInferenceModel.ROBERTA,
+        cache=cache,
+        premise_sentences=1,
+    )
+    windowed.infer_relation(premise=premise, hypothesis='You know Alice.')
+
+    assert cache.statistics()['hits'] == 0
+    assert len(cache) == 2
@@ -1,10 +1,15 @@
 """Module with Question Generation module tests."""
 
+import gc
 from time import time
+import weakref
 import pytest
 
 from transformers import set_seed  # type: ignore[import-untyped]
-from knowledge_verificator.qg.t5_flan_base import T5FlanBase
+from knowledge_verificator.qg.t5_flan_base import (
+    ReferenceAnswerMode,
+    T5FlanBase,
+)
 
 
 @pytest.fixture
@@ -55,3 +60,71 @@ def test_basic_question_generation(answer: str, context: str, qg):
         f'Inference time has exceeded its limit of {max_inference_period} s.'
         f' Inference consumed {inference_time} s.'
     )
+
+
+def test_batch_question_generation(qg):
+    """
+    Test if generating questions in a batch gives one question for each
+    context, in the order of contexts.
+    """
+    items = [
+        ('red', 'The red apple is on a tree.'),
+        ('Warsaw', 'Warsaw is the capital of Poland.'),
+        ('oxygen', 'Plants produce oxygen during photosynthesis.'),
+    ]
+
+    outputs = qg.generate_batch(items=items, batch_size=2)
+
+    assert len(outputs) == len(items)
+    for output, (_, context) in zip(outputs, items, strict=True):
+        assert output['context'] == context
+        assert output['question'].endswith('?')
+
+
+@pytest.mark.parametrize(
+    'mode', (ReferenceAnswerMode.BACKGROUND, ReferenceAnswerMode.ON_DEMAND)
+)
+def test_deferred_reference_answer(mode: ReferenceAnswerMode):
+    """
+    Test if a question is returned without its reference answer, which
+    can be retrieved later.
+    """
+    set_seed(0)
+    qg = T5FlanBase(reference_answers=mode)
+
+    output = qg.generate(answer='red', context='The red apple is on a tree.')
+
+    assert output['answer'] == ''
+    assert len(qg.reference_answer(output['answer_id'])) > 0
+
+
+def test_streamed_question_generation(qg):
+    """
+    Test if a streamed question is yielded in fragments, which make up
+    the question in the final dictionary.
+    """
+    context = 'The red apple is on a tree.'
+
+    events = list(qg.generate_stream(answer='red', context=context))
+
+    *fragments, output = events
+    assert all(isinstance(fragment, str) for fragment in fragments)
+    assert ''.join(fragments) == output['question']
+    assert output['context'] == context
+    assert output['question'].endswith('?')
+
+
+@pytest.mark.code_quality
+def test_closed_model_is_garbage_collected():
+    """
+    Test if a closed model is not kept alive by its background threads.
+    """
+    qg = T5FlanBase(reference_answers=ReferenceAnswerMode.BACKGROUND)
+    qg.generate(answer='', context='The red apple is on a tree.')
+    reference = weakref.ref(qg)
+
+    qg.close()
+    del qg
+    gc.collect()
+
+    assert reference() is None
@@ -0,0 +1,190 @@
+"""Module with tests for the registry of loaded Question Generation models."""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+from knowledge_verificator.qg import qg_model_factory
+from knowledge_verificator.qg.base import QuestionGeneration
+from knowledge_verificator.qg.qg_model_factory import (
+    QuestionGenerationModel,
+    create_model,
+    loaded_models,
+    release_model,
+)
+from knowledge_verificator.utils.precision import Precision
+
+
+class FakeQuestionGeneration(QuestionGeneration):
+    """Fake Question Generation model, which loads instantly."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.closed = False
+
+    def generate(self, answer: str, context: str) -> dict[str, str]:
+        return {'question': '?', 'answer': answer, 'context': context}
+
+    def close(self) -> None:
+        self.closed = True
+
+    def get_model(self) -> str:
+        return self.name
+
+
+def is_closed(model: QuestionGeneration) -> bool:
+    """Check if a fake model has been closed."""
+    assert isinstance(model, FakeQuestionGeneration)
+    return model.closed
+
+
+def users() -> list[tuple[str, int]]:
+    """Get names of registered models with their numbers of users."""
+    return [(model['model'], model['users']) for model in loaded_models()]
+
+
+@pytest.fixture
+def loads(monkeypatch) -> list[QuestionGenerationModel]:
+    """Provide an empty registry, which records loaded models."""
+    loaded: list[QuestionGenerationModel] = []
+
+    def load(model, *_) -> QuestionGeneration:
+        loaded.append(model)
+        return FakeQuestionGeneration(model.name)
+
+    monkeypatch.setattr(qg_model_factory, '_REGISTRY', OrderedDict())
+    monkeypatch.setattr(qg_model_factory, '_load', load)
+    return loaded
+
+
+@pytest.mark.code_quality
+def test_same_model_is_loaded_once(loads):
+    """Test if requesting a loaded model returns the same instance."""
+    first = create_model(QuestionGenerationModel.T5)
+    second = create_model(QuestionGenerationModel.T5)
+
+    assert first is second
+    assert loads == [QuestionGenerationModel.T5]
+    assert users() == [('T5', 2)]
+
+
+@pytest.mark.code_quality
+def test_switching_back_does_not_reload_model(loads):
+    """Test if a released model is reused after switching back to it."""
+    t5 = create_model(QuestionGenerationModel.T5)
+    flan_t5 = create_model(QuestionGenerationModel.FLAN_T5)
+    release_model(t5)
+    t5_again = create_model(QuestionGenerationModel.T5)
+    release_model(flan_t5)
+
+    assert t5_again is t5
+    assert not is_closed(t5)
+    assert loads == [
+        QuestionGenerationModel.T5,
+        QuestionGenerationModel.FLAN_T5,
+    ]
+    assert users() == [('FLAN_T5', 0), ('T5', 1)]
+
+
+@pytest.mark.code_quality
+def test_unloaded_model_is_loaded_again(loads):
+    """Test if a model released with `unload` is removed from the registry."""
+    model = create_model(QuestionGenerationModel.T5)
+    release_model(model, unload=True)
+
+    assert not loaded_models()
+    assert is_closed(model)
+    create_model(QuestionGenerationModel.T5)
+    assert loads == [QuestionGenerationModel.T5, QuestionGenerationModel.T5]
+
+
+@pytest.mark.code_quality
+def test_releasing_unused_model_fails(loads):
+    """Test if a model cannot be released more times than requested."""
+    model = create_model(QuestionGenerationModel.T5)
+    release_model(model)
+
+    with pytest.raises(KeyError):
+        release_model(model)
+
+
+@pytest.mark.code_quality
+def test_evicted_idle_model_is_closed(loads):
+    """Test if an idle model evicted by a newer idle model is closed."""
+    t5 = create_model(QuestionGenerationModel.T5)
+    flan_t5 = create_model(QuestionGenerationModel.FLAN_T5)
+    release_model(t5)
+    release_model(flan_t5)
+
+    assert is_closed(t5)
+    assert not is_closed(flan_t5)
+
+
+@pytest.mark.code_quality
+def test_fallback_precision_shares_model(loads, monkeypatch):
+    """
+    Test if bf16 falling back to int8 reuses the model loaded with int8.
+    """
+    monkeypatch.setattr(
+        qg_model_factory,
+        'resolve_precision',
+        lambda precision: (
+            Precision.INT8 if precision == Precision.BF16 else precision
+        ),
+    )
+
+    int8 = create_model(QuestionGenerationModel.T5, precision=Precision.INT8)
+    bf16 = create_model(QuestionGenerationModel.T5, precision=Precision.BF16)
+
+    assert bf16 is int8
+    assert loads == [QuestionGenerationModel.T5]
+    assert loaded_models()[0]['precision'] == 'int8'
+
+
+@pytest.mark.code_quality
+def test_registry_is_available_while_model_loads(monkeypatch):
+    """
+    Test if the registry is not locked while a model loads, and if
+    concurrent requests for the model wait for the same instance.
+    """
+    started = threading.Event()
+    release = threading.Event()
+    loaded: list[QuestionGenerationModel] = []
+
+    def load(model, *_) -> QuestionGeneration:
+        loaded.append(model)
+        started.set()
+        release.wait(timeout=5)
+        return FakeQuestionGeneration(model.name)
+
+    monkeypatch.setattr(qg_model_factory, '_REGISTRY', OrderedDict())
+    monkeypatch.setattr(qg_model_factory, '_load', load)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(create_model, QuestionGenerationModel.T5)
+        assert started.wait(timeout=5)
+        second = executor.submit(create_model, QuestionGenerationModel.T5)
+        loading = loaded_models()
+        release.set()
+
+    assert loading[0]['loading']
+    assert first.result() is second.result()
+    assert loaded == [QuestionGenerationModel.T5]
+    assert users() == [('T5', 2)]
+
+
+@pytest.mark.code_quality
+def test_failed_load_is_not_registered(monkeypatch):
+    """Test if a model, which failed to load, is loaded again next time."""
+
+    def load(*_) -> QuestionGeneration:
+        raise OSError('Weights are missing.')
+
+    monkeypatch.setattr(qg_model_factory, '_REGISTRY', OrderedDict())
+    monkeypatch.setattr(qg_model_factory, '_load', load)
+
+    with pytest.raises(OSError):
+        create_model(QuestionGenerationModel.T5)
+    assert not loaded_models()
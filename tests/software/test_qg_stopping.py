@@ -0,0 +1,79 @@
+"""Module with tests for limits of decoding of Question Generation models."""
+
+import pytest
+import torch
+
+from knowledge_verificator.qg.stopping import (
+    AdaptiveTokenBudget,
+    QuestionComplete,
+)
+
+
+class FakeTokenizer:
+    """Fake tokenizer with a tiny vocabulary."""
+
+    def get_vocab(self) -> dict[str, int]:
+        return {'<pad>': 0, '▁What': 1, '▁is': 2, '▁it': 3, '?': 4, '▁?': 5}
+
+
+@pytest.mark.code_quality
+def test_sequences_ending_with_question_mark_are_complete():
+    """Test if only sequences, whose last token is a question mark, stop."""
+    criterion = QuestionComplete(FakeTokenizer())
+    input_ids = torch.tensor(
+        [[0, 1, 2, 3, 4], [0, 1, 2, 3, 5], [0, 1, 4, 2, 3]]
+    )
+
+    done = criterion(input_ids, scores=torch.zeros(3, 6))
+
+    assert done.tolist() == [True, True, False]
+
+
+@pytest.mark.code_quality
+def test_budget_is_maximal_until_enough_outputs_are_observed():
+    """Test if the budget does not adapt to too few outputs."""
+    budget = AdaptiveTokenBudget(maximum=100, min_observations=4)
+
+    budget.observe([10, 10, 10])
+
+    assert budget.current() == 100
+
+
+@pytest.mark.code_quality
+def test_budget_adapts_to_observed_lengths():
+    """
+    Test if the budget follows observed lengths with a margin, within
+    the minimum and the maximum.
+    """
+    budget = AdaptiveTokenBudget(
+        maximum=100,
+        minimum=8,
+        quantile=1.0,
+        margin=1.5,
+        window=4,
+        min_observations=4,
+    )
+
+    budget.observe([10, 12, 14, 20])
+    assert budget.current() == 30
+
+    budget.observe([2] * 4)
+    assert budget.current() == 8
+
+    budget.observe([200] * 4)
+    assert budget.current() == 100
+
+
+@pytest.mark.code_quality
+def test_padding_is_not_counted_as_decoded_tokens():
+    """Test if lengths of outputs exclude the decoder start and padding."""
+    budget = AdaptiveTokenBudget(
+        maximum=100, minimum=1, quantile=1.0, margin=1.0, min_observations=1
+    )
+
+    budget.observe_outputs(
+        torch.tensor([[0, 7, 8, 9, 1], [0, 7, 1, 0, 0]]), pad_token_id=0
+    )
+
+    assert budget.statistics()['observed'] == 2
+    assert budget.current() == 4
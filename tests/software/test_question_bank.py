@@ -0,0 +1,121 @@
+"""Module with tests for the bank of questions generated in advance."""
+
+import time
+
+import pytest
+
+from knowledge_verificator.answer_chooser import AnswerChooser
+from knowledge_verificator.question_bank import QuestionBank
+from knowledge_verificator.qg.base import QuestionGeneration
+
+PARAGRAPH = 'The red apple is on a tree.'
+
+
+class FakeAnswerChooser(AnswerChooser):
+    """Fake answer chooser always choosing the first word."""
+
+    def __init__(self) -> None:  # pylint: disable=super-init-not-called
+        # Resources of the real chooser are not downloaded.
+        pass
+
+    def choose_answer(
+        self, paragraph: str, use_cached: bool = True
+    ) -> str | None:
+        return paragraph.split()[0]
+
+
+class FakeQuestionGeneration(QuestionGeneration):
+    """Fake Question Generation model counting generated questions."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.generated = 0
+
+    def generate(self, answer: str, context: str) -> dict[str, str]:
+        self.generated += 1
+        return {
+            'question': f'What is {answer}?',
+            'answer': answer,
+            'context': context,
+        }
+
+    def get_model(self) -> str:
+        return self.name
+
+
+def wait_until_generated(bank: QuestionBank) -> None:
+    """Wait until the bank has no paragraphs waiting for generation."""
+    deadline = time.time() + 5
+    while bank.statistics()['pending'] and time.time() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.code_quality
+def test_known_paragraph_is_served_from_bank():
+    """Test if a question to a known paragraph does not run the model."""
+    model = FakeQuestionGeneration('T5')
+    bank = QuestionBank(
+        get_model=lambda: model, answer_chooser=FakeAnswerChooser()
+    )
+
+    bank.submit([PARAGRAPH])
+    wait_until_generated(bank)
+    generated = model.generated
+    question = bank.get(PARAGRAPH)
+
+    assert question is not None
+    assert question['question'] == 'What is The?'
+    assert model.generated == generated
+    assert bank.get('An unknown paragraph.') is None
+    assert bank.statistics()['hits'] == 1
+    assert bank.statistics()['misses'] == 1
+
+
+@pytest.mark.code_quality
+def test_questions_of_previous_model_are_not_served():
+    """Test if switching the model makes the bank miss."""
+    models = {'current': FakeQuestionGeneration('T5')}
+    bank = QuestionBank(
+        get_model=lambda: models['current'],
+        answer_chooser=FakeAnswerChooser(),
+    )
+
+    bank.submit([PARAGRAPH])
+    wait_until_generated(bank)
+    models['current'] = FakeQuestionGeneration('FLAN T5')
+
+    assert bank.get(PARAGRAPH) is None
+
+
+class DeferredAnswerQuestionGeneration(FakeQuestionGeneration):
+    """Fake model generating reference answers later than questions."""
+
+    def generate(self, answer: str, context: str) -> dict[str, str]:
+        generated_item = super().generate(answer=answer, context=context)
+        return {**generated_item, 'answer': '', 'answer_id': answer}
+
+    def reference_answer(self, answer_id: str) -> str:
+        if answer_id != 'The':
+            raise KeyError(answer_id)
+        return answer_id
+
+
+@pytest.mark.code_quality
+def test_deferred_answers_are_resolved_before_banking():
+    """
+    Test if banked questions carry their reference answers instead of
+    identifiers, which expire, and questions with expired ones are dropped.
+    """
+    model = DeferredAnswerQuestionGeneration('FLAN T5')
+    bank = QuestionBank(
+        get_model=lambda: model, answer_chooser=FakeAnswerChooser()
+    )
+
+    bank.submit([PARAGRAPH, 'A paragraph with an expired answer.'])
+    wait_until_generated(bank)
+    question = bank.get(PARAGRAPH)
+
+    assert question is not None
+    assert question['answer'] == 'The'
+    assert 'answer_id' not in question
+    assert bank.get('A paragraph with an expired answer.') is None
@@ -0,0 +1,107 @@
+"""Module with tests for the persistent store of generated questions."""
+
+import pytest
+
+from knowledge_verificator.qg.base import QuestionGeneration
+from knowledge_verificator.question_store import QuestionStore
+
+PARAGRAPH = 'The red apple is on a tree.'
+
+
+class FakeQuestionGeneration(QuestionGeneration):
+    """Fake Question Generation model with configurable decoding."""
+
+    def __init__(self, name: str, max_new_tokens: int = 32) -> None:
+        self.name = name
+        self.max_new_tokens = max_new_tokens
+
+    def generate(self, answer: str, context: str) -> dict[str, str]:
+        return {
+            'question': f'What is {answer}?',
+            'answer': answer,
+            'context': context,
+        }
+
+    def get_decoding_parameters(self) -> dict:
+        return {'max_new_tokens': self.max_new_tokens}
+
+    def get_model(self) -> str:
+        return self.name
+
+
+@pytest.mark.code_quality
+def test_questions_survive_reopening_store(tmp_path):
+    """Test if stored questions are found after opening the store again."""
+    path = tmp_path / 'questions.sqlite3'
+    model = FakeQuestionGeneration('T5')
+    QuestionStore(path).insert_many(
+        model=model, items=[model.generate(answer='apple', context=PARAGRAPH)]
+    )
+
+    stored = QuestionStore(path).lookup(paragraph=PARAGRAPH, model=model)
+
+    assert stored == [
+        {'question': 'What is apple?', 'answer': 'apple', 'context': PARAGRAPH}
+    ]
+
+
+@pytest.mark.code_quality
+def test_questions_are_separated_by_model_and_decoding(tmp_path):
+    """
+    Test if questions of another model or other decoding parameters are not
+    served.
+    """
+    store = QuestionStore(tmp_path / 'questions.sqlite3')
+    model = FakeQuestionGeneration('T5')
+    store.insert_many(
+        model=model, items=[model.generate(answer='apple', context=PARAGRAPH)]
+    )
+
+    assert store.lookup(PARAGRAPH, FakeQuestionGeneration('FLAN T5')) == []
+    assert (
+        store.lookup(PARAGRAPH, FakeQuestionGeneration('T5', max_new_tokens=8))
+        == []
+    )
+
+
+@pytest.mark.code_quality
+def test_invalidated_paragraph_has_no_questions(tmp_path):
+    """Test if questions to a changed paragraph are removed."""
+    store = QuestionStore(tmp_path / 'questions.sqlite3')
+    model = FakeQuestionGeneration('T5')
+    store.insert_many(
+        model=model,
+        items=[
+            model.generate(answer='apple', context=PARAGRAPH),
+            model.generate(answer='tree', context='A tree grows.'),
+        ],
+    )
+
+    removed = store.invalidate([PARAGRAPH])
+
+    assert removed == 1
+    assert store.lookup(PARAGRAPH, model) == []
+    assert len(store) == 1
+
+
+@pytest.mark.code_quality
+def test_least_recently_used_questions_are_evicted(tmp_path):
+    """Test if the store keeps at most `max_items` recently used questions."""
+    store = QuestionStore(tmp_path / 'questions.sqlite3', max_items=2)
+    model = FakeQuestionGeneration('T5')
+    store.insert_many(
+        model=model, items=[model.generate(answer='apple', context=PARAGRAPH)]
+    )
+    store.insert_many(
+        model=model,
+        items=[model.generate(answer='tree', context='A tree grows.')],
+    )
+    store.lookup(PARAGRAPH, model)
+    store.insert_many(
+        model=model,
+        items=[model.generate(answer='dog', context='A dog barks.')],
+    )
+
+    assert len(store) == 2
+    assert store.lookup(PARAGRAPH, model) != []
+    assert store.lookup('A tree grows.', model) == []
@@ -0,0 +1,55 @@
+"""Module with tests for the rule-based evaluation of answers."""
+
+import pytest
+
+from knowledge_verificator.answer_chooser import AnswerChooser
+from knowledge_verificator.nli import Relation
+from knowledge_verificator.rule_based_evaluation import RuleBasedEvaluator
+
+CONTEXT = (
+    'The mitochondrion is the powerhouse of the cell. '
+    'It produces most of the chemical energy.'
+)
+
+
+@pytest.fixture
+def evaluator() -> RuleBasedEvaluator:
+    """Provide an evaluator of answers for tests."""
+    return RuleBasedEvaluator(answer_chooser=AnswerChooser())
+
+
+@pytest.mark.code_quality
+@pytest.mark.parametrize(
+    'answer,expected',
+    [
+        ('', Relation.NEUTRAL),
+        ('It is the', Relation.NEUTRAL),
+        (
+            'The mitochondrion is the powerhouse of the cell',
+            Relation.ENTAILMENT,
+        ),
+        ('Dogs bark loudly.', Relation.NEUTRAL),
+        ('Mitochondria make energy for cells.', None),
+    ],
+)
+def test_clear_answers_are_decided_without_model(
+    answer: str, expected: Relation | None, evaluator
+) -> None:
+    """
+    Test if empty, stop-word-only, copied and unrelated answers are decided
+    by rules, and other answers are left to a model.
+    """
+    assert evaluator.evaluate(context=CONTEXT, answer=answer) == expected
+
+
+@pytest.mark.code_quality
+def test_short_circuited_answers_are_counted(evaluator) -> None:
+    """Test if answers decided by rules are counted."""
+    evaluator.evaluate(context=CONTEXT, answer='')
+    evaluator.evaluate(context=CONTEXT, answer='Mitochondria make energy.')
+
+    statistics = evaluator.statistics()
+
+    assert statistics['evaluated'] == 2
+    assert statistics['short_circuited'] == 1
+    assert statistics['empty'] == 1
@@ -0,0 +1,78 @@
+"""Module with tests for the semantic cache of answer evaluations."""
+
+import pytest
+
+from knowledge_verificator.nli import Relation
+from knowledge_verificator.semantic_cache import SemanticCache
+
+CONTEXT = 'The mitochondrion is the powerhouse of the cell.'
+
+
+class CountingInference:
+    """Fake Natural Language Inference counting inferred pairs."""
+
+    def __init__(self, relation: Relation) -> None:
+        self.relation = relation
+        self.inferred: list[str] = []
+
+    def __call__(self, premise: str, hypothesis: str) -> Relation:
+        self.inferred.append(hypothesis)
+        return self.relation
+
+
+@pytest.mark.code_quality
+def test_verdict_is_reused_for_the_same_answer():
+    """Test if an answer evaluated before does not require inference."""
+    cache = SemanticCache(audit_rate=0.0)
+    infer = CountingInference(Relation.ENTAILMENT)
+
+    first = cache.evaluate(CONTEXT, 'It is the powerhouse of the cell.', infer)
+    second = cache.evaluate(CONTEXT, 'It is the powerhouse of the cell.', infer)
+
+    assert first == second == Relation.ENTAILMENT
+    assert len(infer.inferred) == 1
+    assert cache.statistics()['reuse_rate'] == 0.5
+
+
+@pytest.mark.code_quality
+def test_verdict_is_not_reused_for_different_answer():
+    """Test if an answer different in meaning requires inference."""
+    cache = SemanticCache(audit_rate=0.0)
+    infer = CountingInference(Relation.NEUTRAL)
+
+    cache.evaluate(CONTEXT, 'It is the powerhouse of the cell.', infer)
+    cache.evaluate(CONTEXT, 'Paris is the capital of France.', infer)
+
+    assert len(infer.inferred) == 2
+
+
+@pytest.mark.code_quality
+def test_audited_disagreement_corrects_verdict():
+    """
+    Test if a reused verdict different from the model is counted and
+    corrected.
+    """
+    cache = SemanticCache(audit_rate=1.0)
+    answer = 'It is the powerhouse of the cell.'
+
+    cache.evaluate(CONTEXT, answer, CountingInference(Relation.NEUTRAL))
+    relation = cache.evaluate(
+        CONTEXT, answer, CountingInference(Relation.ENTAILMENT)
+    )
+
+    assert relation == Relation.ENTAILMENT
+    assert cache.statistics()['disagreement_rate'] == 1.0
+
+
+@pytest.mark.code_quality
+def test_least_recently_used_premise_is_evicted():
+    """Test if a full cache evicts the least recently used premise."""
+    cache = SemanticCache(max_premises=1, audit_rate=0.0)
+    infer = CountingInference(Relation.NEUTRAL)
+
+    cache.evaluate('First premise.', 'An answer.', infer)
+    cache.evaluate('Second premise.', 'An answer.', infer)
+    cache.evaluate('First premise.', 'An answer.', infer)
+
+    assert len(infer.inferred) == 3
+    assert cache.statistics()['premises'] == 1
@@ -0,0 +1,90 @@
+"""Module with tests for single-flight de-duplication of concurrent calls."""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from knowledge_verificator.utils.single_flight import SingleFlight
+
+
+def wait_for_coalesced(flights: SingleFlight, calls: int) -> None:
+    """Wait until `calls` calls wait for a computation in flight."""
+    deadline = time.monotonic() + 5
+    while flights.coalesced < calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.code_quality
+def test_concurrent_identical_calls_share_computation():
+    """
+    Test if concurrent calls with the same key are computed once and all
+    of them receive the output.
+    """
+    flights: SingleFlight[str, int] = SingleFlight()
+    release = threading.Event()
+    computations: list[str] = []
+
+    def compute() -> int:
+        computations.append('computed')
+        release.wait(timeout=5)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outputs = [
+            executor.submit(flights.run, 'key', compute) for _ in range(8)
+        ]
+        wait_for_coalesced(flights, 7)
+        release.set()
+
+    assert [output.result() for output in outputs] == [42] * 8
+    assert computations == ['computed']
+    assert flights.statistics() == {'executed': 1, 'coalesced': 7}
+
+
+@pytest.mark.code_quality
+def test_calls_with_different_keys_are_not_shared():
+    """Test if calls with different keys are computed separately."""
+    flights: SingleFlight[int, int] = SingleFlight()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        outputs = list(
+            executor.map(
+                lambda key: flights.run(key, lambda: key * 2), range(4)
+            )
+        )
+
+    assert outputs == [0, 2, 4, 6]
+    assert flights.statistics() == {'executed': 4, 'coalesced': 0}
+
+
+@pytest.mark.code_quality
+def test_finished_computation_is_not_reused():
+    """Test if a call after a computation finished computes again."""
+    flights: SingleFlight[str, int] = SingleFlight()
+
+    flights.run('key', lambda: 1)
+
+    assert flights.run('key', lambda: 2) == 2
+    assert flights.executed == 2
+
+
+@pytest.mark.code_quality
+def test_failure_is_propagated_to_coalesced_calls():
+    """Test if an exception of a computation reaches all waiting calls."""
+    flights: SingleFlight[str, int] = SingleFlight()
+    release = threading.Event()
+
+    def fail() -> int:
+        release.wait(timeout=5)
+        raise RuntimeError('Computation failed.')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        outputs = [executor.submit(flights.run, 'key', fail) for _ in range(2)]
+        wait_for_coalesced(flights, 1)
+        release.set()
+
+    for output in outputs:
+        with pytest.raises(RuntimeError):
+            output.result()
@@ -0,0 +1,53 @@
+"""Module with tests for string utils."""
+
+import pytest
+
+from knowledge_verificator.utils.string import (
+    select_relevant_sentences,
+    split_sentences,
+)
+
+
+@pytest.mark.code_quality
+def test_splitting_sentences():
+    """Test if a text is split into sentences at terminal punctuation."""
+    text = 'Cats purr. Do dogs bark?  Birds sing!\n\nFish swim'
+    assert split_sentences(text) == [
+        'Cats purr.',
+        'Do dogs bark?',
+        'Birds sing!',
+        'Fish swim',
+    ]
+
+
+@pytest.mark.code_quality
+@pytest.mark.parametrize(
+    'query,count,expected',
+    (
+        ('Where is the nucleus?', 1, 'Neutrons are in the nucleus.'),
+        (
+            'Electrons orbit the nucleus.',
+            2,
+            'Neutrons are in the nucleus. Electrons orbit around it.',
+        ),
+        (
+            'Anything',
+            5,
+            'Atoms are small. Neutrons are in the nucleus. '
+            'Electrons orbit around it.',
+        ),
+    ),
+)
+def test_selecting_relevant_sentences(query: str, count: int, expected: str):
+    """
+    Test if the sentences the most relevant to a query are selected and
+    they keep their original order.
+    """
+    text = (
+        'Atoms are small. Neutrons are in the nucleus. '
+        'Electrons orbit around it.'
+    )
+    assert (
+        select_relevant_sentences(text=text, query=query, count=count)
+        == expected
+    )